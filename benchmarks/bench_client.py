@@ -0,0 +1,201 @@
+"""
+OzonAPIClient 基准测试
+
+在子进程中启动 MockOzonServer，在当前进程中运行客户端，因此 CPU 时间和峰值内存
+只包含客户端本身的开销。
+
+用法:
+    python benchmarks/bench_client.py
+    python benchmarks/bench_client.py --scenario crawl --campaigns 20 --latency 0.02 --workers 16
+    python benchmarks/bench_client.py --json > baseline.json
+"""
+import argparse
+import configparser
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ozon_api import crawler  # noqa: E402
+from ozon_api.client import OzonAPIClient  # noqa: E402
+from ozon_api.instrumentation import MetricsCollector, RequestEvent  # noqa: E402
+from ozon_api.testing import MockOzonServer  # noqa: E402
+
+METRICS = ["clicks", "impressions", "spent", "orders"]
+
+
+def _run_server(options: Dict, port_queue):
+    latency, jitter = options.pop("latency"), options.pop("latency_jitter")
+    if jitter:
+        import random
+        options["latency"] = lambda: max(0.0, random.gauss(latency, jitter))
+    else:
+        options["latency"] = latency
+    server = MockOzonServer(**options)
+    server.start()
+    port_queue.put(server.port)
+    server.serve_forever()
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 上单位为 KB，macOS 上为字节
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _make_client(config_file: str, base_url: str, latencies: List[float], metrics: bool) -> OzonAPIClient:
+    client = OzonAPIClient(config_file, base_url=base_url, backoff_factor=0.1)
+    if metrics:
+        client.add_hook(MetricsCollector())
+    lock = threading.Lock()
+
+    # 通过度量钩子记录每次 HTTP 请求的耗时，与传输层无关（httpx 传输没有 requests.Session）
+    def record(event: RequestEvent):
+        with lock:
+            latencies.append(event.total)
+
+    client.add_hook(record)
+    return client
+
+
+def scenario_list(client: OzonAPIClient, args) -> int:
+    """多个线程并发请求广告活动列表"""
+    per_worker = max(1, args.requests // args.workers)
+
+    def worker(_):
+        for _ in range(per_worker):
+            client.get_campaigns()
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(worker, range(args.workers)))
+    return per_worker * args.workers
+
+
+def scenario_stats(client: OzonAPIClient, args) -> int:
+    """多个线程并发请求广告统计"""
+    per_worker = max(1, args.requests // args.workers)
+
+    def worker(n):
+        for i in range(per_worker):
+            client.get_ad_stats(1, 1001, 1001001 + (n * per_worker + i) % args.ads, args.date_from, args.date_to, METRICS)
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(worker, range(args.workers)))
+    return per_worker * args.workers
+
+
+def scenario_crawl(client: OzonAPIClient, args) -> int:
+    """完整遍历 广告活动 → 广告组 → 广告 → 统计"""
+    rows = 0
+    for _ in crawler.crawl_account(client, args.date_from, args.date_to, METRICS, workers=args.workers):
+        rows += 1
+    return rows
+
+
+SCENARIOS = {
+    "list": scenario_list,
+    "stats": scenario_stats,
+    "crawl": scenario_crawl,
+}
+
+
+def run(args) -> Dict:
+    options = {
+        "campaigns": args.campaigns,
+        "ad_groups_per_campaign": args.ad_groups,
+        "ads_per_ad_group": args.ads,
+        "latency": args.latency,
+        "latency_jitter": args.latency_jitter,
+        "rate_limit_ratio": args.rate_limit_ratio,
+        "server_error_ratio": args.server_error_ratio,
+        "page_size": args.page_size,
+        "row_padding": args.row_padding,
+        "seed": 0,
+    }
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=_run_server, args=(options, port_queue), daemon=True)
+    server.start()
+    port = port_queue.get(timeout=10)
+    base_url = f"http://127.0.0.1:{port}{MockOzonServer.base_path}"
+
+    config = configparser.ConfigParser()
+    config["ozon_api"] = {"client_id": "bench", "api_key": "bench"}
+    fd, config_file = tempfile.mkstemp(suffix=".ini")
+    with os.fdopen(fd, "w") as f:
+        config.write(f)
+
+    try:
+        latencies: List[float] = []
+        client = _make_client(config_file, base_url, latencies, args.metrics)
+        # 预热连接池
+        client.get_campaigns()
+        latencies.clear()
+
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        items = SCENARIOS[args.scenario](client, args)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+    finally:
+        server.terminate()
+        os.remove(config_file)
+
+    requests_sent = len(latencies)
+    return {
+        "scenario": args.scenario,
+        "items": items,
+        "requests": requests_sent,
+        "seconds": round(wall, 3),
+        "requests_per_second": round(requests_sent / wall, 1) if wall else 0.0,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "cpu_ms_per_request": round(cpu * 1000 / requests_sent, 3) if requests_sent else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OzonAPIClient 基准测试")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="list")
+    parser.add_argument("--requests", type=int, default=1000, help="list/stats 场景的请求数")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--campaigns", type=int, default=5)
+    parser.add_argument("--ad-groups", type=int, default=4)
+    parser.add_argument("--ads", type=int, default=10)
+    parser.add_argument("--date-from", default="2025-06-01")
+    parser.add_argument("--date-to", default="2025-06-30")
+    parser.add_argument("--latency", type=float, default=0.0, help="服务端平均延迟（秒）")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="服务端延迟的标准差（秒）")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0)
+    parser.add_argument("--server-error-ratio", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=None)
+    parser.add_argument("--row-padding", type=int, default=0, help="每条统计数据的填充字节数")
+    parser.add_argument("--metrics", action="store_true", help="开启 MetricsCollector，衡量度量本身的开销")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    args = parser.parse_args(argv)
+
+    result = run(args)
+    if args.json:
+        print(json.dumps(result))
+    else:
+        for key, value in result.items():
+            print(f"{key:>20}: {value}")
+
+
+if __name__ == "__main__":
+    main()
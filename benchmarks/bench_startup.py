@@ -0,0 +1,107 @@
+"""
+导入和客户端创建耗时的基准测试
+
+每次测量都在新的子进程中进行，包含解释器启动以外的全部冷启动开销；另外在当前进程中
+测量重复创建客户端的耗时（从配置文件路径创建 vs 复用已加载的 Config）。
+
+用法:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 20 --json > startup.json
+"""
+import argparse
+import configparser
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# 在子进程中执行的代码，{config_file} 会被替换为临时配置文件的路径
+COLD_SCENARIOS = {
+    "interpreter": "pass",
+    "import_package": "import ozon_api",
+    "import_client": "from ozon_api import OzonAPIClient",
+    "create_client": "from ozon_api import OzonAPIClient; OzonAPIClient({config_file!r}).close()",
+}
+
+_TIMER = """
+import time
+_start = time.perf_counter()
+{code}
+print(time.perf_counter() - _start)
+"""
+
+
+def _median(values: List[float]) -> float:
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+
+def measure_cold(code: str, runs: int) -> float:
+    """在新的子进程中执行 code，返回耗时的中位数（秒），不含解释器启动"""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(code=code)],
+            check=True, capture_output=True, text=True, env=env
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return _median(samples)
+
+
+def measure_warm(config_file: str, runs: int) -> Dict[str, float]:
+    """在当前进程中重复创建客户端，返回每次创建的平均耗时（秒）"""
+    from ozon_api.client import OzonAPIClient
+    from ozon_api.config import Config
+
+    results = {}
+    config = Config(config_file)
+    for name, source in (("create_client_from_path", config_file), ("create_client_from_config", config)):
+        start = time.perf_counter()
+        for _ in range(runs):
+            OzonAPIClient(source).close()
+        results[name] = (time.perf_counter() - start) / runs
+    return results
+
+
+def run(args) -> Dict:
+    config = configparser.ConfigParser()
+    config["ozon_api"] = {"client_id": "bench", "api_key": "bench"}
+    fd, config_file = tempfile.mkstemp(suffix=".ini")
+    with os.fdopen(fd, "w") as f:
+        config.write(f)
+
+    try:
+        result = {}
+        for name, code in COLD_SCENARIOS.items():
+            result[f"{name}_ms"] = round(measure_cold(code.format(config_file=config_file), args.runs) * 1000, 2)
+        for name, seconds in measure_warm(config_file, args.warm_runs).items():
+            result[f"{name}_us"] = round(seconds * 1e6, 1)
+    finally:
+        os.remove(config_file)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="导入和客户端创建耗时的基准测试")
+    parser.add_argument("--runs", type=int, default=10, help="每个冷启动场景的子进程数")
+    parser.add_argument("--warm-runs", type=int, default=200, help="当前进程中重复创建客户端的次数")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    args = parser.parse_args(argv)
+
+    result = run(args)
+    if args.json:
+        print(json.dumps(result))
+    else:
+        for key, value in result.items():
+            print(f"{key:>30}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,32 @@
 __version__ = "0.1.0"
 __author__ = "Your Name"
 
-from .client import OzonAPIClient
-from .models import Campaign, AdGroup, Ad, Statistic
-from .exceptions import OzonAPIError
+import importlib
+
+# 包级别导出的名称 → 所在模块；首次访问时才导入，import ozon_api 本身不再加载 requests 和 aiohttp
+_LAZY_ATTRIBUTES = {
+    "OzonAPIClient": ".client",
+    "AsyncOzonAPIClient": ".async_client",
+    "Campaign": ".models",
+    "AdGroup": ".models",
+    "Ad": ".models",
+    "Statistic": ".models",
+    "OzonAPIError": ".exceptions",
+    "Config": ".config",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    # 缓存到包的命名空间中，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
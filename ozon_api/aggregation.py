@@ -0,0 +1,233 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .models import ID_FIELDS, MISSING_INT, Statistic, StatisticBatch, day_number_to_date
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - 可选依赖
+    np = None
+
+# 可以直接累加的基础指标
+ADDITIVE_METRICS = ("clicks", "impressions", "spent", "orders", "revenue")
+
+# 派生指标：名称 → (分子, 分母)，都由汇总后的基础指标计算（比值的汇总，而不是汇总的比值）
+DERIVED_METRICS = {
+    "ctr": ("clicks", "impressions"),
+    "cpc": ("spent", "clicks"),
+    "cr": ("orders", "clicks"),
+    "roas": ("revenue", "spent"),
+}
+
+# 汇总周期
+PERIODS = (None, "day", "week")
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("统计汇总需要 numpy，请执行 pip install ozon_api_client[analytics]")
+
+
+def week_start(days):
+    """把距 1970-01-01 的天数对齐到所在周的周一（1970-01-01 是周四）"""
+    return days - (days + 3) % 7
+
+
+def derived_metrics(columns: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    由基础指标列计算 CTR、CPC、CR 和 ROAS
+
+    分母为 0 时结果为 NaN；缺少所需指标的派生指标不计算。
+
+    Args:
+        columns: 指标名 → numpy 数组
+
+    Returns:
+        派生指标名 → float64 数组
+    """
+    _require_numpy()
+    result = {}
+    for name, (numerator, denominator) in DERIVED_METRICS.items():
+        if numerator not in columns or denominator not in columns:
+            continue
+        top = np.asarray(columns[numerator], dtype=np.float64)
+        bottom = np.asarray(columns[denominator], dtype=np.float64)
+        out = np.full(top.shape, np.nan)
+        np.divide(top, bottom, out=out, where=bottom != 0)
+        result[name] = out
+    return result
+
+
+class Rollup:
+    """
+    按实体ID和周期汇总的统计数据，支持增量更新
+
+    分组和求和都用 numpy 向量化完成。add 只更新批次中出现的分组，合并新的一天时
+    不需要重新计算全部历史；派生指标在读取时由汇总值计算。
+
+    用法:
+        rollup = Rollup(by=["campaign_id"], period="week")
+        rollup.add(batch)
+        rollup.add(next_day_batch)
+        df = rollup.to_pandas()
+    """
+
+    def __init__(
+        self,
+        by: Sequence[str] = ("campaign_id",),
+        period: Optional[str] = "day",
+        metrics: Sequence[str] = ADDITIVE_METRICS
+    ):
+        """
+        Args:
+            by: 分组的实体ID列，取自 campaign_id、ad_group_id、ad_id，可以为空
+            period: 汇总周期：day 按天、week 按周（周一为起始日）、None 汇总整个时间范围
+            metrics: 需要累加的指标，批次中缺少的指标按 0 计
+        """
+        _require_numpy()
+        for name in by:
+            if name not in ID_FIELDS:
+                raise ValueError(f"不支持的分组列: {name}")
+        if period not in PERIODS:
+            raise ValueError(f"不支持的汇总周期: {period}")
+        self.by = tuple(by)
+        self.period = period
+        self.metrics = tuple(metrics)
+        self.key_names = self.by + ((period,) if period is not None else ())
+
+        # 分组键 → 行号；汇总值按行号存放在预先扩容的数组中
+        self._index: Dict[Tuple[int, ...], int] = {}
+        self._keys = np.empty((0, len(self.key_names)), dtype=np.int64)
+        self._sums = {name: np.empty(0, dtype=np.float64) for name in self.metrics}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _batch_keys(self, data: Dict[str, Any], length: int):
+        columns = []
+        for name in self.by:
+            if name not in data:
+                raise ValueError(f"统计数据缺少分组列: {name}")
+            columns.append(data[name].astype(np.int64, copy=False))
+        if self.period is not None:
+            days = data["date"].astype(np.int64)
+            columns.append(days if self.period == "day" else week_start(days))
+        if not columns:
+            return np.zeros((length, 0), dtype=np.int64)
+        return np.column_stack(columns)
+
+    def _grow(self, capacity: int):
+        if capacity <= len(self._keys):
+            return
+        capacity = max(capacity, 2 * len(self._keys), 16)
+        keys = np.empty((capacity, len(self.key_names)), dtype=np.int64)
+        keys[:self._size] = self._keys[:self._size]
+        self._keys = keys
+        for name, sums in self._sums.items():
+            grown = np.zeros(capacity, dtype=np.float64)
+            grown[:self._size] = sums[:self._size]
+            self._sums[name] = grown
+
+    def add(self, batch: Union[StatisticBatch, Iterable[Statistic]], sign: int = 1) -> int:
+        """
+        把一批统计数据合并到汇总中
+
+        Args:
+            batch: StatisticBatch 或 Statistic 对象（需要带有分组列对应的属性）
+            sign: 为 -1 时从汇总中扣除这批数据，用于替换重新拉取的日期
+
+        Returns:
+            本次更新的分组数
+        """
+        if not isinstance(batch, StatisticBatch):
+            batch = StatisticBatch.from_statistics(batch)
+        length = len(batch)
+        if not length:
+            return 0
+
+        data = batch.to_numpy()
+        keys = self._batch_keys(data, length)
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        # 只对批次中出现的分组查找或分配行号
+        rows = np.empty(len(unique), dtype=np.int64)
+        new_keys = []
+        for i, key in enumerate(map(tuple, unique.tolist())):
+            row = self._index.get(key)
+            if row is None:
+                row = self._index[key] = self._size + len(new_keys)
+                new_keys.append(i)
+            rows[i] = row
+        if new_keys:
+            self._grow(self._size + len(new_keys))
+            self._keys[self._size:self._size + len(new_keys)] = unique[new_keys]
+            self._size += len(new_keys)
+
+        for name, sums in self._sums.items():
+            if name not in data:
+                continue
+            column = data[name]
+            values = column.astype(np.float64)
+            # from_rows 用 NaN 表示缺失的金额、用 MISSING_INT 表示缺失的计数，汇总时都按 0 计
+            values[np.isnan(values)] = 0.0
+            if column.dtype == np.int64:
+                values[column == MISSING_INT] = 0.0
+            sums[rows] += sign * np.bincount(inverse, weights=values, minlength=len(unique))
+        return len(unique)
+
+    def subtract(self, batch: Union[StatisticBatch, Iterable[Statistic]]) -> int:
+        """从汇总中扣除一批统计数据，参见 add"""
+        return self.add(batch, sign=-1)
+
+    def to_numpy(self, derived: bool = True) -> Dict[str, Any]:
+        """
+        转换为 列名 → numpy 数组 的字典，按分组键排序
+
+        周期列（day 或 week）为距 1970-01-01 的天数；计数类指标为 int64。
+
+        Args:
+            derived: 是否包含派生指标
+        """
+        keys = self._keys[:self._size]
+        order = np.lexsort(keys.T[::-1]) if keys.shape[1] else np.arange(self._size)
+        data = {name: keys[order, i] for i, name in enumerate(self.key_names)}
+        for name, sums in self._sums.items():
+            column = sums[:self._size][order]
+            if name in ("clicks", "impressions", "orders"):
+                column = np.rint(column).astype(np.int64)
+            data[name] = column
+        if derived:
+            data.update(derived_metrics(data))
+        return data
+
+    def to_dict(self, derived: bool = True) -> Dict[str, List]:
+        """转换为 列名 → 列表 的字典，周期列为 ISO 日期字符串"""
+        data = {}
+        for name, column in self.to_numpy(derived).items():
+            if name in PERIODS:
+                data[name] = [day_number_to_date(day).isoformat() for day in column.tolist()]
+            else:
+                data[name] = column.tolist()
+        return data
+
+    def to_pandas(self, derived: bool = True):
+        """转换为 pandas DataFrame，周期列为 datetime64 类型"""
+        import pandas as pd
+
+        data = self.to_numpy(derived)
+        if self.period is not None:
+            data[self.period] = data[self.period].astype("datetime64[D]")
+        return pd.DataFrame(data)
+
+
+def rollup(
+    batch: Union[StatisticBatch, Iterable[Statistic]],
+    by: Sequence[str] = ("campaign_id",),
+    period: Optional[str] = "day",
+    metrics: Sequence[str] = ADDITIVE_METRICS
+) -> Rollup:
+    """一次性汇总一批统计数据，参见 Rollup"""
+    result = Rollup(by, period, metrics)
+    result.add(batch)
+    return result
@@ -0,0 +1,295 @@
+import asyncio
+import hashlib
+import hmac
+import time
+from typing import AsyncIterator, Dict, List, Optional, Union
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - 可选依赖
+    aiohttp = None
+
+# 建立连接阶段的失败：请求尚未发出。ConnectionTimeoutError 在 aiohttp 3.10 中加入
+_CONNECT_ERRORS = tuple(
+    getattr(aiohttp, name) for name in ("ClientConnectorError", "ConnectionTimeoutError") if hasattr(aiohttp, name)
+)
+
+from .client import OzonAPIClient, _load_config, _read_credentials
+from .config import Config
+from .codec import JSONCodec, get_codec
+from .exceptions import OzonAPIError, NetworkError, ConnectError, error_from_response
+from .singleflight import AsyncSingleFlight
+from .utils import async_retry_on_failure, is_idempotent_request, is_safe_to_resend, with_query
+
+
+class AsyncOzonAPIClient:
+    """
+    Ozon广告API异步客户端
+
+    与 OzonAPIClient 提供相同的方法，但全部为协程。所有请求共享同一个
+    保持长连接的 aiohttp 连接池，并通过信号量限制同时在途的请求数，
+    因此单个事件循环即可并发发出数百个请求。
+
+    用法:
+        async with AsyncOzonAPIClient('config.ini') as client:
+            campaigns = await client.get_campaigns()
+    """
+
+    # 签名和请求体编码逻辑与同步客户端完全一致
+    _generate_signature = OzonAPIClient._generate_signature
+    _encode_body = OzonAPIClient._encode_body
+
+    def __init__(
+        self,
+        config_file: Union[str, Config],
+        base_url: str = "https://performance.ozon.ru/api/v1",
+        max_concurrency: int = 100,
+        max_connections: int = 100,
+        keepalive_timeout: float = 30.0,
+        json_codec: Optional[JSONCodec] = None,
+        single_flight: bool = True,
+        max_retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
+        retry_budget: Optional[float] = 30.0
+    ):
+        """
+        初始化异步客户端
+
+        Args:
+            config_file: 配置文件的路径，或已经加载的 Config
+            base_url: API基础URL
+            max_concurrency: 同时在途的最大请求数
+            max_connections: 连接池中的最大连接数
+            keepalive_timeout: 空闲连接保持的秒数
+            json_codec: JSON 编解码器，默认安装了 orjson 时使用 orjson，否则使用标准库
+            single_flight: 是否合并相同的并发只读请求（GET 和统计查询）
+            max_retries: 最大重试次数，默认读取配置文件中的 max_retries
+            backoff_factor: 重试退避因子，默认读取配置文件中的 backoff_factor
+            retry_budget: 单次调用（含所有重试和等待）的总时间预算（秒），None 表示不限制
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncOzonAPIClient 需要 aiohttp，请执行 pip install ozon_api_client[async]")
+
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.codec = json_codec if json_codec is not None else get_codec()
+        config = _load_config(config_file)
+        self.client_id, self.api_key = _read_credentials(config)
+        self.max_retries = max_retries if max_retries is not None else config.get("max_retries")
+        self.backoff_factor = backoff_factor if backoff_factor is not None else config.get("backoff_factor")
+        self.retry_budget = retry_budget
+
+        # 连接和读取超时与同步客户端使用相同的配置项
+        self.timeout = aiohttp.ClientTimeout(
+            sock_connect=config.get("connect_timeout", config.get("timeout")),
+            sock_read=config.get("read_timeout", config.get("timeout"))
+        )
+        self._hmac_key = hmac.new(self.api_key.encode(), digestmod=hashlib.sha256)
+        self.single_flight = AsyncSingleFlight() if single_flight else None
+
+        # aiohttp 会话和信号量需要在事件循环中创建，首次请求时再初始化
+        self.session = None
+        self._semaphore = None
+
+    async def __aenter__(self) -> 'AsyncOzonAPIClient':
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        """获取（必要时创建）共享的连接池会话"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={
+                    "Content-Type": "application/json",
+                    "Host": "performance.ozon.ru"
+                }
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self.session
+
+    async def close(self):
+        """关闭连接池"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def _make_request(self, method: str, endpoint: str, body: Optional[Dict] = None) -> Dict:
+        """发送API请求，相同的并发只读请求只发送一次"""
+        body_bytes = self._encode_body(body)
+        if self.single_flight is not None and is_idempotent_request(method.upper(), endpoint):
+            return await self.single_flight.do(
+                (method.upper(), endpoint, body_bytes),
+                lambda: self._request(method, endpoint, body_bytes)
+            )
+        return await self._request(method, endpoint, body_bytes)
+
+    async def _request(self, method: str, endpoint: str, body_bytes: Optional[bytes] = None) -> Dict:
+        """按退避策略重试；写请求只在确定没有被服务端执行时重试，与同步客户端一致"""
+        retrying = async_retry_on_failure(
+            max_retries=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            max_elapsed=self.retry_budget,
+            retry_if=None if is_idempotent_request(method.upper(), endpoint) else is_safe_to_resend
+        )
+        return await retrying(self._request_once)(method, endpoint, body_bytes)
+
+    async def _request_once(self, method: str, endpoint: str, body_bytes: Optional[bytes] = None) -> Dict:
+        url = f"{self.base_url}{endpoint}"
+        timestamp = str(int(time.time()))
+        signature = self._generate_signature(method, url, body_bytes, timestamp)
+
+        headers = {
+            "Client-Id": self.client_id,
+            "Api-Key": self.api_key,
+            "X-Signature": signature,
+            "X-Timestamp": timestamp
+        }
+
+        method = method.upper()
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            raise ValueError(f"不支持的HTTP方法: {method}")
+
+        session = self._get_session()
+        async with self._semaphore:
+            try:
+                async with session.request(
+                    method,
+                    url,
+                    headers=headers,
+                    data=body_bytes if method != "GET" else None
+                ) as response:
+                    content = await response.read()
+                    if response.status >= 400:
+                        raise error_from_response(response, content.decode("utf-8", "replace"))
+                    try:
+                        return self.codec.loads(content)
+                    except ValueError:
+                        raise OzonAPIError(f"API响应解析错误: {content[:500]!r}", response=response)
+            except _CONNECT_ERRORS as e:
+                raise ConnectError(f"API请求错误: {str(e)}")
+            except aiohttp.ClientError as e:
+                raise NetworkError(f"API请求错误: {str(e)}")
+            except asyncio.TimeoutError:
+                raise NetworkError("API请求错误: 请求超时")
+
+    # 广告活动相关方法
+    async def get_campaigns(self, filter_params: Optional[Dict] = None) -> List[Dict]:
+        """获取广告活动列表（所有分页）"""
+        return [campaign async for campaign in self.iter_campaigns(filter_params)]
+
+    def iter_campaigns(
+        self,
+        filter_params: Optional[Dict] = None,
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        逐个产出广告活动，按需翻页
+
+        Args:
+            filter_params: 过滤条件，作为查询参数传给API
+            page_size: 每页数量，None 时使用API默认值
+        """
+        return self._iter_pages("/campaigns", "campaigns", filter_params, page_size)
+
+    async def create_campaign(self, campaign_data: Dict) -> Dict:
+        """创建广告活动"""
+        endpoint = "/campaigns"
+        return await self._make_request("POST", endpoint, campaign_data)
+
+    async def get_campaign_stats(self, campaign_id: int, date_from: str, date_to: str, metrics: List[str]) -> Dict:
+        """获取广告活动统计数据"""
+        endpoint = f"/campaigns/{campaign_id}/stats"
+        body = {
+            "date_from": date_from,
+            "date_to": date_to,
+            "metrics": metrics
+        }
+        return await self._make_request("POST", endpoint, body)
+
+    async def get_ad_groups(self, campaign_id: int, filter_params: Optional[Dict] = None) -> List[Dict]:
+        """获取广告组列表（所有分页）"""
+        return [ad_group async for ad_group in self.iter_ad_groups(campaign_id, filter_params)]
+
+    def iter_ad_groups(
+        self,
+        campaign_id: int,
+        filter_params: Optional[Dict] = None,
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """逐个产出广告组，按需翻页，参见 iter_campaigns"""
+        endpoint = f"/campaigns/{campaign_id}/ad_groups"
+        return self._iter_pages(endpoint, "ad_groups", filter_params, page_size)
+
+    async def get_ads(self, campaign_id: int, ad_group_id: int, filter_params: Optional[Dict] = None) -> List[Dict]:
+        """获取广告列表（所有分页）"""
+        return [ad async for ad in self.iter_ads(campaign_id, ad_group_id, filter_params)]
+
+    def iter_ads(
+        self,
+        campaign_id: int,
+        ad_group_id: int,
+        filter_params: Optional[Dict] = None,
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """逐个产出广告，按需翻页，参见 iter_campaigns"""
+        endpoint = f"/campaigns/{campaign_id}/ad_groups/{ad_group_id}/ads"
+        return self._iter_pages(endpoint, "ads", filter_params, page_size)
+
+    async def _iter_pages(
+        self,
+        endpoint: str,
+        key: str,
+        filter_params: Optional[Dict],
+        page_size: Optional[int]
+    ) -> AsyncIterator[Dict]:
+        """
+        按 next_page_token 翻页并逐个产出 key 字段中的元素，与同步客户端相同
+
+        调用方处理第 N 页时，第 N+1 页的请求已经发出；内存中最多同时保留两页数据。
+        """
+        params = dict(filter_params or {})
+        params["page_size"] = page_size
+
+        def fetch_page(page_token: Optional[str]):
+            return self._make_request("GET", with_query(endpoint, {**params, "page_token": page_token}))
+
+        page = await fetch_page(None)
+        pending = None
+        try:
+            while True:
+                next_token = page.get("next_page_token")
+                if next_token:
+                    pending = asyncio.ensure_future(fetch_page(next_token))
+                items = page.get(key, [])
+                page = None
+                for item in items:
+                    yield item
+                if pending is None:
+                    return
+                page = await pending
+                pending = None
+        finally:
+            # 调用方提前结束迭代时取消预取
+            if pending is not None:
+                pending.cancel()
+
+    async def get_ad_stats(self, campaign_id: int, ad_group_id: int, ad_id: int, date_from: str, date_to: str, metrics: List[str]) -> Dict:
+        """获取广告统计数据"""
+        endpoint = f"/campaigns/{campaign_id}/ad_groups/{ad_group_id}/ads/{ad_id}/stats"
+        body = {
+            "date_from": date_from,
+            "date_to": date_to,
+            "metrics": metrics
+        }
+        return await self._make_request("POST", endpoint, body)
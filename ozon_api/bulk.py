@@ -0,0 +1,142 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from .exceptions import DeadlineExceededError, OzonAPIError, ServerError
+from .utils import is_safe_to_resend
+
+
+class BulkResult:
+    """批量写入中单个条目的结果：成功时 value 为API响应，失败时 error 为 OzonAPIError"""
+
+    __slots__ = ("index", "item", "value", "error")
+
+    def __init__(self, index: int, item: Any, value: Any = None, error: Optional[OzonAPIError] = None):
+        self.index = index
+        self.item = item
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def uncertain(self) -> bool:
+        """请求失败，但可能已经被服务端执行（读取超时、连接中断、5xx、超过截止时间）"""
+        return isinstance(self.error, (ServerError, DeadlineExceededError)) and not is_safe_to_resend(self.error)
+
+    def __repr__(self):
+        outcome = "ok" if self.ok else f"error={self.error!r}"
+        return f"BulkResult(index={self.index}, {outcome})"
+
+
+class BulkReport:
+    """
+    批量写入的结果，按输入顺序排列
+
+    某个条目失败不会中断其他条目；retry_failed 只重新发送失败的条目。
+    """
+
+    def __init__(
+        self, operation: Callable[[Any], Any], results: List[BulkResult], concurrency: int, idempotent: bool = True
+    ):
+        self._operation = operation
+        self.results = results
+        self.concurrency = concurrency
+        self.idempotent = idempotent
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __iter__(self) -> Iterator[BulkResult]:
+        return iter(self.results)
+
+    def __getitem__(self, index: int) -> BulkResult:
+        return self.results[index]
+
+    @property
+    def succeeded(self) -> List[BulkResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[BulkResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def values(self) -> List[Any]:
+        """按输入顺序排列的响应，失败的条目为 None"""
+        return [result.value for result in self.results]
+
+    def raise_for_errors(self):
+        """存在失败条目时抛出第一个错误"""
+        for result in self.results:
+            if not result.ok:
+                raise result.error
+
+    def retry_failed(self, concurrency: Optional[int] = None, include_uncertain: bool = False) -> "BulkReport":
+        """
+        重新发送失败的条目，用新结果替换原结果
+
+        写操作的报告（idempotent 为 False）默认跳过结果不确定的条目（参见 BulkResult.uncertain），
+        重新发送它们可能重复创建；确认服务端没有创建之后再传入 include_uncertain=True。
+
+        Args:
+            concurrency: 同时在途的请求数，默认与原批次相同
+            include_uncertain: 是否同时重新发送结果不确定的写操作条目
+
+        Returns:
+            self，便于链式调用
+        """
+        failed = self.failed
+        if not self.idempotent and not include_uncertain:
+            failed = [result for result in failed if not result.uncertain]
+        retried = run_bulk(
+            self._operation, [result.item for result in failed], concurrency or self.concurrency, self.idempotent
+        )
+        for original, result in zip(failed, retried):
+            result.index = original.index
+            self.results[original.index] = result
+        return self
+
+    def __repr__(self):
+        return f"BulkReport(total={len(self.results)}, failed={len(self.failed)})"
+
+
+def run_bulk(
+    operation: Callable[[Any], Any], items: Iterable[Any], concurrency: int = 8, idempotent: bool = True
+) -> BulkReport:
+    """
+    用 concurrency 个线程对每个条目执行 operation(item)
+
+    条目按需从 items 中读取，在途的条目不超过 2 * concurrency 个。OzonAPIError 记录在
+    对应条目的结果中，其他异常直接抛出。operation 是创建等写操作时 idempotent 应为 False，
+    BulkReport.retry_failed 因此不会重新发送可能已经生效的条目。
+
+    Returns:
+        按输入顺序排列的 BulkReport
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency 必须大于 0")
+
+    results: Dict[int, BulkResult] = {}
+
+    def execute(index: int, item: Any) -> BulkResult:
+        try:
+            return BulkResult(index, item, value=operation(item))
+        except OzonAPIError as e:
+            return BulkResult(index, item, error=e)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ozon-bulk") as executor:
+        pending = set()
+        for index, item in enumerate(items):
+            pending.add(executor.submit(execute, index, item))
+            if len(pending) >= 2 * concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    results[result.index] = result
+        for future in pending:
+            result = future.result()
+            results[result.index] = result
+
+    return BulkReport(operation, [results[index] for index in range(len(results))], concurrency, idempotent)
@@ -0,0 +1,240 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class CacheStats:
+    """缓存命中统计"""
+
+    __slots__ = ("hits", "misses", "evictions", "revalidations", "stores")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revalidations = 0
+        self.stores = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict:
+        """转换为字典"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "revalidations": self.revalidations,
+            "stores": self.stores,
+            "hit_rate": self.hit_rate
+        }
+
+
+class CacheEntry:
+    """缓存条目：响应数据及其条件请求校验信息"""
+
+    __slots__ = ("value", "stored_at", "etag", "last_modified")
+
+    def __init__(self, value: Any, stored_at: float, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.value = value
+        self.stored_at = stored_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def validators(self) -> Dict[str, str]:
+        """返回条件请求头"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    响应缓存基类
+
+    以 (方法, 接口, 请求体) 为键缓存解析后的响应。条目在 ttl 秒内直接命中；
+    过期但带有 ETag/Last-Modified 的条目会通过条件请求重新验证，服务端返回 304 时
+    沿用缓存数据。子类只需实现条目的读写和淘汰。
+
+    注意：命中时返回的是缓存中的同一个对象，调用方不应修改它。
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        """
+        Args:
+            ttl: 条目的有效期（秒）
+        """
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def make_key(method: str, endpoint: str, body: Optional[Dict] = None) -> str:
+        """生成缓存键"""
+        body_str = json.dumps(body, sort_keys=True, separators=(',', ':')) if body else ""
+        return f"{method.upper()} {endpoint} {body_str}"
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.stored_at < self.ttl
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """
+        查找缓存条目并记录命中统计
+
+        Returns:
+            缓存条目（可能已过期，调用方用 is_fresh 判断），不存在时返回 None
+        """
+        with self._lock:
+            entry = self._get(key)
+            if entry is not None and self.is_fresh(entry):
+                self.stats.hits += 1
+            else:
+                self.stats.misses += 1
+            return entry
+
+    def store(self, key: str, value: Any, headers=None):
+        """写入响应数据，headers 中的 ETag/Last-Modified 用于之后的条件请求"""
+        headers = headers or {}
+        entry = CacheEntry(value, time.time(), headers.get("ETag"), headers.get("Last-Modified"))
+        with self._lock:
+            self._set(key, entry)
+            self.stats.stores += 1
+
+    def revalidated(self, key: str, entry: CacheEntry, headers=None):
+        """服务端返回 304 后调用，刷新条目的有效期"""
+        headers = headers or {}
+        entry.stored_at = time.time()
+        entry.etag = headers.get("ETag") or entry.etag
+        entry.last_modified = headers.get("Last-Modified") or entry.last_modified
+        with self._lock:
+            self._set(key, entry)
+            self.stats.revalidations += 1
+
+    def invalidate(self, endpoint: str):
+        """删除指定接口路径（及其子路径）下所有 GET 请求的缓存"""
+        prefix = f"GET {endpoint.split('?', 1)[0]}"
+        with self._lock:
+            self._delete_prefix(prefix)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._delete_prefix("")
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    def _set(self, key: str, entry: CacheEntry):
+        raise NotImplementedError
+
+    def _delete_prefix(self, prefix: str):
+        raise NotImplementedError
+
+
+class MemoryCache(ResponseCache):
+    """进程内 LRU 缓存"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        """
+        Args:
+            maxsize: 最多缓存的条目数，超出时淘汰最久未使用的条目
+            ttl: 条目的有效期（秒）
+        """
+        super().__init__(ttl)
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _set(self, key: str, entry: CacheEntry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _delete_prefix(self, prefix: str):
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+
+
+class DiskCache(ResponseCache):
+    """基于 SQLite 的磁盘缓存，进程重启后仍然有效"""
+
+    def __init__(self, path: str, maxsize: int = 100000, ttl: float = 3600.0):
+        """
+        Args:
+            path: SQLite 数据库文件路径
+            maxsize: 最多缓存的条目数，超出时淘汰最久未使用的条目
+            ttl: 条目的有效期（秒）
+        """
+        super().__init__(ttl)
+        self.path = path
+        self.maxsize = maxsize
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_accessed ON response_cache (accessed_at)")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+    def close(self):
+        """关闭数据库连接"""
+        self._conn.close()
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        row = self._conn.execute(
+            "SELECT value, stored_at, etag, last_modified FROM response_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE response_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        return CacheEntry(json.loads(row[0]), row[1], row[2], row[3])
+
+    def _set(self, key: str, entry: CacheEntry):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO response_cache (key, value, stored_at, etag, last_modified, accessed_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (key, json.dumps(entry.value), entry.stored_at, entry.etag, entry.last_modified, time.time())
+        )
+        overflow = self._conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0] - self.maxsize
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM response_cache WHERE key IN"
+                " (SELECT key FROM response_cache ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            )
+            self.stats.evictions += overflow
+        self._conn.commit()
+
+    def _delete_prefix(self, prefix: str):
+        self._conn.execute(
+            "DELETE FROM response_cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        )
+        self._conn.commit()
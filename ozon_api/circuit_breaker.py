@@ -0,0 +1,100 @@
+import threading
+import time
+from typing import Dict
+
+from .exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Circuit:
+    __slots__ = ("state", "failures", "opened_at", "trial_in_flight")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+
+
+class CircuitBreaker:
+    """
+    按接口划分的熔断器
+
+    同一接口连续失败 failure_threshold 次后熔断，在 recovery_timeout 秒内的请求直接
+    抛出 CircuitOpenError；超时后放行一个试探请求，成功则恢复，失败则继续熔断。
+    接口降级时，大批量抓取因此能快速失败，而不是让每个工作线程都卡在重试等待中。
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        初始化熔断器
+
+        Args:
+            failure_threshold: 触发熔断的连续失败次数
+            recovery_timeout: 熔断后到放行试探请求之间的秒数
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def _circuit(self, key: str) -> _Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit()
+        return circuit
+
+    def before_call(self, key: str):
+        """
+        请求发出前调用，熔断时抛出 CircuitOpenError
+
+        Args:
+            key: 接口标识，通常为接口路径模板
+        """
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == CLOSED:
+                return
+            if circuit.state == OPEN:
+                remaining = circuit.opened_at + self.recovery_timeout - time.monotonic()
+                if remaining > 0:
+                    raise CircuitOpenError(f"接口 {key} 已熔断，{remaining:.1f} 秒后重试")
+                circuit.state = HALF_OPEN
+            if circuit.trial_in_flight:
+                raise CircuitOpenError(f"接口 {key} 正在试探恢复")
+            circuit.trial_in_flight = True
+
+    def record_success(self, key: str):
+        """请求成功后调用"""
+        with self._lock:
+            circuit = self._circuit(key)
+            circuit.state = CLOSED
+            circuit.failures = 0
+            circuit.trial_in_flight = False
+
+    def record_failure(self, key: str):
+        """请求失败（服务器错误或网络错误）后调用"""
+        with self._lock:
+            circuit = self._circuit(key)
+            circuit.failures += 1
+            circuit.trial_in_flight = False
+            if circuit.state == HALF_OPEN or circuit.failures >= self.failure_threshold:
+                circuit.state = OPEN
+                circuit.opened_at = time.monotonic()
+
+    def release(self, key: str):
+        """
+        获得许可的请求没有得到结果（例如发出前就失败）时调用
+
+        释放半开状态下的试探名额，状态和失败计数不变，下一个请求可以继续试探。
+        """
+        with self._lock:
+            self._circuit(key).trial_in_flight = False
+
+    def state(self, key: str) -> str:
+        """返回某个接口当前的熔断状态"""
+        with self._lock:
+            return self._circuit(key).state
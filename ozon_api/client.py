@@ -1,68 +1,664 @@
 import requests
-import json
 import hmac
 import hashlib
 import time
-from typing import Dict, List, Optional, Any, Union
-import configparser
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError, as_completed
+from contextlib import closing, contextmanager
 
-from .exceptions import OzonAPIError
-from .utils import retry_on_failure
+from .codec import JSONCodec, get_codec
+from .coalescer import StatsCoalescer
+from .models import Statistic, StatisticBatch
+from .streaming import iter_json_array
+from .singleflight import SingleFlight
+from .hedging import HedgePolicy
+from .scheduler import RequestScheduler, tenant_from_endpoint
+from .bulk import BulkReport, run_bulk
+from .compression import compress
+from .config import Config
+from .transport import Transport, transport_from_config
+from .instrumentation import InstrumentedAdapter, RequestEvent, take_connect_time
+from .exceptions import (
+    OzonAPIError, ServerError, NetworkError, ConnectError, DeadlineExceededError, error_from_response
+)
+from .utils import (
+    retry_on_failure, parse_retry_after, endpoint_template, is_idempotent_request, is_safe_to_resend,
+    split_date_range, merge_stats_responses, with_query
+)
+
+
+def _load_config(config_file: Union[str, Config, None]) -> Config:
+    """已经加载的 Config 直接使用，否则从配置文件加载"""
+    return config_file if isinstance(config_file, Config) else Config(config_file)
+
+
+def _read_credentials(config: Config):
+    """从配置中读取 client_id 和 api_key"""
+    client_id, api_key = config.get("client_id"), config.get("api_key")
+    if not client_id or not api_key:
+        raise ValueError("配置文件中缺少必要的配置项，请检查 'ozon_api' 部分的 'client_id' 和 'api_key'。")
+    return client_id, api_key
+
+
+class _ReleasingResponse:
+    """
+    流式响应的包装：正文读完之前连接仍被占用，关闭响应时才调用 release 归还调度器的在途名额
+
+    其他属性和方法都转发给原响应。
+    """
+
+    def __init__(self, response, release: Callable[[], None]):
+        self._response = response
+        self._release = release
+
+    def __getattr__(self, name: str):
+        return getattr(self._response, name)
+
+    def close(self):
+        try:
+            self._response.close()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                release()
 
 
 class OzonAPIClient:
     """Ozon广告API客户端"""
 
-    def __init__(self, config_file: str, base_url: str = "https://performance.ozon.ru/api/v1"):
+    def __init__(
+        self,
+        config_file: Union[str, Config, None],
+        base_url: str = "https://performance.ozon.ru/api/v1",
+        rate_limiter=None,
+        circuit_breaker=None,
+        max_retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
+        retry_budget: Optional[float] = 30.0,
+        cache=None,
+        stats_store=None,
+        stats_window_days: Optional[int] = None,
+        stats_workers: int = 4,
+        json_codec: Optional[JSONCodec] = None,
+        credentials: Optional[Tuple[str, str]] = None,
+        session: Optional[requests.Session] = None,
+        transport: Optional[Transport] = None,
+        request_compression: Optional[str] = None,
+        request_compression_min_size: Optional[int] = None,
+        single_flight: bool = True,
+        deadline: Optional[float] = None,
+        endpoint_deadlines: Optional[Dict[str, float]] = None,
+        hedging: Optional[HedgePolicy] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        priority: str = "default"
+    ):
         """
         初始化Ozon API客户端
 
         Args:
-            config_file: 配置文件的路径
+            config_file: 配置文件的路径，或已经加载的 Config（避免重复读取和解析同一个文件）
             base_url: API基础URL
+            rate_limiter: 可选的 RateLimiter，按 client_id 在发送前限流
+            circuit_breaker: 可选的 CircuitBreaker，按接口熔断
+            max_retries: 临时错误的最大重试次数，默认取配置文件中的 max_retries
+            backoff_factor: 重试退避因子，默认取配置文件中的 backoff_factor
+            retry_budget: 单次调用（含重试等待）的总时间预算（秒），None 表示不限制
+            cache: 可选的 ResponseCache（MemoryCache 或 DiskCache），缓存 GET 列表请求
+            stats_store: 可选的 StatsStore，已结算日期的统计数据只请求一次
+            stats_window_days: 统计查询的分段天数，设置后长日期区间会拆分为多个子区间并行请求
+            stats_workers: 并行请求子区间的线程数
+            json_codec: JSON 编解码器，默认安装了 orjson 时使用 orjson，否则使用标准库
+            credentials: (client_id, api_key)，指定时不再读取 config_file
+            session: 共享的 requests.Session，多个客户端可以共用同一个连接池
+            transport: 传输层，默认按配置文件中的连接池、超时和 keep-alive 配置创建，参见 transport_from_config
+            request_compression: 写请求体的压缩编码（gzip、br 或 zstd），默认取配置文件中的
+                request_compression，为空时不压缩；只用于接受压缩请求体的接口
+            request_compression_min_size: 请求体达到该字节数才压缩
+            single_flight: 是否合并相同的并发只读请求（GET 和统计查询），合并的调用方共享同一个结果
+            deadline: 每次调用（包括所有重试和等待）的截止时间（秒），超过时抛出 DeadlineExceededError；
+                None 表示不限制，也可以用 with client.deadline(秒数) 为一段代码设置
+            endpoint_deadlines: 按接口模板设置的截止时间，例如 {"/campaigns/{id}/stats": 20}，优先于 deadline
+            hedging: 可选的 HedgePolicy，只读请求慢于该接口近期耗时的分位数时发送对冲请求
+            scheduler: 可选的 RequestScheduler，按优先级和广告活动公平分配限流器的令牌；
+                每个 client_id 应使用单独的调度器
+            priority: 请求默认的优先级类别，可以用 with client.priority(...) 临时修改
         """
+        config = _load_config(config_file)
         self.base_url = base_url
-        self.session = requests.Session()
-        self._configure_session()
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.max_retries = max_retries if max_retries is not None else config.get("max_retries")
+        self.backoff_factor = backoff_factor if backoff_factor is not None else config.get("backoff_factor")
+        self.retry_budget = retry_budget
+        self.cache = cache
+        self.stats_store = stats_store
+        if stats_window_days is not None and stats_window_days < 1:
+            raise ValueError(f"stats_window_days 必须为 None 或大于等于 1: {stats_window_days}")
+        self.stats_window_days = stats_window_days
+        self.stats_workers = stats_workers
+        self._stats_executor = None
+        self._page_executor = None
+        self._stats_executor_lock = threading.Lock()
+        self.stats_coalescer = None
+        # 流式读取响应时每次读取的字节数
+        self.stream_chunk_size = 64 * 1024
+        # 请求度量钩子，参见 add_hook
+        self._hooks: List[Callable[[RequestEvent], None]] = []
+        # 当前线程的重试次数、重试等待和尚未发出的度量事件
+        self._local = threading.local()
+        self.transport = transport if transport is not None else transport_from_config(config, session=session)
+        # 使用 requests 以外的传输层时为 None
+        self.session = getattr(self.transport, "session", None)
+        self.request_compression = request_compression or config.get("request_compression") or None
+        if request_compression_min_size is None:
+            request_compression_min_size = config.get("request_compression_min_size")
+        self.request_compression_min_size = request_compression_min_size
+        self.single_flight = SingleFlight() if single_flight else None
+        self.default_deadline = deadline
+        self.endpoint_deadlines = dict(endpoint_deadlines or {})
+        self.hedging = hedging
+        self._hedge_executor = None
+        self._primary_executor = None
+        self._primary_slots = threading.BoundedSemaphore(hedging.primary_workers) if hedging is not None else None
+        self.scheduler = scheduler
+        self.default_priority = priority
 
-        # 读取配置文件
-        config = configparser.ConfigParser()
-        config.read(config_file)
+        self.codec = json_codec if json_codec is not None else get_codec()
 
-        # 获取 client_id 和 api_key
-        try:
-            self.client_id = config.get('ozon_api', 'client_id')
-            self.api_key = config.get('ozon_api', 'api_key')
-        except (configparser.NoSectionError, configparser.NoOptionError):
-            raise ValueError("配置文件中缺少必要的配置项，请检查 'ozon_api' 部分的 'client_id' 和 'api_key'。")
-
-    def _configure_session(self):
-        """配置请求会话"""
-        self.session.headers.update({
-            "Content-Type": "application/json",
-            "Host": "performance.ozon.ru"
-        })
-
-    def _generate_signature(self, method: str, url: str, body: Optional[Dict] = None) -> str:
-        """生成API请求签名"""
-        timestamp = str(int(time.time()))
+        # 读取配置文件，获取 client_id 和 api_key
+        if credentials is not None:
+            self.client_id, self.api_key = credentials
+        else:
+            self.client_id, self.api_key = _read_credentials(config)
+        self._hmac_key = hmac.new(self.api_key.encode(), digestmod=hashlib.sha256)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """停止统计合并的后台线程，关闭分段、分页、原请求和对冲请求的线程池以及传输层的连接池"""
+        if self.stats_coalescer is not None:
+            self.stats_coalescer.close()
+            self.stats_coalescer = None
+        with self._stats_executor_lock:
+            executors = (self._stats_executor, self._page_executor, self._primary_executor, self._hedge_executor)
+            self._stats_executor = self._page_executor = self._primary_executor = self._hedge_executor = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self.transport.close()
+
+    def _generate_signature(
+        self,
+        method: str,
+        url: str,
+        body: Union[bytes, Dict, None] = None,
+        timestamp: Optional[str] = None
+    ) -> str:
+        """
+        生成API请求签名
+
+        Args:
+            method: HTTP 方法
+            url: 完整的请求URL
+            body: 将要发送的请求体字节串（字典会先用客户端的编解码器编码）
+            timestamp: 与 X-Timestamp 请求头一致的时间戳，默认取当前时间
+        """
+        if timestamp is None:
+            timestamp = str(int(time.time()))
         request_path = url.replace(self.base_url, "")
 
-        body_str = json.dumps(body, separators=(',', ':')) if body else ""
-        message = f"{timestamp}{method}{request_path}{body_str}"
+        body_bytes = self._encode_body(body) or b""
+        message = f"{timestamp}{method}{request_path}".encode() + body_bytes
+
+        # 复制预先初始化好密钥的 HMAC 对象，省去每次重新处理密钥
+        signer = self._hmac_key.copy()
+        signer.update(message)
+        return signer.hexdigest()
 
-        return hmac.new(
-            self.api_key.encode(),
-            message.encode(),
-            hashlib.sha256
-        ).hexdigest()
+    def _encode_body(self, body: Union[bytes, Dict, None]) -> Optional[bytes]:
+        """把请求体编码为字节串；已经是字节串时原样返回"""
+        if body is None or isinstance(body, (bytes, bytearray)):
+            return body
+        return self.codec.dumps(body)
 
-    @retry_on_failure(max_retries=3, backoff_factor=1)
     def _make_request(self, method: str, endpoint: str, body: Optional[Dict] = None) -> Dict:
-        """发送API请求"""
+        """发送API请求，遇到限流、服务器错误和网络错误时按退避策略重试"""
+        method = method.upper()
+        # 请求体只编码一次，签名和发送的都是同一份字节串，重试时也不再重复编码
+        body_bytes = self._encode_body(body)
+        with self._deadline_at(self._endpoint_deadline(endpoint)):
+            if self.single_flight is not None and is_idempotent_request(method, endpoint):
+                # 相同的并发只读请求只发送一次，结果（包括异常）由所有调用方共享。
+                # 不同优先级类别的请求不合并，否则 interactive 调用会等在 backfill 请求之后；
+                # 等待方按自己的截止时间等待
+                priority = (getattr(self._local, "priority", None) or (self.default_priority,))[0]
+                try:
+                    return self.single_flight.do(
+                        (method, endpoint, body_bytes, priority),
+                        lambda: self._request(method, endpoint, body_bytes),
+                        timeout=self._remaining()
+                    )
+                except TimeoutError:
+                    self._check_deadline(method, endpoint)
+                    raise
+            return self._request(method, endpoint, body_bytes)
+
+    @contextmanager
+    def deadline(self, seconds: float):
+        """
+        为 with 代码块中的请求设置截止时间
+
+        截止时间覆盖代码块中的所有调用，包括重试、重试等待、翻页预取和统计子区间请求；
+        剩余时间同时作为每次请求的连接和读取超时。超时抛出 DeadlineExceededError。
+        嵌套使用时以较早的截止时刻为准。
+
+        Args:
+            seconds: 从现在起的秒数
+        """
+        with self._deadline_at(time.monotonic() + seconds):
+            yield
+
+    @contextmanager
+    def _deadline_at(self, deadline: Optional[float]):
+        """在当前线程上设置截止时刻（time.monotonic()），已有更早的截止时刻时保留原值"""
+        previous = getattr(self._local, "deadline", None)
+        if deadline is not None and (previous is None or deadline < previous):
+            self._local.deadline = deadline
+        try:
+            yield
+        finally:
+            self._local.deadline = previous
+
+    def _endpoint_deadline(self, endpoint: str) -> Optional[float]:
+        seconds = self.endpoint_deadlines.get(endpoint_template(endpoint), self.default_deadline)
+        return time.monotonic() + seconds if seconds is not None else None
+
+    def _current_deadline(self) -> Optional[float]:
+        return getattr(self._local, "deadline", None)
+
+    def _remaining(self) -> Optional[float]:
+        """当前线程的截止时刻之前还剩的秒数，没有截止时间时为 None"""
+        deadline = self._current_deadline()
+        return deadline - time.monotonic() if deadline is not None else None
+
+    @contextmanager
+    def priority(self, name: str, tenant=None):
+        """
+        为 with 代码块中的请求设置优先级类别和公平排队的租户（需要 scheduler）
+
+        用法:
+            with client.priority("backfill"):
+                for ad in ads:
+                    client.get_ad_stats(...)
+
+        Args:
+            name: 优先级类别，例如 interactive、default、backfill
+            tenant: 公平排队的租户，默认取请求路径中的广告活动ID
+        """
+        if self.scheduler is not None and name not in self.scheduler.priorities:
+            raise ValueError(f"未知的优先级: {name}")
+        with self._priority_as((name, tenant)):
+            yield
+
+    @contextmanager
+    def _priority_as(self, priority: Optional[Tuple[str, Any]]):
+        previous = getattr(self._local, "priority", None)
+        self._local.priority = priority
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def _bind_context(self, func: Callable) -> Callable:
+        """把当前线程的截止时刻和优先级带到执行 func 的其他线程中"""
+        deadline = self._current_deadline()
+        priority = getattr(self._local, "priority", None)
+        if deadline is None and priority is None:
+            return func
+
+        def bound(*args):
+            with self._deadline_at(deadline), self._priority_as(priority):
+                return func(*args)
+
+        return bound
+
+    def _request(self, method: str, endpoint: str, body_bytes: Optional[bytes]) -> Dict:
+        if self.cache is not None and method == "GET":
+            return self._cached_request(endpoint)
+        try:
+            return self._retrying(self._request_once, is_idempotent_request(method, endpoint))(
+                method, endpoint, body_bytes
+            )
+        finally:
+            if self.cache is not None and not is_idempotent_request(method, endpoint):
+                # 写操作之后，相同路径下的列表缓存不再可信
+                self.cache.invalidate(endpoint)
+
+    def _retrying(self, func, idempotent: bool = True):
+        """
+        按客户端的重试配置包装 func
+
+        写请求（idempotent 为 False）只在确定没有被服务端执行时重试（参见 is_safe_to_resend）：
+        读取超时或 5xx 之后重新发送可能重复创建对象。
+        """
+        return retry_on_failure(
+            max_retries=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            max_elapsed=self.retry_budget,
+            on_retry=self._on_retry,
+            deadline=self._current_deadline,
+            retry_if=None if idempotent else is_safe_to_resend
+        )(func)
+
+    def _on_retry(self, attempt: int, error: Exception, wait_time: float):
+        # 记在当前线程上，由下一次 _send 写入度量事件
+        self._local.attempt = attempt
+        self._local.retry_wait = wait_time
+
+    def add_hook(self, hook: Callable[[RequestEvent], None]):
+        """
+        注册请求度量钩子
+
+        每次 HTTP 请求（包括每次重试）完成后以 RequestEvent 调用 hook，事件包含各阶段耗时、
+        状态码、重试次数、字节数和接口模板。钩子在发送请求的线程中同步调用，应尽量轻量，
+        例如 MetricsCollector。
+        """
+        current = self.session.get_adapter("https://") if self.session is not None else None
+        if current is not None and not isinstance(current, InstrumentedAdapter):
+            # 需要统计建立连接的耗时；保留原适配器的连接池配置
+            adapter = InstrumentedAdapter(
+                pool_connections=current._pool_connections,
+                pool_maxsize=current._pool_maxsize,
+                max_retries=current.max_retries,
+                pool_block=current._pool_block
+            )
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[RequestEvent], None]):
+        """移除请求度量钩子"""
+        self._hooks.remove(hook)
+
+    def _emit(self, event: RequestEvent):
+        for hook in self._hooks:
+            hook(event)
+
+    def _take_event(self) -> Optional[RequestEvent]:
+        """取出当前线程上一次 _send 成功后留下的度量事件"""
+        event = getattr(self._local, "event", None)
+        self._local.event = None
+        return event
+
+    def _request_once(self, method: str, endpoint: str, body: Optional[bytes] = None) -> Dict:
+        """发送一次API请求并解析响应"""
+        if self.hedging is not None and is_idempotent_request(method, endpoint):
+            return self._hedged_request(method, endpoint, body)
+        response = self._send(method, endpoint, body)
+        return self._decode(response, self._take_event())
+
+    def _timed_request(
+        self,
+        template: str,
+        method: str,
+        endpoint: str,
+        body: Optional[bytes],
+        decided: Optional[threading.Event] = None
+    ) -> Optional[Dict]:
+        """
+        发送一次请求，并把成功请求的耗时记入对冲策略
+
+        decided 是对冲中两份请求共用的事件，先成功的一份设置它。此时先只读取响应头，
+        另一份已经成功时直接关闭响应、不再读取正文并返回 None，输掉的请求不会一直占用连接
+        和调度器的在途名额。
+        """
+        start = time.monotonic()
+        if decided is None:
+            response = self._send(method, endpoint, body)
+            result = self._decode(response, self._take_event())
+        else:
+            if decided.is_set():
+                return None
+            response = self._send(method, endpoint, body, stream=True)
+            event = self._take_event()
+            with closing(response):
+                if decided.is_set():
+                    if event is not None:
+                        self._emit(event)
+                    return None
+                self._read_body(response, event)
+                result = self._decode(response, event)
+        self.hedging.record(template, time.monotonic() - start)
+        return result
+
+    def _read_body(self, response: requests.Response, event: Optional[RequestEvent]):
+        """读取流式响应的全部正文（之后 response.content 直接返回），补全度量事件的下载耗时和字节数"""
+        start = time.perf_counter()
+        try:
+            content = response.content
+        except self.transport.network_errors as e:
+            if event is not None:
+                event.error = type(e).__name__
+                self._emit(event)
+            raise NetworkError(f"API响应读取错误: {str(e)}", response=response)
+        if event is not None:
+            event.download = time.perf_counter() - start
+            event.bytes_received = len(content)
+            event.wire_bytes_received = self._wire_bytes_received(response, event.bytes_received)
+
+    def _hedged_request(self, method: str, endpoint: str, body: Optional[bytes]) -> Dict:
+        """
+        带对冲的单次请求
+
+        原请求超过该接口近期耗时的分位数仍未返回时，在另一个线程（另一个连接）上发送
+        相同的请求，返回先成功的结果。两个请求都失败时抛出先失败的那个异常。
+        """
+        template = endpoint_template(endpoint)
+        delay = self.hedging.start(template)
+        if delay is None:
+            return self._timed_request(template, method, endpoint, body)
+        # 原请求在单独的线程池中发出，不与对冲请求排队，对冲线程池的大小不会成为原请求的
+        # 并发上限；原请求线程都在忙时不再对冲，直接在调用线程中发送
+        if not self._primary_slots.acquire(blocking=False):
+            return self._timed_request(template, method, endpoint, body)
+
+        # 重试次数、重试等待、截止时刻和优先级记在线程上，需要带到工作线程中
+        attempt = getattr(self._local, "attempt", 0)
+        retry_wait = getattr(self._local, "retry_wait", 0.0)
+        self._local.attempt, self._local.retry_wait = 0, 0.0
+        timed_request = self._bind_context(self._timed_request)
+        decided = threading.Event()
+
+        def run(future: Future, attempt: int, retry_wait: float, release: Optional[Callable[[], None]] = None):
+            try:
+                if not future.set_running_or_notify_cancel():
+                    return
+                self._local.attempt, self._local.retry_wait = attempt, retry_wait
+                try:
+                    result = timed_request(template, method, endpoint, body, decided)
+                except BaseException as e:
+                    future.set_exception(e)
+                    return
+                future.set_result(result)
+                if result is not None:
+                    decided.set()
+            finally:
+                if release is not None:
+                    release()
+
+        # 调用线程只负责等待，对冲请求先返回时不会被卡住的原请求拖住
+        primary = Future()
+        try:
+            self._get_primary_executor().submit(run, primary, attempt, retry_wait, self._primary_slots.release)
+        except BaseException:
+            self._primary_slots.release()
+            raise
+        remaining = self._remaining()
+        try:
+            return primary.result(timeout=delay if remaining is None else max(min(delay, remaining), 0.0))
+        except FutureTimeoutError:
+            pass
+
+        remaining = self._remaining()
+        if (remaining is not None and remaining <= 0) or not self.hedging.try_acquire():
+            return primary.result()
+
+        hedge = Future()
+        self._get_hedge_executor().submit(run, hedge, attempt, 0.0)
+        first_error = None
+        for future in as_completed((primary, hedge)):
+            error = future.exception()
+            if error is None:
+                if future is hedge:
+                    self.hedging.record_win()
+                # 对冲请求还在排队时直接取消；另一份已经发出的请求收到响应头后关闭，不再读取正文
+                hedge.cancel()
+                return future.result()
+            if first_error is None:
+                first_error = error
+        raise first_error
+
+    def _get_primary_executor(self) -> ThreadPoolExecutor:
+        with self._stats_executor_lock:
+            if self._primary_executor is None:
+                self._primary_executor = ThreadPoolExecutor(
+                    max_workers=self.hedging.primary_workers, thread_name_prefix="ozon-primary"
+                )
+            return self._primary_executor
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        with self._stats_executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self.hedging.workers, thread_name_prefix="ozon-hedge"
+                )
+            return self._hedge_executor
+
+    def _cached_request(self, endpoint: str) -> Dict:
+        """带缓存的 GET 请求：有效期内直接返回，过期后使用 ETag/Last-Modified 条件请求重新验证"""
+        key = self.cache.make_key("GET", endpoint)
+        entry = self.cache.lookup(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            return entry.value
+
+        extra_headers = entry.validators() if entry is not None else None
+        response = self._retrying(self._send)("GET", endpoint, None, extra_headers)
+        event = self._take_event()
+        if response.status_code == 304 and entry is not None:
+            if event is not None:
+                self._emit(event)
+            self.cache.revalidated(key, entry, response.headers)
+            return entry.value
+
+        data = self._decode(response, event)
+        self.cache.store(key, data, response.headers)
+        return data
+
+    def _decode(self, response: requests.Response, event: Optional[RequestEvent] = None) -> Dict:
+        """解析响应正文，并发出该请求的度量事件"""
+        start = time.perf_counter()
+        try:
+            return self.codec.loads(response.content)
+        except ValueError:
+            if event is not None:
+                event.error = "ValueError"
+            raise OzonAPIError(f"API响应解析错误: {response.text}", response=response)
+        finally:
+            if event is not None:
+                event.decode = time.perf_counter() - start
+                self._emit(event)
+
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        body: Union[bytes, Dict, None] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+        stream: bool = False
+    ) -> requests.Response:
+        """
+        签名并发送一次请求，按状态码把失败映射为对应的异常
+
+        stream 为 True 时只读取响应头，正文由调用方通过 iter_content 逐块读取。
+        """
+        method = method.upper()
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            raise ValueError(f"不支持的HTTP方法: {method}")
+
+        self._check_deadline(method, endpoint)
+        # 先等待令牌，再生成时间戳和签名，避免排队后签名过期
+        if self.scheduler is None:
+            if self.rate_limiter is not None:
+                self._acquire_token(method, endpoint)
+            return self._send_admitted(method, endpoint, body, extra_headers, stream)
+
+        self._schedule(method, endpoint)
+        try:
+            response = self._send_admitted(method, endpoint, body, extra_headers, stream)
+        except BaseException:
+            self.scheduler.release()
+            raise
+        if not stream:
+            self.scheduler.release()
+            return response
+        # 流式响应的正文读完或被关闭之前仍占用在途名额
+        return _ReleasingResponse(response, self.scheduler.release)
+
+    def _acquire_token(self, method: str, endpoint: str):
+        """获取限流器的令牌，最多等到当前线程的截止时刻"""
+        remaining = self._remaining()
+        if remaining is None:
+            self.rate_limiter.acquire(self.client_id)
+            return
+        try:
+            self.rate_limiter.acquire(self.client_id, timeout=remaining)
+        except TimeoutError:
+            raise DeadlineExceededError(f"等待限流令牌超过截止时间: {method} {endpoint}")
+
+    def _schedule(self, method: str, endpoint: str):
+        """在调度器中排队，轮到时获取限流器的令牌"""
+        priority, tenant = getattr(self._local, "priority", None) or (self.default_priority, None)
+        if tenant is None:
+            tenant = tenant_from_endpoint(endpoint)
+        gate = None
+        if self.rate_limiter is not None:
+            # 排队之后剩余的时间才是等待令牌的上限
+            gate = lambda: self._acquire_token(method, endpoint)  # noqa: E731
+        try:
+            self.scheduler.acquire(priority, tenant, gate, timeout=self._remaining())
+        except TimeoutError:
+            raise DeadlineExceededError(f"请求排队超过截止时间: {method} {endpoint}")
+
+    def _send_admitted(
+        self,
+        method: str,
+        endpoint: str,
+        body: Union[bytes, Dict, None],
+        extra_headers: Optional[Dict[str, str]],
+        stream: bool
+    ) -> requests.Response:
+        """_send 获得发送许可之后的部分"""
+        template = endpoint_template(endpoint)
+        event = None
+        if self._hooks:
+            event = RequestEvent(
+                method, template,
+                attempt=getattr(self._local, "attempt", 0),
+                retry_wait=getattr(self._local, "retry_wait", 0.0)
+            )
+            self._local.attempt, self._local.retry_wait, self._local.event = 0, 0.0, None
+
         url = f"{self.base_url}{endpoint}"
+        sign_start = time.perf_counter()
+        body = self._encode_body(body)
         timestamp = str(int(time.time()))
-        signature = self._generate_signature(method, url, body)
+        signature = self._generate_signature(method, url, body, timestamp)
 
         headers = {
             "Client-Id": self.client_id,
@@ -70,63 +666,423 @@ class OzonAPIClient:
             "X-Signature": signature,
             "X-Timestamp": timestamp
         }
+        if extra_headers:
+            headers.update(extra_headers)
+
+        # 签名针对未压缩的 JSON，服务端解压后再校验
+        wire_body = body
+        if self._should_compress(method, endpoint, body):
+            wire_body = compress(body, self.request_compression)
+            headers["Content-Encoding"] = self.request_compression
+
+        if event is not None:
+            event.sign = time.perf_counter() - sign_start
+            event.bytes_sent = len(body or b"")
+            event.wire_bytes_sent = len(wire_body or b"")
+            take_connect_time()
 
+        remaining = self._check_deadline(method, endpoint)
+        # 编码、压缩和截止时间检查都在获得熔断器许可之前完成；许可之后无论以何种方式结束都要
+        # 反馈结果，否则半开状态下的试探名额永远不会释放
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_call(template)
+        # None 表示没有得到结果（例如读取错误响应的正文时被中断），只释放试探名额
+        failed = None
         try:
-            if method.upper() == "GET":
-                response = self.session.get(url, headers=headers)
-            elif method.upper() == "POST":
-                response = self.session.post(url, headers=headers, json=body)
-            elif method.upper() == "PUT":
-                response = self.session.put(url, headers=headers, json=body)
-            elif method.upper() == "DELETE":
-                response = self.session.delete(url, headers=headers, json=body)
-            else:
-                raise ValueError(f"不支持的HTTP方法: {method}")
-
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise OzonAPIError(f"API请求错误: {str(e)}", response=getattr(e, 'response', None))
-        except json.JSONDecodeError:
-            raise OzonAPIError(f"API响应解析错误: {response.text}", response=response)
+            send_start = time.perf_counter()
+            try:
+                response = self.transport.send(method, url, headers, wire_body, stream, remaining)
+            except self.transport.network_errors as e:
+                failed = True
+                if event is not None:
+                    event.connect = take_connect_time()
+                    event.ttfb = time.perf_counter() - send_start - event.connect
+                    event.error = type(e).__name__
+                    self._emit(event)
+                if remaining is not None and self._remaining() <= 0:
+                    raise DeadlineExceededError(f"请求超过截止时间: {method} {endpoint}") from e
+                error_class = ConnectError if self.transport.is_connect_error(e) else NetworkError
+                raise error_class(f"API请求错误: {str(e)}", response=getattr(e, 'response', None))
+
+            if event is not None:
+                self._measure_response(event, response, time.perf_counter() - send_start, stream)
+                if not stream:
+                    event.wire_bytes_received = self._wire_bytes_received(response, event.bytes_received)
+
+            if self.rate_limiter is not None:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    self.rate_limiter.on_retry_after(self.client_id, retry_after)
+
+            if response.status_code >= 400:
+                error = error_from_response(response, response.text)
+                failed = isinstance(error, ServerError)
+                if event is not None:
+                    self._emit(event)
+                raise error
+            failed = False
+        finally:
+            self._record_outcome(template, failed)
+
+        # 成功的请求在解析正文之后再发出事件
+        self._local.event = event
+        return response
+
+    def _check_deadline(self, method: str, endpoint: str) -> Optional[float]:
+        """返回当前线程的剩余时间；已经超过截止时间时抛出 DeadlineExceededError"""
+        remaining = self._remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError(f"请求超过截止时间: {method} {endpoint}")
+        return remaining
+
+    def _should_compress(self, method: str, endpoint: str, body: Optional[bytes]) -> bool:
+        """只压缩足够大的写请求体；读请求体很小，压缩得不偿失"""
+        return (
+            self.request_compression is not None
+            and body is not None
+            and len(body) >= self.request_compression_min_size
+            and method in ("POST", "PUT")
+            and not is_idempotent_request(method, endpoint)
+        )
+
+    def _wire_bytes_received(self, response, decoded_bytes: int) -> int:
+        wire_bytes = self.transport.wire_bytes_received(response)
+        return wire_bytes if wire_bytes is not None else decoded_bytes
+
+    @staticmethod
+    def _measure_response(event: RequestEvent, response: requests.Response, elapsed: float, stream: bool):
+        """根据发送耗时和 response.elapsed（收到响应头的时刻）拆分 connect、ttfb 和 download"""
+        event.status = response.status_code
+        event.connect = take_connect_time()
+        headers_at = response.elapsed.total_seconds()
+        event.ttfb = max(headers_at - event.connect, 0.0)
+        if not stream:
+            event.download = max(elapsed - headers_at, 0.0)
+            event.bytes_received = len(response.content)
+
+    def _record_outcome(self, template: str, failed: Optional[bool]):
+        """把请求结果反馈给熔断器；failed 为 None 表示请求没有得到结果，只归还许可"""
+        if self.circuit_breaker is None:
+            return
+        if failed is None:
+            self.circuit_breaker.release(template)
+        elif failed:
+            self.circuit_breaker.record_failure(template)
+        else:
+            self.circuit_breaker.record_success(template)
+
+    def enable_stats_coalescing(self, window: float = 0.02, max_batch: int = 100, workers: int = 4) -> StatsCoalescer:
+        """
+        开启广告统计请求合并，之后并发调用的 get_ad_stats 会被合并为多广告统计请求
+
+        Args:
+            window: 收集同类请求的时间窗口（秒）
+            max_batch: 单次合并请求包含的最大广告数
+            workers: 并行发送合并请求的线程数
+        """
+        if self.stats_coalescer is not None:
+            self.stats_coalescer.close()
+        self.stats_coalescer = StatsCoalescer(self, window=window, max_batch=max_batch, workers=workers)
+        return self.stats_coalescer
 
     # 广告活动相关方法
     def get_campaigns(self, filter_params: Optional[Dict] = None) -> List[Dict]:
-        """获取广告活动列表"""
-        endpoint = "/campaigns"
-        return self._make_request("GET", endpoint).get('campaigns', [])
+        """获取广告活动列表（所有分页）"""
+        return list(self.iter_campaigns(filter_params))
+
+    def iter_campaigns(self, filter_params: Optional[Dict] = None, page_size: Optional[int] = None) -> Iterator[Dict]:
+        """
+        逐个产出广告活动，按需翻页
+
+        Args:
+            filter_params: 过滤条件，作为查询参数传给API
+            page_size: 每页数量，None 时使用API默认值
+        """
+        return self._iter_pages("/campaigns", "campaigns", filter_params, page_size)
 
     def create_campaign(self, campaign_data: Dict) -> Dict:
         """创建广告活动"""
         endpoint = "/campaigns"
         return self._make_request("POST", endpoint, campaign_data)
 
+    def create_campaigns_bulk(self, campaigns: Iterable[Dict], concurrency: int = 8) -> BulkReport:
+        """
+        并发创建多个广告活动
+
+        请求仍然经过限流器，单个条目失败不会中断其他条目。
+
+        Args:
+            campaigns: 广告活动数据，可以是生成器
+            concurrency: 同时在途的请求数
+
+        Returns:
+            按输入顺序排列的 BulkReport，可通过 retry_failed 只重新发送失败的条目（默认跳过可能已经创建的条目）
+        """
+        return run_bulk(self.create_campaign, campaigns, concurrency, idempotent=False)
+
     def get_campaign_stats(self, campaign_id: int, date_from: str, date_to: str, metrics: List[str]) -> Dict:
         """获取广告活动统计数据"""
         endpoint = f"/campaigns/{campaign_id}/stats"
-        body = {
-            "date_from": date_from,
-            "date_to": date_to,
-            "metrics": metrics
-        }
-        return self._make_request("POST", endpoint, body)
 
-    def get_ad_groups(self, campaign_id: int) -> List[Dict]:
-        """获取广告组列表"""
+        def fetch(range_from: str, range_to: str) -> Dict:
+            body = {
+                "date_from": range_from,
+                "date_to": range_to,
+                "metrics": metrics
+            }
+            return self._make_request("POST", endpoint, body)
+
+        return self._fetch_stats((campaign_id, None, None), date_from, date_to, metrics, fetch)
+
+    def get_ad_groups(self, campaign_id: int, filter_params: Optional[Dict] = None) -> List[Dict]:
+        """获取广告组列表（所有分页）"""
+        return list(self.iter_ad_groups(campaign_id, filter_params))
+
+    def iter_ad_groups(
+        self,
+        campaign_id: int,
+        filter_params: Optional[Dict] = None,
+        page_size: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """逐个产出广告组，按需翻页，参见 iter_campaigns"""
         endpoint = f"/campaigns/{campaign_id}/ad_groups"
-        return self._make_request("GET", endpoint).get('ad_groups', [])
+        return self._iter_pages(endpoint, "ad_groups", filter_params, page_size)
+
+    def create_ad_group(self, campaign_id: int, ad_group_data: Dict) -> Dict:
+        """创建广告组"""
+        endpoint = f"/campaigns/{campaign_id}/ad_groups"
+        return self._make_request("POST", endpoint, ad_group_data)
+
+    def create_ad_groups_bulk(self, campaign_id: int, ad_groups: Iterable[Dict], concurrency: int = 8) -> BulkReport:
+        """并发创建同一广告活动下的多个广告组，参见 create_campaigns_bulk"""
+        return run_bulk(
+            lambda ad_group: self.create_ad_group(campaign_id, ad_group), ad_groups, concurrency, idempotent=False
+        )
+
+    def get_ads(self, campaign_id: int, ad_group_id: int, filter_params: Optional[Dict] = None) -> List[Dict]:
+        """获取广告列表（所有分页）"""
+        return list(self.iter_ads(campaign_id, ad_group_id, filter_params))
+
+    def iter_ads(
+        self,
+        campaign_id: int,
+        ad_group_id: int,
+        filter_params: Optional[Dict] = None,
+        page_size: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """逐个产出广告，按需翻页，参见 iter_campaigns"""
+        endpoint = f"/campaigns/{campaign_id}/ad_groups/{ad_group_id}/ads"
+        return self._iter_pages(endpoint, "ads", filter_params, page_size)
+
+    def _iter_pages(
+        self,
+        endpoint: str,
+        key: str,
+        filter_params: Optional[Dict],
+        page_size: Optional[int]
+    ) -> Iterator[Dict]:
+        """
+        按 next_page_token 翻页并逐个产出 key 字段中的元素
+
+        调用方处理第 N 页时，第 N+1 页已在后台线程中请求，翻页等待被隐藏；
+        内存中最多同时保留两页数据。
+        """
+        params = dict(filter_params or {})
+        params["page_size"] = page_size
+
+        def fetch_page(page_token: Optional[str]) -> Dict:
+            return self._make_request("GET", with_query(endpoint, {**params, "page_token": page_token}))
+
+        page = fetch_page(None)
+        pending = None
+        try:
+            while True:
+                next_token = page.get("next_page_token")
+                if next_token:
+                    pending = self._get_page_executor().submit(self._bind_context(fetch_page), next_token)
+                items = page.get(key, [])
+                # 释放对当前页的引用，只保留正在产出的列表
+                page = None
+                yield from items
+                if pending is None:
+                    return
+                page = pending.result()
+                pending = None
+        finally:
+            # 调用方提前结束迭代时放弃尚未开始的预取
+            if pending is not None:
+                pending.cancel()
 
-    def get_ads(self, campaign_id: int, ad_group_id: int) -> List[Dict]:
-        """获取广告列表"""
+    def create_ad(self, campaign_id: int, ad_group_id: int, ad_data: Dict) -> Dict:
+        """创建广告"""
         endpoint = f"/campaigns/{campaign_id}/ad_groups/{ad_group_id}/ads"
-        return self._make_request("GET", endpoint).get('ads', [])
+        return self._make_request("POST", endpoint, ad_data)
+
+    def create_ads_bulk(
+        self,
+        campaign_id: int,
+        ad_group_id: int,
+        ads: Iterable[Dict],
+        concurrency: int = 8
+    ) -> BulkReport:
+        """并发创建同一广告组下的多个广告，参见 create_campaigns_bulk"""
+        return run_bulk(lambda ad: self.create_ad(campaign_id, ad_group_id, ad), ads, concurrency, idempotent=False)
 
     def get_ad_stats(self, campaign_id: int, ad_group_id: int, ad_id: int, date_from: str, date_to: str, metrics: List[str]) -> Dict:
         """获取广告统计数据"""
         endpoint = f"/campaigns/{campaign_id}/ad_groups/{ad_group_id}/ads/{ad_id}/stats"
+
+        def fetch(range_from: str, range_to: str) -> Dict:
+            if self.stats_coalescer is not None:
+                return self.stats_coalescer.submit(
+                    campaign_id, ad_group_id, ad_id, range_from, range_to, metrics
+                ).result()
+            body = {
+                "date_from": range_from,
+                "date_to": range_to,
+                "metrics": metrics
+            }
+            return self._make_request("POST", endpoint, body)
+
+        return self._fetch_stats((campaign_id, ad_group_id, ad_id), date_from, date_to, metrics, fetch)
+
+    def _fetch_stats(
+        self,
+        entity: tuple,
+        date_from: str,
+        date_to: str,
+        metrics: List[str],
+        fetch: Callable[[str, str], Dict]
+    ) -> Dict:
+        """
+        获取统计数据
+
+        配置了 stats_window_days 时长区间拆分为子区间并行请求；
+        配置了 stats_store 时只请求缺失或尚未结算的日期。
+        """
+        if self.stats_window_days:
+            fetch = self._split_by_window(fetch)
+        if self.stats_store is not None:
+            return self.stats_store.fetch(entity, date_from, date_to, metrics, fetch)
+        return fetch(date_from, date_to)
+
+    def _split_by_window(self, fetch: Callable[[str, str], Dict]) -> Callable[[str, str], Dict]:
+        """把 fetch 包装为按 stats_window_days 拆分区间、并行请求、按顺序合并结果"""
+        def windowed_fetch(date_from: str, date_to: str) -> Dict:
+            windows = split_date_range(date_from, date_to, self.stats_window_days)
+            if len(windows) == 1:
+                return fetch(date_from, date_to)
+            # 每个子区间各自经过 _make_request 的重试，失败的子区间单独重试
+            fetch_window = self._bind_context(lambda window: fetch(*window))
+            responses = list(self._get_stats_executor().map(fetch_window, windows))
+            return merge_stats_responses(responses)
+
+        return windowed_fetch
+
+    def _get_stats_executor(self) -> ThreadPoolExecutor:
+        with self._stats_executor_lock:
+            if self._stats_executor is None:
+                self._stats_executor = ThreadPoolExecutor(
+                    max_workers=self.stats_workers, thread_name_prefix="ozon-stats"
+                )
+            return self._stats_executor
+
+    def _get_page_executor(self) -> ThreadPoolExecutor:
+        with self._stats_executor_lock:
+            if self._page_executor is None:
+                self._page_executor = ThreadPoolExecutor(
+                    max_workers=self.stats_workers, thread_name_prefix="ozon-pages"
+                )
+            return self._page_executor
+
+    def iter_campaign_stats(
+        self,
+        campaign_id: int,
+        date_from: str,
+        date_to: str,
+        metrics: List[str],
+        batch_size: Optional[int] = None
+    ) -> Iterator[Union[Statistic, StatisticBatch]]:
+        """
+        流式获取广告活动统计数据
+
+        边下载边解析响应中的 stats 数组，逐行产出 Statistic；指定 batch_size 时
+        每 batch_size 行产出一个 StatisticBatch。内存占用与响应大小无关。
+        """
+        endpoint = f"/campaigns/{campaign_id}/stats"
+        return self._iter_stats(endpoint, date_from, date_to, metrics, batch_size, campaign_id=campaign_id)
+
+    def iter_ad_stats(
+        self,
+        campaign_id: int,
+        ad_group_id: int,
+        ad_id: int,
+        date_from: str,
+        date_to: str,
+        metrics: List[str],
+        batch_size: Optional[int] = None
+    ) -> Iterator[Union[Statistic, StatisticBatch]]:
+        """流式获取广告统计数据，参见 iter_campaign_stats"""
+        endpoint = f"/campaigns/{campaign_id}/ad_groups/{ad_group_id}/ads/{ad_id}/stats"
+        return self._iter_stats(
+            endpoint, date_from, date_to, metrics, batch_size,
+            campaign_id=campaign_id, ad_group_id=ad_group_id, ad_id=ad_id
+        )
+
+    def _iter_stats(
+        self,
+        endpoint: str,
+        date_from: str,
+        date_to: str,
+        metrics: List[str],
+        batch_size: Optional[int],
+        **ids: int
+    ) -> Iterator[Union[Statistic, StatisticBatch]]:
         body = {
             "date_from": date_from,
             "date_to": date_to,
             "metrics": metrics
         }
-        return self._make_request("POST", endpoint, body)
\ No newline at end of file
+        # 只有在读取正文之前的失败才会重试
+        with self._deadline_at(self._endpoint_deadline(endpoint)):
+            response = self._retrying(self._send)("POST", endpoint, body, None, True)
+        event = self._take_event()
+        chunks = response.iter_content(chunk_size=self.stream_chunk_size)
+        if event is not None:
+            chunks = self._counting_chunks(chunks, event)
+        with closing(response):
+            rows = iter_json_array(chunks, key="stats")
+            try:
+                if batch_size is None:
+                    for row in rows:
+                        yield Statistic.from_dict({**ids, **row})
+                    return
+
+                pending = []
+                for row in rows:
+                    pending.append(row)
+                    if len(pending) >= batch_size:
+                        yield StatisticBatch.from_rows(pending, **ids)
+                        pending = []
+                if pending:
+                    yield StatisticBatch.from_rows(pending, **ids)
+            except self.transport.network_errors as e:
+                raise NetworkError(f"API响应读取错误: {str(e)}", response=response)
+            except ValueError as e:
+                raise OzonAPIError(f"API响应解析错误: {str(e)}", response=response)
+            finally:
+                if event is not None:
+                    event.wire_bytes_received = self._wire_bytes_received(response, event.bytes_received)
+                    self._emit(event)
+
+    @staticmethod
+    def _counting_chunks(chunks: Iterator[bytes], event: RequestEvent) -> Iterator[bytes]:
+        """统计流式响应的字节数和读取耗时（不含调用方处理数据的时间）"""
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            event.download += time.perf_counter() - start
+            if chunk is None:
+                return
+            event.bytes_received += len(chunk)
+            yield chunk
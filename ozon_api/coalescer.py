@@ -0,0 +1,143 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+
+class _PendingBatch:
+    __slots__ = ("deadline", "items")
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+        # (campaign_id, ad_group_id, ad_id, future)
+        self.items: List[Tuple[int, int, int, Future]] = []
+
+
+class StatsCoalescer:
+    """
+    广告统计请求合并器
+
+    在短时间窗口内收集日期范围和指标相同的单个广告统计请求，合并成一次多广告
+    统计请求发送，再把结果按 ad_id 拆分回各自的 Future。多个线程同时调用
+    get_ad_stats 时（例如 crawl_account），每个广告不再各自占用一次网络往返。
+    """
+
+    endpoint = "/ads/stats"
+
+    def __init__(self, client, window: float = 0.02, max_batch: int = 100, workers: int = 4):
+        """
+        初始化合并器
+
+        Args:
+            client: OzonAPIClient 实例
+            window: 收集同类请求的时间窗口（秒）
+            max_batch: 单次合并请求包含的最大广告数，达到后立即发送
+            workers: 并行发送合并请求的线程数
+        """
+        self.client = client
+        self.window = window
+        self.max_batch = max_batch
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ozon-coalescer")
+        self._cond = threading.Condition()
+        self._pending: Dict[Tuple, _PendingBatch] = {}
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+
+    def submit(
+        self,
+        campaign_id: int,
+        ad_group_id: int,
+        ad_id: int,
+        date_from: str,
+        date_to: str,
+        metrics: List[str]
+    ) -> Future:
+        """
+        提交一个广告统计请求
+
+        Returns:
+            结果为该广告统计数据（与 get_ad_stats 的返回值格式相同）的 Future
+        """
+        future = Future()
+        key = (date_from, date_to, tuple(metrics))
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("StatsCoalescer 已关闭")
+            self._ensure_flusher()
+
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = _PendingBatch(time.monotonic() + self.window)
+                self._cond.notify()
+            batch.items.append((campaign_id, ad_group_id, ad_id, future))
+
+            if len(batch.items) >= self.max_batch:
+                del self._pending[key]
+                self._executor.submit(self._dispatch, key, batch.items)
+
+        return future
+
+    def flush(self):
+        """立即发送所有待合并的请求"""
+        with self._cond:
+            pending, self._pending = self._pending, {}
+        for key, batch in pending.items():
+            self._executor.submit(self._dispatch, key, batch.items)
+
+    def close(self):
+        """发送剩余请求并停止后台线程"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _ensure_flusher(self):
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._run, name="ozon-stats-coalescer", daemon=True)
+            self._flusher.start()
+
+    def _run(self):
+        """后台线程：时间窗口到期后发送对应的批次"""
+        with self._cond:
+            while not self._closed:
+                now = time.monotonic()
+                for key in [k for k, b in self._pending.items() if b.deadline <= now]:
+                    batch = self._pending.pop(key)
+                    self._executor.submit(self._dispatch, key, batch.items)
+
+                if self._pending:
+                    timeout = min(b.deadline for b in self._pending.values()) - now
+                    self._cond.wait(max(timeout, 0.0))
+                else:
+                    self._cond.wait()
+
+    def _dispatch(self, key: Tuple, items: List[Tuple[int, int, int, Future]]):
+        """发送一个合并请求，并把结果拆分给各个 Future"""
+        date_from, date_to, metrics = key
+        body = {
+            "date_from": date_from,
+            "date_to": date_to,
+            "metrics": list(metrics),
+            "ads": [
+                {"campaign_id": campaign_id, "ad_group_id": ad_group_id, "ad_id": ad_id}
+                for campaign_id, ad_group_id, ad_id, _ in items
+            ]
+        }
+
+        try:
+            response = self.client._make_request("POST", self.endpoint, body)
+        except Exception as e:
+            for *_, future in items:
+                future.set_exception(e)
+            return
+
+        rows_by_ad: Dict[int, List[Dict]] = {}
+        for row in response.get("stats", []):
+            rows_by_ad.setdefault(row.get("ad_id"), []).append(row)
+
+        for _, _, ad_id, future in items:
+            future.set_result({"stats": rows_by_ad.get(ad_id, [])})
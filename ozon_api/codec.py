@@ -0,0 +1,67 @@
+import json
+from typing import Any, Optional, Union
+
+
+class JSONCodec:
+    """JSON 编解码器接口：编码为紧凑的 UTF-8 字节串，解码接受字节串或字符串"""
+
+    name = ""
+
+    def dumps(self, obj: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        raise NotImplementedError
+
+
+class StdlibJSONCodec(JSONCodec):
+    """标准库 json 实现"""
+
+    name = "stdlib"
+
+    def __init__(self):
+        self._encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+        self._decoder = json.JSONDecoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode("utf-8")
+        return self._decoder.decode(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """orjson 实现，编解码速度比标准库快数倍"""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    """
+    获取 JSON 编解码器
+
+    Args:
+        name: "orjson" 或 "stdlib"；为 None 时安装了 orjson 就使用 orjson，否则使用标准库
+    """
+    if name == "stdlib":
+        return StdlibJSONCodec()
+    if name == "orjson":
+        return OrjsonCodec()
+    if name is not None:
+        raise ValueError(f"不支持的 JSON 编解码器: {name}")
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        return StdlibJSONCodec()
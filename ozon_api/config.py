@@ -1,6 +1,65 @@
 import os
+import copy
 import json  # 添加json模块导入
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+# 可以在 ini 文件 [ozon_api] 段中设置的数值和开关配置项及其类型
+_TYPED_OPTIONS = {
+    "timeout": float,
+    "connect_timeout": float,
+    "read_timeout": float,
+    "max_retries": int,
+    "backoff_factor": float,
+    "pool_connections": int,
+    "pool_maxsize": int,
+    "pool_block": bool,
+    "keepalive": bool,
+    "keepalive_expiry": float,
+    "http2": bool,
+    "accept_encoding": str,
+    "request_compression": str,
+    "request_compression_min_size": int,
+}
+
+# 已解析的配置文件：绝对路径 → (修改时间, 文件大小, 文件中的配置项)
+# 短时运行的脚本会多次创建 Config，文件未变化时不再重复读取和解析
+_file_cache: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+_file_cache_lock = threading.Lock()
+
+
+def _parse_file(config_file: str) -> Dict[str, Any]:
+    """读取配置文件，返回文件中出现的配置项"""
+    values: Dict[str, Any] = {}
+    ext = os.path.splitext(config_file)[1].lower()
+    if ext == '.json':
+        with open(config_file, 'r') as f:
+            values.update(json.load(f))
+    elif ext == '.yaml' or ext == '.yml':
+        try:
+            import yaml
+            with open(config_file, 'r') as f:
+                values.update(yaml.safe_load(f))
+        except ImportError:
+            pass
+    else:
+        # .ini、.conf、.cfg 以及没有扩展名的文件都按 INI 格式解析
+        import configparser
+        config = configparser.ConfigParser()
+        config.read(config_file)
+        if 'ozon_api' in config:
+            ozon_api_config = config['ozon_api']
+            for key in ("client_id", "api_key", "date_from", "date_to"):
+                if key in ozon_api_config:
+                    values[key] = ozon_api_config[key]
+            for key, cast in _TYPED_OPTIONS.items():
+                if key in ozon_api_config:
+                    if cast is bool:
+                        values[key] = ozon_api_config.getboolean(key)
+                    else:
+                        values[key] = cast(ozon_api_config[key])
+    return values
+
 
 class Config:
     """配置管理类"""
@@ -27,37 +86,40 @@ class Config:
             "timeout": 30,
             "max_retries": 3,
             "backoff_factor": 1.0,
+            # 传输层：timeout 同时作为 connect_timeout 和 read_timeout 的默认值
+            "pool_connections": 10,
+            "pool_maxsize": 10,
+            "pool_block": False,
+            "keepalive": True,
+            "keepalive_expiry": 30.0,
+            "http2": False,
+            # 压缩：accept_encoding 为 None 时使用 HTTP 库的默认值；request_compression 为空时不压缩请求体
+            "accept_encoding": None,
+            "request_compression": None,
+            "request_compression_min_size": 16384,
             "debug": False,
             "date_from": "2023-01-01",
             "date_to": "2023-12-31"
         }
     
     def _load_from_file(self, config_file: str):
-        """从配置文件加载配置"""
-        if not os.path.exists(config_file):
+        """从配置文件加载配置，文件未修改时使用上次解析的结果"""
+        try:
+            stat = os.stat(config_file)
+        except OSError:
             return
-        
-        ext = os.path.splitext(config_file)[1].lower()
-        if ext == '.json':
-            with open(config_file, 'r') as f:
-                self.config.update(json.load(f))
-        elif ext == '.yaml' or ext == '.yml':
-            try:
-                import yaml
-                with open(config_file, 'r') as f:
-                    self.config.update(yaml.safe_load(f))
-            except ImportError:
-                pass
-        elif ext == '.ini':
-            import configparser
-            config = configparser.ConfigParser()
-            config.read(config_file)
-            if 'ozon_api' in config:
-                ozon_api_config = config['ozon_api']
-                self.config["client_id"] = ozon_api_config.get("client_id", self.config.get("client_id", ""))
-                self.config["api_key"] = ozon_api_config.get("api_key", self.config.get("api_key", ""))
-                self.config["date_from"] = ozon_api_config.get("date_from", self.config.get("date_from", ""))
-                self.config["date_to"] = ozon_api_config.get("date_to", self.config.get("date_to", ""))
+
+        path = os.path.abspath(config_file)
+        with _file_cache_lock:
+            cached = _file_cache.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            values = cached[2]
+        else:
+            values = _parse_file(config_file)
+            with _file_cache_lock:
+                _file_cache[path] = (stat.st_mtime_ns, stat.st_size, values)
+        # 复制一份，修改某个 Config 实例不会影响缓存和其他实例
+        self.config.update(copy.deepcopy(values))
     
     def _load_from_env(self):
         """从环境变量加载配置"""
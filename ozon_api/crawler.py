@@ -0,0 +1,129 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# 爬取结果的记录类型
+CAMPAIGN = "campaign"
+AD_GROUP = "ad_group"
+AD = "ad"
+CAMPAIGN_STATS = "campaign_stats"
+AD_STATS = "ad_stats"
+
+# 任务返回 (产出的记录, 子任务)；子任务为 (层级, 可调用对象)
+_TaskResult = Tuple[List[Tuple[str, Dict]], List[Tuple[int, Callable]]]
+
+
+class _AccountWalker:
+    """把 广告活动 → 广告组 → 广告 → 统计 的遍历拆成可并行执行的小任务"""
+
+    def __init__(self, client, date_from: str, date_to: str, metrics: List[str]):
+        self.client = client
+        self.date_from = date_from
+        self.date_to = date_to
+        self.metrics = metrics
+
+    def campaigns(self) -> _TaskResult:
+        rows, children = [], []
+        for campaign in self.client.get_campaigns():
+            campaign_id = campaign["id"]
+            rows.append((CAMPAIGN, campaign))
+            children.append((1, lambda cid=campaign_id: self.campaign_stats(cid)))
+            children.append((1, lambda cid=campaign_id: self.ad_groups(cid)))
+        return rows, children
+
+    def campaign_stats(self, campaign_id: int) -> _TaskResult:
+        stats = self.client.get_campaign_stats(
+            campaign_id=campaign_id,
+            date_from=self.date_from,
+            date_to=self.date_to,
+            metrics=self.metrics
+        )
+        return [(CAMPAIGN_STATS, {"campaign_id": campaign_id, **stats})], []
+
+    def ad_groups(self, campaign_id: int) -> _TaskResult:
+        rows, children = [], []
+        for ad_group in self.client.get_ad_groups(campaign_id=campaign_id):
+            ad_group_id = ad_group["id"]
+            rows.append((AD_GROUP, {"campaign_id": campaign_id, **ad_group}))
+            children.append((2, lambda gid=ad_group_id: self.ads(campaign_id, gid)))
+        return rows, children
+
+    def ads(self, campaign_id: int, ad_group_id: int) -> _TaskResult:
+        rows, children = [], []
+        for ad in self.client.get_ads(campaign_id=campaign_id, ad_group_id=ad_group_id):
+            ad_id = ad["id"]
+            rows.append((AD, {"campaign_id": campaign_id, "ad_group_id": ad_group_id, **ad}))
+            children.append((3, lambda aid=ad_id: self.ad_stats(campaign_id, ad_group_id, aid)))
+        return rows, children
+
+    def ad_stats(self, campaign_id: int, ad_group_id: int, ad_id: int) -> _TaskResult:
+        stats = self.client.get_ad_stats(
+            campaign_id=campaign_id,
+            ad_group_id=ad_group_id,
+            ad_id=ad_id,
+            date_from=self.date_from,
+            date_to=self.date_to,
+            metrics=self.metrics
+        )
+        row = {"campaign_id": campaign_id, "ad_group_id": ad_group_id, "ad_id": ad_id, **stats}
+        return [(AD_STATS, row)], []
+
+
+def crawl_account(
+    client,
+    date_from: str,
+    date_to: str,
+    metrics: List[str],
+    workers: int = 8,
+    max_in_flight: Optional[int] = None
+) -> Iterator[Tuple[str, Dict]]:
+    """
+    并行遍历账户下的全部广告活动、广告组、广告及其统计数据
+
+    每一层返回后立即把下一层的请求分发到线程池中，结果按到达顺序逐条产出，
+    无需等待整棵树遍历完成。
+
+    Args:
+        client: OzonAPIClient 实例（需可在多个线程间共享）
+        date_from: 统计开始日期
+        date_to: 统计结束日期
+        metrics: 统计指标列表
+        workers: 线程池大小
+        max_in_flight: 同时提交的最大请求数，默认为 workers 的两倍
+
+    Yields:
+        (记录类型, 记录) 元组，记录类型为 CAMPAIGN、AD_GROUP、AD、
+        CAMPAIGN_STATS 或 AD_STATS 之一，记录中带有上级实体的ID
+    """
+    if max_in_flight is None:
+        max_in_flight = workers * 2
+
+    walker = _AccountWalker(client, date_from, date_to, metrics)
+    # 每层一个待执行队列，优先调度更深的层级，使待执行任务数量保持在较低水平
+    pending = [deque() for _ in range(4)]
+    pending[0].append(walker.campaigns)
+    in_flight = set()
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            while len(in_flight) < max_in_flight:
+                queue = next((q for q in reversed(pending) if q), None)
+                if queue is None:
+                    break
+                in_flight.add(executor.submit(queue.popleft()))
+
+            if not in_flight:
+                break
+
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                rows, children = future.result()
+                for level, task in children:
+                    pending[level].append(task)
+                for row in rows:
+                    yield row
+    finally:
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -1,11 +1,18 @@
 class OzonAPIError(Exception):
     """Ozon API错误基类"""
     
-    def __init__(self, message: str, response=None):
+    def __init__(self, message: str, response=None, retry_after=None):
         super().__init__(message)
         self.message = message
         self.response = response
-        self.status_code = response.status_code if response else None
+        # 服务端通过 Retry-After 要求的等待秒数
+        self.retry_after = retry_after
+        # requests 的响应对象使用 status_code，aiohttp 使用 status；
+        # 注意 requests.Response 在 4xx/5xx 时布尔值为 False，不能直接用 if response 判断
+        if response is not None:
+            self.status_code = getattr(response, 'status_code', getattr(response, 'status', None))
+        else:
+            self.status_code = None
     
     def __str__(self):
         if self.status_code:
@@ -31,3 +38,56 @@ class InvalidRequestError(OzonAPIError):
 class ServerError(OzonAPIError):
     """服务器错误"""
     pass
+
+
+class NetworkError(ServerError):
+    """网络错误（连接失败、超时等），与服务器错误一样可以重试"""
+    pass
+
+
+class ConnectError(NetworkError):
+    """建立连接阶段的网络错误：请求尚未发出，写请求也可以安全地重新发送"""
+    pass
+
+
+class CircuitOpenError(OzonAPIError):
+    """熔断器处于打开状态，请求未发出即失败"""
+    pass
+
+
+class QueueFullError(OzonAPIError):
+    """请求调度器的队列已满，请求未发出即失败"""
+    pass
+
+
+class DeadlineExceededError(OzonAPIError):
+    """调用超过了截止时间（包括所有重试和等待），不会再重试"""
+    pass
+
+
+def error_from_response(response, text: str = "") -> OzonAPIError:
+    """
+    根据响应状态码构造对应的异常
+
+    401/403 → AuthenticationError，429 → RateLimitError，5xx → ServerError，
+    其他 4xx → InvalidRequestError。响应中的 Retry-After 会记录在异常的 retry_after 属性上。
+
+    Args:
+        response: requests 或 aiohttp 的响应对象
+        text: 响应正文，用于错误信息
+    """
+    from .utils import parse_retry_after
+
+    status = getattr(response, 'status_code', getattr(response, 'status', None))
+    if status in (401, 403):
+        error_class = AuthenticationError
+    elif status == 429:
+        error_class = RateLimitError
+    elif status is not None and status >= 500:
+        error_class = ServerError
+    else:
+        error_class = InvalidRequestError
+
+    message = f"API请求错误: {status} {text[:500]}".rstrip()
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    return error_class(message, response=response, retry_after=retry_after)
@@ -0,0 +1,332 @@
+import csv
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .crawler import CAMPAIGN_STATS, AD_STATS
+from .models import ID_FIELDS, METRIC_TYPECODES
+
+
+def _scalar(value: Any) -> Any:
+    """嵌套的字典和列表编码为 JSON 字符串，保证每一列都是标量"""
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return value
+
+
+class BaseWriter:
+    """逐行写出的导出器基类，内存占用与数据总量无关"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, row: Dict):
+        """写出一行"""
+        raise NotImplementedError
+
+    def write_rows(self, rows: Iterable[Dict]) -> int:
+        """写出生成器中的所有行，返回写出的行数"""
+        for row in rows:
+            self.write(row)
+        return self.rows_written
+
+    def close(self):
+        """刷新缓冲并关闭文件"""
+        raise NotImplementedError
+
+
+class CSVWriter(BaseWriter):
+    """
+    CSV 导出
+
+    未指定 fieldnames 时以第一行的字段作为表头，之后出现新字段时扩展表头并重写已写出的
+    部分（旧行的新列留空）；指定了 fieldnames 时，行中多出的字段抛出 ValueError。
+    append 为 True 时追加到已有文件的末尾，沿用文件中的表头。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fieldnames: Optional[List[str]] = None,
+        encoding: str = "utf-8",
+        append: bool = False
+    ):
+        super().__init__(path)
+        self.encoding = encoding
+        self._fixed = fieldnames is not None
+        header = self._read_header() if append else None
+        if header is not None:
+            if self._fixed and list(fieldnames) != header:
+                raise ValueError(f"{path} 的表头 {header} 与 fieldnames 不一致")
+            fieldnames = header
+        self.fieldnames = list(fieldnames) if fieldnames is not None else None
+        self._file = open(path, "a" if append else "w", newline="", encoding=encoding)
+        self._writer = None
+        if header is not None:
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+
+    def _read_header(self) -> Optional[List[str]]:
+        """已有文件的表头；文件不存在或为空时返回 None"""
+        try:
+            with open(self.path, newline="", encoding=self.encoding) as f:
+                return next(csv.reader(f), None)
+        except FileNotFoundError:
+            return None
+
+    def write(self, row: Dict):
+        if self._writer is None:
+            if self.fieldnames is None:
+                self.fieldnames = list(row)
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+            self._writer.writeheader()
+        extra = [key for key in row if key not in self._writer.fieldnames]
+        if extra:
+            if self._fixed:
+                raise ValueError(f"字段 {extra} 不在表头 {self.fieldnames} 中")
+            self._widen(extra)
+        self._writer.writerow({key: _scalar(value) for key, value in row.items()})
+        self.rows_written += 1
+
+    def _widen(self, extra: List[str]):
+        """在表头末尾加入新字段，并把已写出的内容按新表头重写一遍"""
+        self._file.close()
+        self.fieldnames = self.fieldnames + extra
+        tmp_path = self.path + ".tmp"
+        with open(self.path, newline="", encoding=self.encoding) as src, \
+                open(tmp_path, "w", newline="", encoding=self.encoding) as dst:
+            reader = csv.reader(src)
+            next(reader, None)
+            writer = csv.writer(dst)
+            writer.writerow(self.fieldnames)
+            for line in reader:
+                writer.writerow(line + [""] * (len(self.fieldnames) - len(line)))
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "a", newline="", encoding=self.encoding)
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+
+    def close(self):
+        self._file.close()
+
+
+class JSONLWriter(BaseWriter):
+    """JSON Lines 导出，每行一个 JSON 对象；append 为 True 时追加到已有文件的末尾"""
+
+    def __init__(self, path: str, encoding: str = "utf-8", append: bool = False):
+        super().__init__(path)
+        self._file = open(path, "a" if append else "w", encoding=encoding)
+
+    def write(self, row: Dict):
+        self._file.write(json.dumps(row, ensure_ascii=False, default=str))
+        self._file.write("\n")
+        self.rows_written += 1
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter(BaseWriter):
+    """
+    Parquet 导出（需要 pyarrow）
+
+    每积累 row_group_size 行写出一个 row group，内存中最多保留一个 row group 的数据。
+    实体ID和已知指标使用声明的类型（计数类 int64，金额类 float64），其他字段按数据推断。
+    之后的 row group 推断出的表结构与已写出的不同时：空值列取得具体类型、整数列遇到
+    小数变为 float64、出现新字段时加入新列，已写出的 row group 按新结构重写一遍；
+    类型无法合并（例如整数列遇到字符串）时抛出 ValueError。数据不会被静默截断或丢弃。
+    """
+
+    def __init__(self, path: str, row_group_size: int = 50000):
+        # pyarrow 导入较慢，只在真正需要时导入
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("ParquetWriter 需要 pyarrow，请执行 pip install ozon_api_client[parquet]")
+        self._pyarrow = pyarrow
+        super().__init__(path)
+        self.row_group_size = row_group_size
+        self._buffer: List[Dict] = []
+        self._schema = None
+        self._writer = None
+        # 正在写入的文件：重写时在 path 和临时文件之间交替，关闭时再换回 path
+        self._current = path
+        numeric = {"q": pyarrow.int64(), "d": pyarrow.float64()}
+        self._declared = {name: pyarrow.int64() for name in ID_FIELDS}
+        self._declared.update({name: numeric[code] for name, code in METRIC_TYPECODES.items()})
+
+    def write(self, row: Dict):
+        self._buffer.append({key: _scalar(value) for key, value in row.items()})
+        self.rows_written += 1
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def _table(self, rows: List[Dict]):
+        """推断缓冲区的表结构，已知字段转换为声明的类型（有损的转换会抛出异常）"""
+        # from_pylist 只按第一行确定列，这里取所有行的字段
+        names = list(dict.fromkeys(name for row in rows for name in row))
+        table = self._pyarrow.Table.from_pydict({name: [row.get(name) for row in rows] for name in names})
+        for i, field in enumerate(table.schema):
+            declared = self._declared.get(field.name)
+            if declared is not None and field.type != declared:
+                table = table.set_column(i, field.name, table.column(i).cast(declared))
+        return table
+
+    def _merge(self, schema):
+        """合并已写出的表结构和新 row group 的表结构"""
+        pa = self._pyarrow
+        fields = {field.name: field.type for field in self._schema}
+        for field in schema:
+            current = fields.get(field.name)
+            if current is None or pa.types.is_null(current):
+                fields[field.name] = field.type
+            elif current == field.type or pa.types.is_null(field.type):
+                continue
+            elif all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in (current, field.type)):
+                fields[field.name] = pa.float64()
+            else:
+                raise ValueError(f"字段 {field.name} 的类型 {field.type} 与已写出的 {current} 不兼容")
+        return pa.schema(list(fields.items()))
+
+    def _conform(self, table, schema):
+        """按 schema 排列并转换各列，缺失的列填充空值"""
+        columns = [
+            table.column(field.name).cast(field.type) if field.name in table.column_names
+            else self._pyarrow.nulls(table.num_rows, field.type)
+            for field in schema
+        ]
+        return self._pyarrow.Table.from_arrays(columns, schema=schema)
+
+    def _rewrite(self, schema):
+        """把已写出的 row group 按新的表结构复制到另一个文件"""
+        self._writer.close()
+        source = self._current
+        self._current = self.path + ".tmp" if source == self.path else self.path
+        self._writer = self._pyarrow.parquet.ParquetWriter(self._current, schema)
+        with open(source, "rb") as f:
+            parquet_file = self._pyarrow.parquet.ParquetFile(f)
+            for i in range(parquet_file.num_row_groups):
+                self._writer.write_table(self._conform(parquet_file.read_row_group(i), schema))
+        os.remove(source)
+        self._schema = schema
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        table = self._table(self._buffer)
+        if self._schema is None:
+            self._schema = table.schema
+            self._writer = self._pyarrow.parquet.ParquetWriter(self._current, self._schema)
+        else:
+            schema = self._merge(table.schema)
+            if not schema.equals(self._schema):
+                self._rewrite(schema)
+            table = self._conform(table, self._schema)
+        self._writer.write_table(table)
+        self._buffer = []
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            if self._current != self.path:
+                os.replace(self._current, self.path)
+                self._current = self.path
+
+
+WRITERS = {
+    "csv": CSVWriter,
+    "jsonl": JSONLWriter,
+    "parquet": ParquetWriter,
+}
+
+
+def explode_stats(kind: str, row: Dict) -> Iterator[Dict]:
+    """
+    把统计记录中的逐日 stats 列表展开为多行，每行带上实体ID
+
+    非统计记录原样返回。
+    """
+    stats = row.get("stats") if kind in (CAMPAIGN_STATS, AD_STATS) else None
+    if not isinstance(stats, list):
+        yield row
+        return
+
+    ids = {key: value for key, value in row.items() if key != "stats"}
+    for stat in stats:
+        yield {**ids, **stat}
+
+
+class CrawlExporter:
+    """
+    按记录类型把爬取结果分别写入 directory 下的 <类型>.<格式> 文件
+
+    实例可以直接作为 SyncEngine.run 的 sink 使用，也可以通过 write_all 消费
+    crawl_account 的生成器。SyncEngine 重新运行时只处理上次未完成的单元，此时应使用
+    append=True，保留上次写出的内容：csv 和 jsonl 追加到原文件末尾；parquet 文件无法
+    追加，本次的数据写入新的分片 <类型>.<序号>.parquet。
+    """
+
+    def __init__(self, directory: str, format: str = "csv", append: bool = False, **writer_options):
+        """
+        Args:
+            directory: 输出目录
+            format: csv、jsonl 或 parquet
+            append: 保留目录中已有的导出文件，在其后继续写出
+            writer_options: 传给对应导出器的参数
+        """
+        if format not in WRITERS:
+            raise ValueError(f"不支持的导出格式: {format}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.format = format
+        self.append = append
+        self.writer_options = writer_options
+        self.writers: Dict[str, BaseWriter] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __call__(self, kind: str, row: Dict):
+        writer = self.writers.get(kind)
+        if writer is None:
+            writer = self.writers[kind] = self._open(kind)
+        for flat_row in explode_stats(kind, row):
+            writer.write(flat_row)
+
+    def _open(self, kind: str) -> BaseWriter:
+        path = os.path.join(self.directory, f"{kind}.{self.format}")
+        if not self.append:
+            return WRITERS[self.format](path, **self.writer_options)
+        if self.format != "parquet":
+            return WRITERS[self.format](path, append=True, **self.writer_options)
+        part = 1
+        while os.path.exists(path):
+            path = os.path.join(self.directory, f"{kind}.{part}.{self.format}")
+            part += 1
+        return WRITERS[self.format](path, **self.writer_options)
+
+    def write_all(self, rows: Iterable[Tuple[str, Dict]]) -> Dict[str, int]:
+        """
+        消费 (记录类型, 记录) 生成器并逐行写出
+
+        Returns:
+            每种记录类型写出的行数
+        """
+        for kind, row in rows:
+            self(kind, row)
+        return {kind: writer.rows_written for kind, writer in self.writers.items()}
+
+    def close(self):
+        """关闭所有导出文件"""
+        for writer in self.writers.values():
+            writer.close()
@@ -0,0 +1,118 @@
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class _LatencyWindow:
+    """某个接口最近若干次请求的耗时，分位数每积累一定数量的新样本才重新计算"""
+
+    __slots__ = ("samples", "quantile", "stale")
+
+    def __init__(self, size: int):
+        self.samples: Deque[float] = deque(maxlen=size)
+        self.quantile: Optional[float] = None
+        self.stale = 0
+
+
+class HedgePolicy:
+    """
+    对冲请求策略
+
+    只读请求（GET 和统计查询）在该接口近期耗时的 p{percentile} 之后仍未返回时，在另一个
+    连接上再发送一份相同的请求，使用先成功返回的结果。对冲请求同样经过限流器，数量由
+    令牌桶限制：每个请求积累 max_ratio 个令牌，每次对冲消耗一个，因此对冲请求不超过
+    请求总数的 max_ratio。
+
+    用法:
+        client = OzonAPIClient('config.ini', hedging=HedgePolicy(percentile=95, max_ratio=0.05))
+    """
+
+    # 每积累多少个新样本重新计算一次分位数
+    RECOMPUTE_EVERY = 16
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_ratio: float = 0.05,
+        min_samples: int = 20,
+        window: int = 256,
+        min_delay: float = 0.005,
+        burst: float = 5.0,
+        workers: int = 32,
+        primary_workers: int = 64
+    ):
+        """
+        Args:
+            percentile: 等待多久之后发送对冲请求，取该接口近期耗时的这个分位数
+            max_ratio: 对冲请求占请求总数的上限
+            min_samples: 接口的耗时样本少于该数量时不对冲
+            window: 每个接口保留的耗时样本数
+            min_delay: 对冲前的最短等待时间（秒）
+            burst: 令牌桶容量，即短时间内最多连续发出的对冲请求数
+            workers: 执行对冲请求的线程数
+            primary_workers: 执行原请求的线程数；线程都在忙时新的请求直接在调用线程中发送，不对冲
+        """
+        if not 0 < percentile < 100:
+            raise ValueError("percentile 必须在 0 到 100 之间")
+        if max_ratio < 0:
+            raise ValueError("max_ratio 不能为负数")
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self.window = window
+        self.min_delay = min_delay
+        self.burst = burst
+        self.workers = workers
+        self.primary_workers = primary_workers
+        self._lock = threading.Lock()
+        self._windows: Dict[str, _LatencyWindow] = {}
+        self._tokens = 0.0
+        # 统计：登记的请求数、发出的对冲请求数、对冲请求先返回的次数
+        self.requests = 0
+        self.hedged = 0
+        self.wins = 0
+
+    def start(self, template: str) -> Optional[float]:
+        """
+        登记一次请求并返回发送对冲请求前的等待时间（秒）
+
+        Returns:
+            等待时间；样本不足时为 None，表示不对冲
+        """
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.burst, self._tokens + self.max_ratio)
+            window = self._windows.get(template)
+            if window is None or len(window.samples) < self.min_samples:
+                return None
+            if window.quantile is None or window.stale >= self.RECOMPUTE_EVERY:
+                ordered = sorted(window.samples)
+                window.quantile = ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))]
+                window.stale = 0
+            return max(window.quantile, self.min_delay)
+
+    def record(self, template: str, seconds: float):
+        """记录一次成功请求的耗时"""
+        with self._lock:
+            window = self._windows.get(template)
+            if window is None:
+                window = self._windows[template] = _LatencyWindow(self.window)
+            window.samples.append(seconds)
+            window.stale += 1
+
+    def try_acquire(self) -> bool:
+        """对冲预算足够时消耗一个令牌并返回 True"""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.hedged += 1
+            return True
+
+    def record_win(self):
+        """对冲请求先于原请求返回"""
+        with self._lock:
+            self.wins += 1
+
+    def __repr__(self):
+        return f"HedgePolicy(p{self.percentile:g}, max_ratio={self.max_ratio}, hedged={self.hedged}/{self.requests})"
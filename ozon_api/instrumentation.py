@@ -0,0 +1,264 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# 每个请求记录的耗时阶段
+PHASES = ("sign", "connect", "ttfb", "download", "decode", "retry_wait")
+
+
+class RequestEvent:
+    """
+    一次 HTTP 请求（一次尝试）的度量数据
+
+    耗时单位均为秒：
+        sign: 编码请求体和生成签名
+        connect: 建立 TCP/TLS 连接，复用连接时为 0
+        ttfb: 发出请求到收到响应头（不含 connect）
+        download: 读取响应正文
+        decode: 解析 JSON
+        retry_wait: 本次尝试之前的重试等待
+
+    bytes_sent/bytes_received 为未压缩的正文字节数，wire_bytes_sent/wire_bytes_received 为
+    实际在网络上传输的（可能经过压缩的）正文字节数。
+    """
+
+    __slots__ = (
+        "method", "endpoint", "status", "error", "attempt", "bytes_sent", "bytes_received",
+        "wire_bytes_sent", "wire_bytes_received",
+        "sign", "connect", "ttfb", "download", "decode", "retry_wait"
+    )
+
+    def __init__(self, method: str, endpoint: str, attempt: int = 0, retry_wait: float = 0.0):
+        self.method = method
+        # 归一化后的接口模板，例如 /campaigns/{id}/stats
+        self.endpoint = endpoint
+        self.status: Optional[int] = None
+        # 未收到响应时的异常类名
+        self.error: Optional[str] = None
+        self.attempt = attempt
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.wire_bytes_sent = 0
+        self.wire_bytes_received = 0
+        self.sign = 0.0
+        self.connect = 0.0
+        self.ttfb = 0.0
+        self.download = 0.0
+        self.decode = 0.0
+        self.retry_wait = retry_wait
+
+    @property
+    def total(self) -> float:
+        """除重试等待以外的总耗时"""
+        return self.sign + self.connect + self.ttfb + self.download + self.decode
+
+    def __repr__(self):
+        return (f"RequestEvent({self.method} {self.endpoint} status={self.status} attempt={self.attempt} "
+                f"total={self.total:.4f}s)")
+
+
+# 当前线程中建立连接所花的时间，由 InstrumentedAdapter 的连接类累加
+_connect_timing = threading.local()
+
+
+def take_connect_time() -> float:
+    """返回并清零当前线程累计的建立连接耗时"""
+    elapsed = getattr(_connect_timing, "elapsed", 0.0)
+    _connect_timing.elapsed = 0.0
+    return elapsed
+
+
+class _TimedConnectMixin:
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_timing.elapsed = getattr(_connect_timing, "elapsed", 0.0) + time.perf_counter() - start
+
+
+class _TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """记录建立连接耗时的 HTTPAdapter"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """固定分桶的直方图，bucket 计数不累积，导出时再累加"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(**labels: str) -> str:
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsCollector:
+    """
+    进程内的请求指标收集器
+
+    实例本身就是一个钩子，通过 client.add_hook(collector) 注册。每个事件只做几次
+    二分查找和加法，可以在生产环境中常开。to_prometheus 输出 Prometheus 文本格式。
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = "ozon_api"):
+        """
+        Args:
+            buckets: 耗时直方图的分桶上界（秒）
+            namespace: 指标名前缀
+        """
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        # (method, endpoint, phase) -> Histogram
+        self._durations: Dict[Tuple[str, str, str], Histogram] = {}
+        # (method, endpoint, status) -> 请求数
+        self._requests: Dict[Tuple[str, str, str], int] = {}
+        # (method, endpoint) -> 重试次数
+        self._retries: Dict[Tuple[str, str], int] = {}
+        # (method, endpoint, direction) -> 未压缩的字节数
+        self._bytes: Dict[Tuple[str, str, str], int] = {}
+        # (method, endpoint, direction) -> 网络上传输的字节数
+        self._wire_bytes: Dict[Tuple[str, str, str], int] = {}
+
+    def __call__(self, event: RequestEvent):
+        key = (event.method, event.endpoint)
+        status = str(event.status) if event.status is not None else (event.error or "error")
+        with self._lock:
+            for phase in PHASES:
+                histogram = self._durations.get(key + (phase,))
+                if histogram is None:
+                    histogram = self._durations[key + (phase,)] = Histogram(self.buckets)
+                histogram.observe(getattr(event, phase))
+            request_key = key + (status,)
+            self._requests[request_key] = self._requests.get(request_key, 0) + 1
+            if event.attempt:
+                self._retries[key] = self._retries.get(key, 0) + 1
+            for direction, size, wire_size in (
+                ("sent", event.bytes_sent, event.wire_bytes_sent),
+                ("received", event.bytes_received, event.wire_bytes_received)
+            ):
+                self._bytes[key + (direction,)] = self._bytes.get(key + (direction,), 0) + size
+                self._wire_bytes[key + (direction,)] = self._wire_bytes.get(key + (direction,), 0) + wire_size
+
+    def request_count(self, method: Optional[str] = None, endpoint: Optional[str] = None) -> int:
+        """已记录的请求数，可按方法和接口模板过滤"""
+        with self._lock:
+            return sum(
+                count for (m, e, _), count in self._requests.items()
+                if (method is None or m == method) and (endpoint is None or e == endpoint)
+            )
+
+    def phase_seconds(self, phase: str) -> float:
+        """所有请求在某个阶段的累计耗时"""
+        with self._lock:
+            return sum(h.sum for (_, _, p), h in self._durations.items() if p == phase)
+
+    def bytes_total(self, direction: str, wire: bool = False) -> int:
+        """
+        所有请求的正文字节数
+
+        Args:
+            direction: sent 或 received
+            wire: 为 True 时返回网络上传输的（压缩后的）字节数，否则返回未压缩的字节数
+        """
+        counters = self._wire_bytes if wire else self._bytes
+        with self._lock:
+            return sum(size for (_, _, d), size in counters.items() if d == direction)
+
+    def reset(self):
+        """清空已收集的指标"""
+        with self._lock:
+            self._durations.clear()
+            self._requests.clear()
+            self._retries.clear()
+            self._bytes.clear()
+            self._wire_bytes.clear()
+
+    def to_prometheus(self) -> str:
+        """以 Prometheus 文本格式导出全部指标"""
+        ns = self.namespace
+        lines: List[str] = []
+        with self._lock:
+            lines.append(f"# HELP {ns}_requests_total 按状态统计的HTTP请求数")
+            lines.append(f"# TYPE {ns}_requests_total counter")
+            for (method, endpoint, status), count in sorted(self._requests.items()):
+                lines.append(f"{ns}_requests_total{_labels(method=method, endpoint=endpoint, status=status)} {count}")
+
+            lines.append(f"# HELP {ns}_retries_total 重试发出的HTTP请求数")
+            lines.append(f"# TYPE {ns}_retries_total counter")
+            for (method, endpoint), count in sorted(self._retries.items()):
+                lines.append(f"{ns}_retries_total{_labels(method=method, endpoint=endpoint)} {count}")
+
+            for name, help_text, counters in (
+                (f"{ns}_bytes_total", "请求和响应正文的字节数（未压缩）", self._bytes),
+                (f"{ns}_wire_bytes_total", "请求和响应正文在网络上传输的字节数（压缩后）", self._wire_bytes),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for (method, endpoint, direction), size in sorted(counters.items()):
+                    labels = _labels(method=method, endpoint=endpoint, direction=direction)
+                    lines.append(f"{name}{labels} {size}")
+
+            name = f"{ns}_request_phase_seconds"
+            lines.append(f"# HELP {name} 请求各阶段耗时")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, endpoint, phase), histogram in sorted(self._durations.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else _number(bound)
+                    labels = _labels(method=method, endpoint=endpoint, phase=phase, le=le)
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                labels = _labels(method=method, endpoint=endpoint, phase=phase)
+                lines.append(f"{name}_sum{labels} {_number(histogram.sum)}")
+                lines.append(f"{name}_count{labels} {histogram.count}")
+        return "\n".join(lines) + "\n"
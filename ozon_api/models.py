@@ -1,8 +1,12 @@
-from typing import Dict, List, Optional, Any, Union
-from datetime import datetime
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Union
+from datetime import date, datetime
 
 class BaseModel:
     """基础模型类"""
+
+    # 子类可以声明 __slots__，基类本身不引入 __dict__
+    __slots__ = ()
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'BaseModel':
@@ -10,8 +14,8 @@ class BaseModel:
         return cls(**data)
     
     def to_dict(self) -> Dict:
-        """转换为字典"""
-        return self.__dict__
+        """转换为字典（返回副本，修改它不会影响模型实例）"""
+        return dict(self.__dict__)
 
 
 class Campaign(BaseModel):
@@ -97,7 +101,15 @@ class Ad(BaseModel):
 
 
 class Statistic(BaseModel):
-    """统计数据模型"""
+    """
+    统计数据模型
+
+    固定字段存放在 __slots__ 中，只有出现额外指标时才会创建 __dict__，
+    大量逐日统计行因此占用更少的内存。
+    """
+
+    FIELDS = ("date", "clicks", "impressions", "spent", "orders", "revenue")
+    __slots__ = FIELDS + ("__dict__",)
     
     def __init__(
         self,
@@ -119,3 +131,257 @@ class Statistic(BaseModel):
         # 添加其他字段
         for key, value in kwargs.items():
             setattr(self, key, value)
+
+    def to_dict(self) -> Dict:
+        """转换为字典"""
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        data.update(self.__dict__)
+        return data
+
+
+# 1970-01-01 的序数，日期以距该日的天数（int32）存储，与 Arrow 的 date32 一致
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# 实体ID列
+ID_FIELDS = ("campaign_id", "ad_group_id", "ad_id")
+
+# 已知指标的数组类型：计数类为 int64，金额类为 float64；未知指标按 float64 处理
+METRIC_TYPECODES = {
+    "clicks": "q",
+    "impressions": "q",
+    "orders": "q",
+    "spent": "d",
+    "revenue": "d",
+}
+
+# int64 指标列中表示缺失值的标记（float64 列用 NaN）；转换为 pandas、Arrow 时变为空值
+MISSING_INT = -(2 ** 63)
+
+
+def _is_numeric(value: Any) -> bool:
+    """值能否作为指标存储：数字或数字字符串（布尔值不算）"""
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return True
+    if isinstance(value, str):
+        try:
+            float(value)
+        except ValueError:
+            return False
+        return True
+    return False
+
+
+def date_to_day_number(value: Union[str, date]) -> int:
+    """把日期转换为距 1970-01-01 的天数"""
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return value.toordinal() - _EPOCH_ORDINAL
+
+
+def _missing_to_none(column: array, index: int) -> Any:
+    value = column[index]
+    return None if column.typecode == 'q' and value == MISSING_INT else value
+
+
+def day_number_to_date(day: int) -> date:
+    """把距 1970-01-01 的天数转换为日期"""
+    return date.fromordinal(day + _EPOCH_ORDINAL)
+
+
+class StatisticBatch:
+    """
+    列式存储的一批统计数据
+
+    每个指标一个类型化数组（array.array），日期存为 int32 天数，实体ID存为 int64。
+    相比逐行的 Statistic 对象，内存占用只有几分之一，并且可以零拷贝地转换为
+    NumPy 数组、pandas DataFrame 或 Arrow 表。
+    """
+
+    __slots__ = ("dates", "columns", "ids")
+
+    def __init__(
+        self,
+        dates: Optional[array] = None,
+        columns: Optional[Dict[str, array]] = None,
+        ids: Optional[Dict[str, array]] = None
+    ):
+        """
+        Args:
+            dates: 日期列（typecode 'i'，距 1970-01-01 的天数）
+            columns: 指标名 → 数组
+            ids: 实体ID名 → 数组（typecode 'q'）
+        """
+        self.dates = dates if dates is not None else array('i')
+        self.columns = columns if columns is not None else {}
+        self.ids = ids if ids is not None else {}
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Dict],
+        metrics: Optional[List[str]] = None,
+        **ids: int
+    ) -> 'StatisticBatch':
+        """
+        从逐日统计行（字典）创建
+
+        缺失的指标在 float64 列中记为 NaN，在 int64 列中记为 MISSING_INT。
+
+        Args:
+            rows: 统计行，每行包含 date 和各指标
+            metrics: 需要保留的指标，默认取第一行中的已知指标和值为数字的其他字段
+                （例如货币代码等文本字段会被跳过）
+            ids: 整批数据共享的实体ID，例如 campaign_id=1；未指定时从行中读取
+
+        Raises:
+            ValueError: 保留的指标中出现了不是数字的值
+        """
+        batch = cls()
+        row_ids: List[str] = []
+        for row in rows:
+            if metrics is None:
+                metrics = [
+                    key for key, value in row.items()
+                    if key != "date" and key not in ID_FIELDS and (key in METRIC_TYPECODES or _is_numeric(value))
+                ]
+            if not batch.columns:
+                batch.columns = {m: array(METRIC_TYPECODES.get(m, 'd')) for m in metrics}
+                row_ids = [key for key in ID_FIELDS if key not in ids and key in row]
+                batch.ids = {key: array('q') for key in row_ids}
+
+            batch.dates.append(date_to_day_number(row["date"]))
+            for metric, column in batch.columns.items():
+                value = row.get(metric)
+                if value is None:
+                    column.append(MISSING_INT if column.typecode == 'q' else float("nan"))
+                    continue
+                try:
+                    column.append(int(value) if column.typecode == 'q' else float(value))
+                except (TypeError, ValueError):
+                    raise ValueError(f"指标 {metric} 的值不是数字: {value!r}") from None
+            for key in row_ids:
+                batch.ids[key].append(row[key])
+
+        if not batch.columns:
+            batch.columns = {m: array(METRIC_TYPECODES.get(m, 'd')) for m in (metrics or [])}
+        for key, value in ids.items():
+            batch.ids[key] = array('q', [value]) * len(batch.dates)
+        return batch
+
+    @classmethod
+    def from_response(cls, response: Dict, metrics: Optional[List[str]] = None, **ids: int) -> 'StatisticBatch':
+        """从统计接口的响应（{"stats": [...]}）创建"""
+        return cls.from_rows(response.get("stats", []), metrics, **ids)
+
+    @classmethod
+    def from_statistics(cls, statistics: Iterable[Statistic], metrics: Optional[List[str]] = None) -> 'StatisticBatch':
+        """从 Statistic 对象创建"""
+        return cls.from_rows((s.to_dict() for s in statistics), metrics)
+
+    @classmethod
+    def concat(cls, batches: Iterable['StatisticBatch']) -> 'StatisticBatch':
+        """按顺序拼接多个结构相同的批次"""
+        result = None
+        for batch in batches:
+            if result is None:
+                result = cls(
+                    array('i', batch.dates),
+                    {name: array(col.typecode, col) for name, col in batch.columns.items()},
+                    {name: array('q', col) for name, col in batch.ids.items()}
+                )
+                continue
+            result.dates.extend(batch.dates)
+            for name, column in result.columns.items():
+                column.extend(batch.columns[name])
+            for name, column in result.ids.items():
+                column.extend(batch.ids[name])
+        return result if result is not None else cls()
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __iter__(self) -> Iterator[Statistic]:
+        """逐行转换为 Statistic 对象"""
+        names = list(self.columns)
+        id_names = list(self.ids)
+        for i, day in enumerate(self.dates):
+            values = {name: _missing_to_none(self.columns[name], i) for name in names}
+            values.update((name, self.ids[name][i]) for name in id_names)
+            yield Statistic(date=day_number_to_date(day).isoformat(), **values)
+
+    def column(self, name: str) -> array:
+        """按名称返回指标列或实体ID列"""
+        if name == "date":
+            return self.dates
+        if name in self.columns:
+            return self.columns[name]
+        return self.ids[name]
+
+    def to_dict(self) -> Dict[str, List]:
+        """转换为 列名 → 列表 的字典（日期为 ISO 字符串）"""
+        data = {"date": [day_number_to_date(day).isoformat() for day in self.dates]}
+        data.update((name, column.tolist()) for name, column in self.ids.items())
+        for name, column in self.columns.items():
+            values = column.tolist()
+            if column.typecode == 'q':
+                values = [None if value == MISSING_INT else value for value in values]
+            data[name] = values
+        return data
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        转换为 列名 → numpy 数组 的字典
+
+        数组直接引用底层缓冲区（零拷贝），日期列为 int32 天数；int64 指标列中的缺失值
+        保留为 MISSING_INT。
+        """
+        import numpy as np
+
+        data = {"date": np.frombuffer(self.dates, dtype=np.int32) if len(self.dates) else np.empty(0, np.int32)}
+        for name, column in list(self.ids.items()) + list(self.columns.items()):
+            dtype = np.int64 if column.typecode == 'q' else np.float64
+            data[name] = np.frombuffer(column, dtype=dtype) if len(column) else np.empty(0, dtype)
+        return data
+
+    def to_pandas(self):
+        """
+        转换为 pandas DataFrame
+
+        指标列和ID列不复制数据；日期列转换为 datetime64 类型（需要一次复制）。
+        含有缺失值的 int64 指标列转换为可空的 Int64 类型。
+        """
+        import pandas as pd
+
+        data = self.to_numpy()
+        data["date"] = data["date"].astype("datetime64[D]")
+        for name, column in self.columns.items():
+            values = data[name]
+            if column.typecode == 'q':
+                missing = values == MISSING_INT
+                if missing.any():
+                    data[name] = pd.arrays.IntegerArray(values, missing)
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        """
+        转换为 pyarrow.Table
+
+        所有列（包括 date32 类型的日期列）都直接引用底层缓冲区，不复制数据；int64 指标列
+        中的 MISSING_INT 转换为空值（该列需要复制一次）。
+        """
+        import numpy as np
+        import pyarrow as pa
+
+        arrays = [pa.Array.from_buffers(pa.date32(), len(self.dates), [None, pa.py_buffer(self.dates)])]
+        names = ["date"]
+        for name, column in list(self.ids.items()) + list(self.columns.items()):
+            arrow_type = pa.int64() if column.typecode == 'q' else pa.float64()
+            if column.typecode == 'q' and name in self.columns and MISSING_INT in column:
+                values = np.frombuffer(column, dtype=np.int64)
+                arrays.append(pa.array(values, type=arrow_type, mask=values == MISSING_INT))
+            else:
+                arrays.append(pa.Array.from_buffers(arrow_type, len(column), [None, pa.py_buffer(column)]))
+            names.append(name)
+        return pa.Table.from_arrays(arrays, names=names)
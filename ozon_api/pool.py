@@ -0,0 +1,324 @@
+import configparser
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+from .client import OzonAPIClient
+from .ratelimit import RateLimiter
+from .transport import RequestsTransport, Transport
+
+DEFAULT_SECTION = "ozon_api"
+
+
+def load_accounts(config_file: str) -> Dict[str, Dict[str, str]]:
+    """
+    从一个配置文件读取多个账户
+
+    [ozon_api] 段作为名为 default 的账户，[ozon_api:<名称>] 段各自定义一个账户。每段必须
+    包含 client_id 和 api_key，可选 rate 和 burst 为该账户单独设置限流。
+
+    Returns:
+        {账户名称: 该段的全部配置项}
+    """
+    config = configparser.ConfigParser()
+    config.read(config_file)
+
+    accounts = {}
+    for section in config.sections():
+        if section == DEFAULT_SECTION:
+            name = "default"
+        elif section.startswith(DEFAULT_SECTION + ":"):
+            name = section[len(DEFAULT_SECTION) + 1:]
+        else:
+            continue
+        options = dict(config[section])
+        if not options.get("client_id") or not options.get("api_key"):
+            raise ValueError(f"配置文件中账户 '{name}' 缺少 'client_id' 或 'api_key'。")
+        accounts[name] = options
+
+    if not accounts:
+        raise ValueError(f"配置文件中没有找到 '{DEFAULT_SECTION}' 或 '{DEFAULT_SECTION}:<名称>' 部分。")
+    return accounts
+
+
+class _FairScheduler:
+    """
+    按账户轮转的任务调度
+
+    每个账户一个任务队列，空闲的工作线程按轮转顺序从各账户取任务，单个账户同时执行的
+    任务数不超过 per_key_limit。任务多的账户不会挤占其他账户的执行机会。
+    """
+
+    def __init__(self, workers: int, per_key_limit: int):
+        self.workers = workers
+        self.per_key_limit = per_key_limit
+        self._cond = threading.Condition()
+        self._queues: Dict[str, Deque[Tuple[Future, Callable, tuple, dict]]] = {}
+        self._running: Dict[str, int] = {}
+        # 有待执行任务且未达到并发上限的账户，按轮转顺序排列
+        self._rotation: Deque[str] = deque()
+        self._scheduled: Set[str] = set()
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+
+    def submit(self, key: str, func: Callable, *args, **kwargs) -> Future:
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("OzonClientPool 已关闭")
+            if not self._threads:
+                self._start()
+            self._queues.setdefault(key, deque()).append((future, func, args, kwargs))
+            self._schedule(key)
+        return future
+
+    def _start(self):
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"ozon-pool-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _schedule(self, key: str):
+        """在持有锁时调用：账户有任务且未达到并发上限时加入轮转"""
+        if key in self._scheduled or not self._queues.get(key):
+            return
+        if self._running.get(key, 0) >= self.per_key_limit:
+            return
+        self._rotation.append(key)
+        self._scheduled.add(key)
+        self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._rotation and not self._closed:
+                    self._cond.wait()
+                if not self._rotation:
+                    return
+                key = self._rotation.popleft()
+                self._scheduled.discard(key)
+                future, func, args, kwargs = self._queues[key].popleft()
+                self._running[key] = self._running.get(key, 0) + 1
+                # 排到轮转队尾，其他账户先执行
+                self._schedule(key)
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+
+            with self._cond:
+                self._running[key] -= 1
+                if not self._queues[key] and not self._running[key]:
+                    del self._queues[key], self._running[key]
+                else:
+                    self._schedule(key)
+
+    def shutdown(self, wait: bool = True):
+        """执行完已提交的任务后停止工作线程"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+class OzonClientPool:
+    """
+    多账户客户端池
+
+    所有账户的客户端共用一个 requests.Session（即一个连接池）和一个按 client_id 分桶的
+    RateLimiter，每个账户有独立的限流配额。通过 submit/map 提交的任务按账户轮转调度；
+    map_processes 把账户分片到多个进程，适合响应解析占用大量 CPU 的场景。
+    """
+
+    def __init__(
+        self,
+        config_file: Optional[str] = None,
+        accounts: Optional[Dict[str, Dict[str, str]]] = None,
+        base_url: str = "https://performance.ozon.ru/api/v1",
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_connections: int = 100,
+        workers: int = 8,
+        per_account_concurrency: int = 2,
+        transport: Optional[Transport] = None,
+        **client_options
+    ):
+        """
+        初始化客户端池
+
+        Args:
+            config_file: 多账户配置文件，格式见 load_accounts
+            accounts: 直接指定 {账户名称: {"client_id": ..., "api_key": ..., "rate": ...}}，优先于 config_file
+            base_url: API基础URL
+            rate: 每个账户默认的每秒请求数，None 表示不限流（配置了 rate 的账户除外）
+            burst: 每个账户默认的突发请求数
+            max_connections: 共享连接池的最大连接数
+            workers: 执行任务的线程数
+            per_account_concurrency: 单个账户同时执行的最大任务数
+            transport: 所有账户共用的传输层，默认为连接数 max_connections 的 RequestsTransport；
+                map_processes 的子进程总是使用默认传输层
+            client_options: 传给每个 OzonAPIClient 的其他参数；使用 map_processes 时必须可以被 pickle
+        """
+        if accounts is None:
+            if config_file is None:
+                raise ValueError("必须指定 config_file 或 accounts")
+            accounts = load_accounts(config_file)
+
+        self.accounts = accounts
+        self.base_url = base_url
+        self.rate = rate
+        self.burst = burst
+        self.max_connections = max_connections
+        self.workers = workers
+        self.per_account_concurrency = per_account_concurrency
+        self.client_options = client_options
+
+        self.transport = transport if transport is not None else RequestsTransport(pool_maxsize=max_connections)
+        self.session = getattr(self.transport, "session", None)
+
+        self.rate_limiter = self._build_rate_limiter()
+        self.clients: Dict[str, OzonAPIClient] = {
+            name: OzonAPIClient(
+                None,
+                base_url=base_url,
+                rate_limiter=self.rate_limiter if self.rate is not None or options.get("rate") else None,
+                credentials=(options["client_id"], options["api_key"]),
+                transport=self.transport,
+                **client_options
+            )
+            for name, options in accounts.items()
+        }
+        self._scheduler = _FairScheduler(workers, per_account_concurrency)
+
+    def _build_rate_limiter(self) -> Optional[RateLimiter]:
+        per_account = {
+            options["client_id"]: (float(options["rate"]), int(options.get("burst") or max(1, int(float(options["rate"])))))
+            for options in self.accounts.values() if options.get("rate")
+        }
+        if self.rate is None and not per_account:
+            return None
+        # 没有默认速率时，只有单独配置了 rate 的账户使用限流器
+        return RateLimiter(self.rate if self.rate is not None else 1.0, burst=self.burst, limits=per_account)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __getitem__(self, name: str) -> OzonAPIClient:
+        return self.clients[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.clients)
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def submit(self, name: str, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        提交一个账户的任务，以 func(该账户的客户端, *args, **kwargs) 执行
+
+        Returns:
+            任务结果的 Future
+        """
+        return self._scheduler.submit(name, func, self.clients[name], *args, **kwargs)
+
+    def map(
+        self,
+        func: Callable[[OzonAPIClient], Any],
+        names: Optional[List[str]] = None,
+        return_exceptions: bool = False
+    ) -> Dict[str, Any]:
+        """
+        对每个账户执行 func(client)，等待全部完成
+
+        Args:
+            func: 接收客户端的函数
+            names: 账户名称列表，默认为全部账户
+            return_exceptions: 为 True 时异常作为结果返回，否则在全部完成后抛出第一个异常
+
+        Returns:
+            {账户名称: 结果}
+        """
+        futures = {name: self.submit(name, func) for name in (names or list(self.clients))}
+        return _collect(futures, return_exceptions)
+
+    def map_processes(
+        self,
+        func: Callable[[OzonAPIClient], Any],
+        processes: Optional[int] = None,
+        names: Optional[List[str]] = None,
+        return_exceptions: bool = False
+    ) -> Dict[str, Any]:
+        """
+        把账户分片到多个进程，在每个进程中用独立的客户端池执行 func(client)
+
+        每个账户只属于一个进程，因此各账户的限流配额依然准确。func 和结果必须可以被
+        pickle（例如模块级函数）。
+
+        Args:
+            func: 接收客户端的函数
+            processes: 进程数，默认为 CPU 核数
+            names: 账户名称列表，默认为全部账户
+            return_exceptions: 同 map
+        """
+        names = names or list(self.clients)
+        processes = min(processes or os.cpu_count() or 1, len(names))
+        shards = [names[i::processes] for i in range(processes)]
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(_run_shard, self._shard_options(shard), func) for shard in shards]
+            results: Dict[str, Any] = {}
+            for future in futures:
+                results.update(future.result())
+
+        errors = [result for result in results.values() if isinstance(result, BaseException)]
+        if errors and not return_exceptions:
+            raise errors[0]
+        return {name: results[name] for name in names}
+
+    def _shard_options(self, names: List[str]) -> Dict[str, Any]:
+        return {
+            "accounts": {name: self.accounts[name] for name in names},
+            "base_url": self.base_url,
+            "rate": self.rate,
+            "burst": self.burst,
+            "max_connections": self.max_connections,
+            "workers": self.workers,
+            "per_account_concurrency": self.per_account_concurrency,
+            **self.client_options,
+        }
+
+    def close(self):
+        """等待已提交的任务完成，关闭各客户端的后台线程和共享连接池"""
+        self._scheduler.shutdown()
+        for client in self.clients.values():
+            client.close()
+        self.transport.close()
+
+
+def _collect(futures: Dict[str, Future], return_exceptions: bool) -> Dict[str, Any]:
+    results = {}
+    error = None
+    for name, future in futures.items():
+        exception = future.exception()
+        if exception is not None:
+            results[name] = exception
+            error = error or exception
+        else:
+            results[name] = future.result()
+    if error is not None and not return_exceptions:
+        raise error
+    return results
+
+
+def _run_shard(options: Dict[str, Any], func: Callable[[OzonAPIClient], Any]) -> Dict[str, Any]:
+    """子进程入口：为一个账户分片建立客户端池并执行 func"""
+    with OzonClientPool(**options) as pool:
+        return pool.map(func, return_exceptions=True)
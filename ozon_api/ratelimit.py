@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class MemoryBackend:
+    """进程内状态存储，多个线程共享同一个限流器实例即可"""
+
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states: Dict[str, Dict] = {}
+
+    @contextmanager
+    def transaction(self, key: str) -> Iterator[Dict]:
+        """在锁内读取并修改某个 key 的桶状态"""
+        with self._lock:
+            yield self._states.setdefault(key, {})
+
+
+class FileLockBackend:
+    """
+    基于文件锁的状态存储，可在多个工作进程之间共享限流状态
+
+    所有进程使用同一个状态文件即可共享配额。仅支持 POSIX 系统。
+    """
+
+    # 不同进程之间只能比较墙上时间
+    clock = staticmethod(time.time)
+
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise RuntimeError("FileLockBackend 需要 fcntl，仅支持 POSIX 系统")
+        self.path = path
+        # 进程内的线程先串行，避免同一进程内反复争抢文件锁
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self, key: str) -> Iterator[Dict]:
+        """持有文件排他锁期间读取、修改并写回某个 key 的桶状态"""
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                with os.fdopen(os.dup(fd), 'r+') as f:
+                    content = f.read()
+                    try:
+                        states = json.loads(content) if content else {}
+                    except ValueError:
+                        states = {}
+                    state = states.setdefault(key, {})
+                    yield state
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(states))
+                    f.flush()
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+
+class RateLimiter:
+    """
+    令牌桶限流器
+
+    每个 key（通常为 client_id）一个令牌桶，按 rate 速率补充令牌，桶容量为 burst。
+    收到 Retry-After 时暂停该 key 的发放并按 backoff 比例降低速率，之后每发放一个
+    令牌按 recovery 比例逐步恢复，使请求速率稳定在服务端限额之下又尽量用满配额。
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        backend=None,
+        limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        backoff: float = 0.9,
+        min_rate_ratio: float = 0.5,
+        recovery: float = 0.002
+    ):
+        """
+        初始化限流器
+
+        Args:
+            rate: 每秒允许的请求数
+            burst: 桶容量（允许的突发请求数），默认与 rate 相同
+            backend: 状态存储，默认为进程内的 MemoryBackend；跨进程共享时使用 FileLockBackend
+            limits: 针对个别 key 的 (rate, burst) 配置
+            backoff: 收到 Retry-After 时速率乘以的系数
+            min_rate_ratio: 自适应降速的下限（相对于配置速率）
+            recovery: 每发放一个令牌速率恢复的比例（相对于配置速率）
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.limits = dict(limits or {})
+        self.backoff = backoff
+        self.min_rate_ratio = min_rate_ratio
+        self.recovery = recovery
+
+    def set_limit(self, key: str, rate: float, burst: Optional[int] = None):
+        """为某个 key 单独设置速率和桶容量"""
+        self.limits[key] = (rate, burst if burst is not None else max(1, int(rate)))
+
+    def _limit(self, key: str) -> Tuple[float, int]:
+        return self.limits.get(key, (self.rate, self.burst))
+
+    def _refill(self, state: Dict, key: str, now: float):
+        rate, burst = self._limit(key)
+        if not state:
+            state.update(tokens=float(burst), last=now, rate=float(rate), blocked_until=0.0)
+            return
+        elapsed = max(0.0, now - state["last"])
+        state["tokens"] = min(float(burst), state["tokens"] + elapsed * state["rate"])
+        state["last"] = now
+
+    def acquire(self, key: str, timeout: Optional[float] = None) -> float:
+        """
+        获取一个令牌，令牌不足时阻塞等待
+
+        Args:
+            key: 限流的 key，通常为 client_id
+            timeout: 最长等待秒数，None 表示不限制；在此之前拿不到令牌时不再等待，
+                直接抛出 TimeoutError，不消耗令牌
+
+        Returns:
+            实际等待的秒数
+        """
+        waited = 0.0
+        while True:
+            with self.backend.transaction(key) as state:
+                now = self.backend.clock()
+                self._refill(state, key, now)
+                rate, _ = self._limit(key)
+                if now < state["blocked_until"]:
+                    wait_time = state["blocked_until"] - now
+                elif state["tokens"] >= 1.0:
+                    state["tokens"] -= 1.0
+                    state["rate"] = min(float(rate), state["rate"] + rate * self.recovery)
+                    return waited
+                else:
+                    wait_time = (1.0 - state["tokens"]) / state["rate"]
+            if timeout is not None and waited + wait_time > timeout:
+                raise TimeoutError(f"{timeout:.3f} 秒内无法获得令牌")
+            time.sleep(wait_time)
+            waited += wait_time
+
+    def on_retry_after(self, key: str, delay: float):
+        """
+        服务端返回 Retry-After 时调用：暂停发放令牌并降低速率
+
+        Args:
+            key: 限流的 key
+            delay: Retry-After 指定的秒数
+        """
+        with self.backend.transaction(key) as state:
+            now = self.backend.clock()
+            self._refill(state, key, now)
+            rate, _ = self._limit(key)
+            state["tokens"] = 0.0
+            state["blocked_until"] = max(state["blocked_until"], now + delay)
+            state["rate"] = max(rate * self.min_rate_ratio, state["rate"] * self.backoff)
+
+    def current_rate(self, key: str) -> float:
+        """返回某个 key 当前的自适应速率"""
+        with self.backend.transaction(key) as state:
+            self._refill(state, key, self.backend.clock())
+            return state["rate"]
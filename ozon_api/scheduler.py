@@ -0,0 +1,216 @@
+import heapq
+import itertools
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sequence
+
+from .exceptions import QueueFullError
+
+# 默认的优先级类别，越靠前越优先
+DEFAULT_PRIORITIES = ("interactive", "default", "backfill")
+
+_CAMPAIGN_ID = re.compile(r"^/campaigns/(\d+)")
+
+
+def tenant_from_endpoint(endpoint: str) -> Optional[int]:
+    """从接口路径中取出广告活动ID，作为公平排队的默认租户；不属于某个广告活动的接口返回 None"""
+    match = _CAMPAIGN_ID.match(endpoint)
+    return int(match.group(1)) if match else None
+
+
+class _Ticket:
+    __slots__ = ("rank", "tag", "seq", "event", "granted", "cancelled")
+
+    def __init__(self, rank: int, tag: float, seq: int):
+        self.rank = rank
+        self.tag = tag
+        self.seq = seq
+        self.event = threading.Event()
+        self.granted = False
+        self.cancelled = False
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.rank, self.tag, self.seq) < (other.rank, other.tag, other.seq)
+
+
+class RequestScheduler:
+    """
+    按优先级和租户公平调度请求的发送顺序
+
+    等待发送的请求排成一个队列，队首的请求先通过 gate（通常是限流器的令牌），然后才发出，
+    因此配额按调度顺序分配：
+        - 优先级类别之间严格按优先级：interactive 请求总是排在 backfill 之前，
+          而已经排队的 backfill 请求保留原来的位置，高优先级请求处理完后继续执行
+        - 同一优先级类别内按租户（默认为广告活动ID）加权公平排队（WFQ）：每个请求的
+          虚拟完成时间为 max(类别虚拟时间, 该租户上一个请求的完成时间) + 1 / 权重，
+          按虚拟完成时间先后发出，一个租户的大量请求不会挤占其他租户
+        - 每个优先级类别的排队数不超过 max_queue；队列已满时调用方等待空位（反压），
+          block_when_full 为 False 时直接抛出 QueueFullError
+
+    调度器本身不限速，需要与 RateLimiter（作为 gate）或 max_in_flight 一起使用。
+    """
+
+    def __init__(
+        self,
+        priorities: Sequence[str] = DEFAULT_PRIORITIES,
+        weights: Optional[Dict[Hashable, float]] = None,
+        max_in_flight: Optional[int] = None,
+        max_queue: int = 1024,
+        block_when_full: bool = True
+    ):
+        """
+        Args:
+            priorities: 优先级类别名称，越靠前越优先
+            weights: 租户 → 权重，未列出的租户权重为 1
+            max_in_flight: 同时在途的请求数上限，None 表示不限制
+            max_queue: 每个优先级类别中排队等待的最大请求数
+            block_when_full: 队列已满时是否等待空位，为 False 时抛出 QueueFullError
+        """
+        if not priorities:
+            raise ValueError("priorities 不能为空")
+        self.priorities = tuple(priorities)
+        self._ranks = {name: rank for rank, name in enumerate(self.priorities)}
+        self.weights: Dict[Hashable, float] = dict(weights or {})
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.block_when_full = block_when_full
+
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)
+        self._heap: List[_Ticket] = []
+        self._seq = itertools.count()
+        # 每个优先级类别的虚拟时间、排队数；(优先级, 租户) → 上一个请求的虚拟完成时间
+        self._virtual_time = [0.0] * len(self.priorities)
+        self._queued = [0] * len(self.priorities)
+        self._finish: Dict[tuple, float] = {}
+        # 已出队、正在通过 gate 的请求
+        self._dispatching = False
+        self.in_flight = 0
+        # 每个优先级类别已发出的请求数
+        self.dispatched: Dict[str, int] = {name: 0 for name in self.priorities}
+
+    def set_weight(self, tenant: Hashable, weight: float):
+        """设置租户的权重，权重为 2 的租户获得的份额是权重为 1 的两倍"""
+        if weight <= 0:
+            raise ValueError("weight 必须大于 0")
+        with self._lock:
+            self.weights[tenant] = weight
+
+    def queued(self, priority: Optional[str] = None) -> int:
+        """排队等待的请求数，可按优先级类别过滤"""
+        with self._lock:
+            if priority is None:
+                return sum(self._queued)
+            return self._queued[self._rank(priority)]
+
+    def _rank(self, priority: str) -> int:
+        rank = self._ranks.get(priority)
+        if rank is None:
+            raise ValueError(f"未知的优先级: {priority}")
+        return rank
+
+    def acquire(
+        self,
+        priority: str = "default",
+        tenant: Hashable = None,
+        gate: Optional[Callable[[], Any]] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        排队等待发送；返回后调用方必须在请求结束时调用 release
+
+        Args:
+            priority: 优先级类别
+            tenant: 公平排队的租户，None 的请求同属一个租户
+            gate: 排到队首后、发出之前调用，例如 lambda: rate_limiter.acquire(client_id)
+            timeout: 最长等待秒数（含等待队列空位），超时抛出 TimeoutError
+        """
+        rank = self._rank(priority)
+        until = time.monotonic() + timeout if timeout is not None else None
+        with self._lock:
+            while self._queued[rank] >= self.max_queue:
+                if not self.block_when_full:
+                    raise QueueFullError(f"{priority} 队列已满（{self.max_queue}）")
+                remaining = until - time.monotonic() if until is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"等待 {priority} 队列空位超时")
+                self._space.wait(remaining)
+
+            key = (rank, tenant)
+            start = max(self._virtual_time[rank], self._finish.get(key, 0.0))
+            tag = start + 1.0 / self.weights.get(tenant, 1.0)
+            self._finish[key] = tag
+            ticket = _Ticket(rank, tag, next(self._seq))
+            heapq.heappush(self._heap, ticket)
+            self._queued[rank] += 1
+            self._dispatch()
+
+        remaining = until - time.monotonic() if until is not None else None
+        if not ticket.event.wait(remaining):
+            with self._lock:
+                if not ticket.granted:
+                    # 留在堆中的失效票据在出队时跳过
+                    ticket.cancelled = True
+                    self._dequeued(rank)
+                    raise TimeoutError(f"{priority} 请求排队超时")
+
+        # 排到队首：通过 gate 之后才允许下一个请求出队
+        try:
+            if gate is not None:
+                gate()
+        except BaseException:
+            with self._lock:
+                self._dispatching = False
+                self._dispatch()
+            raise
+        with self._lock:
+            self._dispatching = False
+            self.in_flight += 1
+            self._dispatch()
+
+    def release(self):
+        """请求结束（收到响应或失败）后释放在途名额"""
+        with self._lock:
+            self.in_flight -= 1
+            self._dispatch()
+
+    @contextmanager
+    def slot(
+        self,
+        priority: str = "default",
+        tenant: Hashable = None,
+        gate: Optional[Callable[[], Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Iterator[None]:
+        """acquire/release 的上下文管理器形式"""
+        self.acquire(priority, tenant, gate, timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _dequeued(self, rank: int):
+        """在持有锁时调用：某个请求离开队列"""
+        self._queued[rank] -= 1
+        self._space.notify_all()
+
+    def _dispatch(self):
+        """在持有锁时调用：没有请求正在通过 gate 且在途数未满时，放行队首的请求"""
+        if self._dispatching:
+            return
+        if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+            return
+        while self._heap:
+            ticket = heapq.heappop(self._heap)
+            if ticket.cancelled:
+                continue
+            ticket.granted = True
+            # 自计时公平排队（SCFQ）：类别的虚拟时间推进到刚出队请求的虚拟完成时间
+            self._virtual_time[ticket.rank] = ticket.tag
+            self._dispatching = True
+            self.dispatched[self.priorities[ticket.rank]] += 1
+            self._dequeued(ticket.rank)
+            ticket.event.set()
+            return
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+# 执行调用的协程被取消时交给等待方的标记，等待方据此重新执行调用
+_LEADER_CANCELLED = object()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        # 共享本次调用结果的其他调用方数量
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    合并相同 key 的并发调用（线程版）
+
+    第一个调用方执行 func，同一时刻以相同 key 进入的其他调用方等待并共享它的返回值
+    或异常。调用结束后 key 即被移除，之后的调用会重新执行，不做缓存。
+    共享的返回值是同一个对象，调用方不应修改它。
+
+    等待方按自己的 timeout 等待，不受执行方截止时间的约束；优先级等需要区分的调用
+    上下文应放进 key，不同上下文的调用不会合并。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        # 被合并（未实际执行）的调用数
+        self.shared = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """
+        Args:
+            key: 合并的键，相同 key 的并发调用只执行一次
+            func: 实际执行的调用
+            timeout: 等待方最长等待的秒数，超时抛出 TimeoutError；执行 func 的调用方不受影响
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+                self.shared += 1
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError("等待合并的调用超时")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    合并相同 key 的并发协程调用（asyncio 版），语义与 SingleFlight 相同
+
+    只能在一个事件循环中使用。某个等待方被取消不会影响正在执行的调用；执行调用的协程
+    被取消时，取消不会传给等待方，而是由第一个等待方重新执行调用，其余等待方跟随它。
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.shared = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._calls.get(key)
+        while future is not None:
+            self.shared += 1
+            result = await asyncio.shield(future)
+            if result is not _LEADER_CANCELLED:
+                return result
+            # 执行方已在取消时移除 key，第一个醒来的等待方成为新的执行方
+            self.shared -= 1
+            future = self._calls.get(key)
+
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.set_result(_LEADER_CANCELLED)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 没有其他等待方时避免 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
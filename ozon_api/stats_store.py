@@ -0,0 +1,197 @@
+import json
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+# (campaign_id, ad_group_id, ad_id)，上级实体为空时使用 None
+EntityKey = Tuple[Optional[int], Optional[int], Optional[int]]
+
+
+def _parse_date(value: str) -> date:
+    return date.fromisoformat(value[:10])
+
+
+def _contiguous_runs(days: List[date]) -> List[Tuple[date, date]]:
+    """把有序日期列表合并为连续的日期区间"""
+    runs = []
+    for day in days:
+        if runs and runs[-1][1] + timedelta(days=1) == day:
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+
+class StatsStore:
+    """
+    按实体和日期存储统计数据的本地 SQLite 库
+
+    早于结算延迟（settlement_lag_days）的日期视为已结算，数据不再变化，存储后不再
+    重新请求；结算期内的日期每次都会重新请求并覆盖。查询一个日期区间时只请求缺失
+    或尚未结算的日期，再与已存储的数据合并返回。
+
+    响应中 stats 以外的字段（例如 currency、totals）与 merge_stats_responses 一样取自
+    本次第一个请求的响应；所有日期都来自本地库时，使用该实体最近一次请求保存的值。
+    这些字段原样保留，totals 之类按请求区间计算的值不会按查询区间重新计算。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        settlement_lag_days: int = 3,
+        today: Callable[[], date] = date.today
+    ):
+        """
+        初始化统计数据库
+
+        Args:
+            path: SQLite 数据库文件路径
+            settlement_lag_days: 结算延迟天数，早于 today - settlement_lag_days 的日期视为已结算
+            today: 返回当前日期的函数
+        """
+        self.path = path
+        self.settlement_lag_days = settlement_lag_days
+        self.today = today
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS daily_stats ("
+            " campaign_id TEXT NOT NULL,"
+            " ad_group_id TEXT NOT NULL,"
+            " ad_id TEXT NOT NULL,"
+            " metrics TEXT NOT NULL,"
+            " date TEXT NOT NULL,"
+            " final INTEGER NOT NULL,"
+            " rows TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (campaign_id, ad_group_id, ad_id, metrics, date))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_daily_stats_campaign_ad_date ON daily_stats (campaign_id, ad_id, date)"
+        )
+        # 每个实体最近一次响应中 stats 以外的字段
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_fields ("
+            " campaign_id TEXT NOT NULL,"
+            " ad_group_id TEXT NOT NULL,"
+            " ad_id TEXT NOT NULL,"
+            " metrics TEXT NOT NULL,"
+            " fields TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (campaign_id, ad_group_id, ad_id, metrics))"
+        )
+        self._conn.commit()
+
+    def close(self):
+        """关闭数据库连接"""
+        self._conn.close()
+
+    @staticmethod
+    def _key_columns(entity: EntityKey, metrics: List[str]) -> Tuple[str, str, str, str]:
+        campaign_id, ad_group_id, ad_id = entity
+        return (
+            "" if campaign_id is None else str(campaign_id),
+            "" if ad_group_id is None else str(ad_group_id),
+            "" if ad_id is None else str(ad_id),
+            ",".join(sorted(metrics))
+        )
+
+    def settled_until(self) -> date:
+        """返回最后一个已结算的日期"""
+        return self.today() - timedelta(days=self.settlement_lag_days + 1)
+
+    def fetch(
+        self,
+        entity: EntityKey,
+        date_from: str,
+        date_to: str,
+        metrics: List[str],
+        fetch: Callable[[str, str], Dict]
+    ) -> Dict:
+        """
+        获取一个日期区间的统计数据，只对缺失或未结算的日期调用 fetch
+
+        Args:
+            entity: (campaign_id, ad_group_id, ad_id)
+            date_from: 开始日期
+            date_to: 结束日期
+            metrics: 统计指标列表
+            fetch: 请求某个子区间的函数 fetch(date_from, date_to)，返回 {"stats": [...]}
+
+        Returns:
+            {"stats": [...], ...}：按日期排序的逐日统计行，以及响应中的其他字段
+        """
+        start, end = _parse_date(date_from), _parse_date(date_to)
+        key = self._key_columns(entity, metrics)
+        stored = self._load(key, start, end)
+
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        missing = [d for d in days if d not in stored or not stored[d][0]]
+
+        settled_until = self.settled_until()
+        fields = None
+        for run_from, run_to in _contiguous_runs(missing):
+            response = fetch(run_from.isoformat(), run_to.isoformat())
+            if fields is None:
+                fields = {name: value for name, value in response.items() if name != "stats"}
+                self._save_fields(key, fields)
+            rows_by_day: Dict[date, List[Dict]] = {}
+            for row in response.get("stats", []):
+                if "date" not in row:
+                    raise ValueError("统计数据缺少 date 字段，无法按天存储")
+                rows_by_day.setdefault(_parse_date(row["date"]), []).append(row)
+
+            fetched = {}
+            for offset in range((run_to - run_from).days + 1):
+                day = run_from + timedelta(days=offset)
+                fetched[day] = (day <= settled_until, rows_by_day.get(day, []))
+            self._save(key, fetched)
+            stored.update(fetched)
+
+        if fields is None:
+            fields = self._load_fields(key)
+        return {**fields, "stats": [row for day in days for row in stored[day][1]]}
+
+    def _load(self, key: Tuple[str, str, str, str], start: date, end: date) -> Dict[date, Tuple[bool, List[Dict]]]:
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT date, final, rows FROM daily_stats"
+                " WHERE campaign_id = ? AND ad_group_id = ? AND ad_id = ? AND metrics = ?"
+                " AND date BETWEEN ? AND ?",
+                key + (start.isoformat(), end.isoformat())
+            )
+            return {
+                date.fromisoformat(day): (bool(final), json.loads(rows))
+                for day, final, rows in cursor.fetchall()
+            }
+
+    def _save(self, key: Tuple[str, str, str, str], days: Dict[date, Tuple[bool, List[Dict]]]):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO daily_stats"
+                " (campaign_id, ad_group_id, ad_id, metrics, date, final, rows, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [key + (day.isoformat(), int(final), json.dumps(rows), now) for day, (final, rows) in days.items()]
+            )
+            self._conn.commit()
+
+    def _load_fields(self, key: Tuple[str, str, str, str]) -> Dict:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fields FROM response_fields"
+                " WHERE campaign_id = ? AND ad_group_id = ? AND ad_id = ? AND metrics = ?",
+                key
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else {}
+
+    def _save_fields(self, key: Tuple[str, str, str, str], fields: Dict):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_fields"
+                " (campaign_id, ad_group_id, ad_id, metrics, fields, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+                key + (json.dumps(fields), time.time())
+            )
+            self._conn.commit()
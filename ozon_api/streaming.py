@@ -0,0 +1,112 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+
+
+class _TextStream:
+    """把字节块流增量解码为文本缓冲区，按需读取更多数据"""
+
+    # 已消费的前缀超过该长度时丢弃，保持缓冲区大小有界
+    _COMPACT_THRESHOLD = 64 * 1024
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """读取下一个数据块，已到达末尾时返回 False"""
+        if self.eof:
+            return False
+        if self.pos > self._COMPACT_THRESHOLD:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            text = self._decoder.decode(chunk)
+            if text:
+                self.buffer += text
+                return True
+        self.buffer += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """跳过空白并返回下一个字符，数据结束时返回空字符串"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"JSON 格式错误：位置 {self.pos} 处应为 {char!r}")
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        """解析下一个完整的 JSON 值，数据不完整时继续读取"""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # 缓冲区末尾的数字可能还没读完
+            if end == len(self.buffer) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str = "stats") -> Iterator[Any]:
+    """
+    从 JSON 对象的字节流中增量解析顶层字段 key 对应的数组，逐个产出数组元素
+
+    只有目标数组之前的其他顶层字段需要完整缓冲；数组元素解析后即可被丢弃，
+    内存占用与响应总大小无关。找不到该字段时不产出任何元素。
+
+    Args:
+        chunks: 响应正文的字节块，例如 response.iter_content(chunk_size)
+        key: 顶层数组字段名
+    """
+    stream = _TextStream(chunks)
+    decoder = json.JSONDecoder()
+
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+
+    while True:
+        name = stream.value(decoder)
+        stream.expect(":")
+        if name == key:
+            break
+        stream.value(decoder)
+        separator = stream.peek()
+        stream.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError(f"JSON 格式错误：位置 {stream.pos - 1} 处应为 ',' 或 '}}'")
+
+    stream.expect("[")
+    if stream.peek() == "]":
+        return
+    while True:
+        yield stream.value(decoder)
+        separator = stream.peek()
+        stream.pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"JSON 格式错误：位置 {stream.pos - 1} 处应为 ',' 或 ']'")
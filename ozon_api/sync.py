@@ -0,0 +1,240 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .crawler import CAMPAIGN, AD_GROUP, AD, CAMPAIGN_STATS, AD_STATS
+
+
+class SyncCheckpoint:
+    """
+    同步进度检查点（SQLite）
+
+    每个工作单元（scope）记录一个游标和完成标记，按 run_id 区分不同的同步任务。
+    """
+
+    def __init__(self, path: str, run_id: str):
+        """
+        Args:
+            path: SQLite 数据库文件路径
+            run_id: 同步任务标识，相同 run_id 的重新运行会从检查点继续
+        """
+        self.path = path
+        self.run_id = run_id
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sync_checkpoints ("
+            " run_id TEXT NOT NULL,"
+            " scope TEXT NOT NULL,"
+            " cursor TEXT,"
+            " done INTEGER NOT NULL DEFAULT 0,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (run_id, scope))"
+        )
+        self._conn.commit()
+
+    def get(self, scope: str) -> Tuple[Optional[str], bool]:
+        """返回某个工作单元的 (游标, 是否完成)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cursor, done FROM sync_checkpoints WHERE run_id = ? AND scope = ?",
+                (self.run_id, scope)
+            ).fetchone()
+        if row is None:
+            return None, False
+        return row[0], bool(row[1])
+
+    def is_done(self, scope: str) -> bool:
+        """判断某个工作单元是否已完成"""
+        return self.get(scope)[1]
+
+    def save(self, scope: str, cursor: Optional[str] = None, done: bool = False):
+        """保存工作单元的游标或完成标记，立即提交"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_checkpoints (run_id, scope, cursor, done, updated_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (self.run_id, scope, cursor, int(done), time.time())
+            )
+            self._conn.commit()
+
+    def reset(self):
+        """清除当前 run_id 的全部进度"""
+        with self._lock:
+            self._conn.execute("DELETE FROM sync_checkpoints WHERE run_id = ?", (self.run_id,))
+            self._conn.commit()
+
+    def close(self):
+        """关闭数据库连接"""
+        self._conn.close()
+
+
+class SyncReport:
+    """一次同步运行的结果"""
+
+    def __init__(self):
+        self.completed_units = 0
+        self.skipped_units = 0
+        self.rows_written = 0
+        # (工作单元, 异常)
+        self.errors: List[Tuple[str, Exception]] = []
+
+    @property
+    def finished(self) -> bool:
+        """所有工作单元是否均已完成"""
+        return not self.errors
+
+    def __repr__(self):
+        return (f"SyncReport(completed_units={self.completed_units}, skipped_units={self.skipped_units}, "
+                f"rows_written={self.rows_written}, errors={len(self.errors)})")
+
+
+class SyncEngine:
+    """
+    可断点续传的账户同步
+
+    工作单元划分为：广告活动（活动记录 + 活动统计）和广告组（广告组记录 + 组内每个广告
+    及其统计）。广告组内按顺序处理广告，每完成一个广告就把游标写入检查点，产出的记录
+    立即交给 sink 写出。某个单元失败时记录错误并继续处理其他单元；重新运行时跳过已完成
+    的单元，广告组从游标之后继续。
+
+    由于先写出记录再保存检查点，中断时最后一个广告的记录可能被重复写出（至少一次语义）。
+    """
+
+    def __init__(
+        self,
+        client,
+        checkpoint_path: str,
+        date_from: str,
+        date_to: str,
+        metrics: List[str],
+        workers: int = 4,
+        run_id: Optional[str] = None
+    ):
+        """
+        Args:
+            client: OzonAPIClient 实例
+            checkpoint_path: 检查点 SQLite 文件路径
+            date_from: 统计开始日期
+            date_to: 统计结束日期
+            metrics: 统计指标列表
+            workers: 并行处理广告组的线程数
+            run_id: 同步任务标识，默认由日期区间和指标生成
+        """
+        self.client = client
+        self.date_from = date_from
+        self.date_to = date_to
+        self.metrics = metrics
+        self.workers = workers
+        if run_id is None:
+            run_id = f"{date_from}:{date_to}:{','.join(metrics)}"
+        self.checkpoint = SyncCheckpoint(checkpoint_path, run_id)
+        self._sink_lock = threading.Lock()
+
+    def run(self, sink: Callable[[str, Dict], None]) -> SyncReport:
+        """
+        执行（或继续）同步
+
+        Args:
+            sink: 接收 (记录类型, 记录) 的回调，记录类型与 crawl_account 相同
+
+        Returns:
+            SyncReport
+        """
+        report = SyncReport()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for campaign in self.client.get_campaigns():
+                campaign_id = campaign["id"]
+                tree_scope = f"campaign_tree:{campaign_id}"
+                if self.checkpoint.is_done(tree_scope):
+                    report.skipped_units += 1
+                    continue
+
+                self._run_unit(report, f"campaign:{campaign_id}", lambda: self._sync_campaign(campaign, sink, report))
+
+                try:
+                    ad_groups = self.client.get_ad_groups(campaign_id=campaign_id)
+                except Exception as e:
+                    report.errors.append((tree_scope, e))
+                    continue
+
+                futures = [
+                    executor.submit(
+                        self._run_unit, report, f"ad_group:{campaign_id}:{ad_group['id']}",
+                        lambda ad_group=ad_group: self._sync_ad_group(campaign_id, ad_group, sink, report)
+                    )
+                    for ad_group in ad_groups
+                ]
+                if all(future.result() for future in futures) and self.checkpoint.is_done(f"campaign:{campaign_id}"):
+                    self.checkpoint.save(tree_scope, done=True)
+        return report
+
+    def close(self):
+        """关闭检查点数据库"""
+        self.checkpoint.close()
+
+    def _run_unit(self, report: SyncReport, scope: str, func: Callable[[], None]) -> bool:
+        """执行一个工作单元，已完成则跳过；失败时记录错误，返回该单元是否完成"""
+        if self.checkpoint.is_done(scope):
+            with self._sink_lock:
+                report.skipped_units += 1
+            return True
+        try:
+            func()
+        except Exception as e:
+            with self._sink_lock:
+                report.errors.append((scope, e))
+            return False
+        self.checkpoint.save(scope, done=True)
+        with self._sink_lock:
+            report.completed_units += 1
+        return True
+
+    def _emit(self, sink: Callable[[str, Dict], None], report: SyncReport, kind: str, row: Dict):
+        with self._sink_lock:
+            sink(kind, row)
+            report.rows_written += 1
+
+    def _sync_campaign(self, campaign: Dict, sink: Callable[[str, Dict], None], report: SyncReport):
+        campaign_id = campaign["id"]
+        stats = self.client.get_campaign_stats(
+            campaign_id=campaign_id,
+            date_from=self.date_from,
+            date_to=self.date_to,
+            metrics=self.metrics
+        )
+        self._emit(sink, report, CAMPAIGN, campaign)
+        self._emit(sink, report, CAMPAIGN_STATS, {"campaign_id": campaign_id, **stats})
+
+    def _sync_ad_group(self, campaign_id: int, ad_group: Dict, sink: Callable[[str, Dict], None], report: SyncReport):
+        ad_group_id = ad_group["id"]
+        scope = f"ad_group:{campaign_id}:{ad_group_id}"
+        cursor, _ = self.checkpoint.get(scope)
+
+        ads = self.client.get_ads(campaign_id=campaign_id, ad_group_id=ad_group_id)
+        if cursor is None:
+            self._emit(sink, report, AD_GROUP, {"campaign_id": campaign_id, **ad_group})
+            self.checkpoint.save(scope, cursor="")
+        else:
+            # 跳过游标及之前已完成的广告
+            ad_ids = [str(ad["id"]) for ad in ads]
+            if cursor in ad_ids:
+                ads = ads[ad_ids.index(cursor) + 1:]
+
+        for ad in ads:
+            ad_id = ad["id"]
+            stats = self.client.get_ad_stats(
+                campaign_id=campaign_id,
+                ad_group_id=ad_group_id,
+                ad_id=ad_id,
+                date_from=self.date_from,
+                date_to=self.date_to,
+                metrics=self.metrics
+            )
+            self._emit(sink, report, AD, {"campaign_id": campaign_id, "ad_group_id": ad_group_id, **ad})
+            self._emit(sink, report, AD_STATS, {
+                "campaign_id": campaign_id, "ad_group_id": ad_group_id, "ad_id": ad_id, **stats
+            })
+            self.checkpoint.save(scope, cursor=str(ad_id))
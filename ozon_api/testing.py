@@ -0,0 +1,299 @@
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+
+from .compression import available_encodings, compress, decompress, parse_encodings
+from .utils import endpoint_template
+
+_CAMPAIGN_ID = r"/campaigns/(\d+)"
+_ROUTES = [
+    ("GET", re.compile(r"^/campaigns$"), "campaigns"),
+    ("POST", re.compile(r"^/campaigns$"), "create_campaign"),
+    ("POST", re.compile(rf"^{_CAMPAIGN_ID}/stats$"), "campaign_stats"),
+    ("GET", re.compile(rf"^{_CAMPAIGN_ID}/ad_groups$"), "ad_groups"),
+    ("POST", re.compile(rf"^{_CAMPAIGN_ID}/ad_groups$"), "create_ad_group"),
+    ("GET", re.compile(rf"^{_CAMPAIGN_ID}/ad_groups/(\d+)/ads$"), "ads"),
+    ("POST", re.compile(rf"^{_CAMPAIGN_ID}/ad_groups/(\d+)/ads$"), "create_ad"),
+    ("POST", re.compile(rf"^{_CAMPAIGN_ID}/ad_groups/(\d+)/ads/(\d+)/stats$"), "ad_stats"),
+    ("POST", re.compile(r"^/ads/stats$"), "batch_ad_stats"),
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """把请求转交给 MockOzonServer 处理"""
+
+    # 保持连接，与真实API一样可以复用连接池
+    protocol_version = "HTTP/1.1"
+    # 响应头和正文分两次写出，关闭 Nagle 算法避免与延迟确认叠加出 40ms 的停顿
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method: str):
+        mock = self.server.mock
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        content_encoding = self.headers.get("Content-Encoding")
+        if body and content_encoding:
+            body = decompress(body, content_encoding)
+        status, payload, headers = mock.handle(method, self.path, body, dict(self.headers))
+
+        data = json.dumps(payload).encode("utf-8")
+        if mock.compress_responses:
+            supported = available_encodings()
+            for encoding in parse_encodings(self.headers.get("Accept-Encoding")):
+                if encoding in supported:
+                    data = compress(data, encoding)
+                    headers = {**headers, "Content-Encoding": encoding}
+                    break
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockOzonServer:
+    """
+    进程内的 Ozon Performance API 模拟服务器
+
+    按配置的账户规模生成确定性的广告活动、广告组和广告，统计接口按日期区间逐日返回
+    数据。可以注入延迟、429 限流和 5xx 错误，用于测试客户端的重试逻辑和基准测试。
+
+    用法::
+
+        with MockOzonServer(campaigns=10, latency=0.005) as server:
+            client = OzonAPIClient("config.ini", base_url=server.base_url)
+            client.get_campaigns()
+    """
+
+    base_path = "/api/v1"
+
+    def __init__(
+        self,
+        campaigns: int = 3,
+        ad_groups_per_campaign: int = 2,
+        ads_per_ad_group: int = 5,
+        latency: Union[float, Callable[[], float]] = 0.0,
+        rate_limit_ratio: float = 0.0,
+        server_error_ratio: float = 0.0,
+        retry_after: float = 0.0,
+        page_size: Optional[int] = None,
+        row_padding: int = 0,
+        compress_responses: bool = False,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            campaigns: 广告活动数量
+            ad_groups_per_campaign: 每个广告活动下的广告组数量
+            ads_per_ad_group: 每个广告组下的广告数量
+            latency: 每个请求的处理延迟（秒），或返回延迟的函数，例如 lambda: random.expovariate(200)
+            rate_limit_ratio: 返回 429 的请求比例
+            server_error_ratio: 返回 503 的请求比例
+            retry_after: 429 响应的 Retry-After 秒数
+            page_size: 列表接口的默认每页数量，None 表示不分页；请求中的 page_size 参数优先
+            row_padding: 每条统计数据附加的填充字节数，用于模拟较大的响应
+            compress_responses: 按请求的 Accept-Encoding 压缩响应（gzip、br、zstd）；
+                带 Content-Encoding 的请求体总是先解压再处理
+            host: 监听地址
+            port: 监听端口，0 表示随机分配
+            seed: 错误注入的随机种子
+        """
+        self.campaigns = campaigns
+        self.ad_groups_per_campaign = ad_groups_per_campaign
+        self.ads_per_ad_group = ads_per_ad_group
+        self.latency = latency
+        self.rate_limit_ratio = rate_limit_ratio
+        self.server_error_ratio = server_error_ratio
+        self.retry_after = retry_after
+        self.page_size = page_size
+        self.row_padding = row_padding
+        self.compress_responses = compress_responses
+        self.host = host
+        self.port = port
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._next_campaign_id = campaigns + 1
+        # 按接口模板统计的请求数
+        self.requests: Counter = Counter()
+        # 最近一次请求的 (方法, 路径, 请求头, 解压后的请求体)
+        self.last_request: Optional[Tuple[str, str, Dict[str, str], bytes]] = None
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """传给 OzonAPIClient 的 base_url"""
+        return f"http://{self.host}:{self.port}{self.base_path}"
+
+    @property
+    def request_count(self) -> int:
+        """收到的请求总数"""
+        with self._lock:
+            return sum(self.requests.values())
+
+    def start(self) -> "MockOzonServer":
+        """在后台线程中启动服务器"""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, name="ozon-mock-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """阻塞当前线程直到服务器停止，尚未启动时先启动"""
+        if self._httpd is None:
+            self.start()
+        self._thread.join()
+
+    def stop(self):
+        """停止服务器"""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        body: bytes,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Dict, Dict[str, str]]:
+        """处理一个请求，返回 (状态码, 响应正文, 响应头)"""
+        url = urlparse(path)
+        endpoint = url.path[len(self.base_path):] if url.path.startswith(self.base_path) else url.path
+        with self._lock:
+            self.requests[f"{method} {endpoint_template(endpoint)}"] += 1
+            self.last_request = (method, path, headers or {}, body)
+            roll = self._random.random()
+
+        delay = self.latency() if callable(self.latency) else self.latency
+        if delay > 0:
+            time.sleep(delay)
+
+        if roll < self.rate_limit_ratio:
+            return 429, {"error": "too many requests"}, {"Retry-After": str(self.retry_after)}
+        if roll < self.rate_limit_ratio + self.server_error_ratio:
+            return 503, {"error": "service unavailable"}, {}
+
+        for route_method, pattern, name in _ROUTES:
+            match = pattern.match(endpoint)
+            if match and route_method == method:
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                try:
+                    payload = json.loads(body) if body else {}
+                except ValueError:
+                    return 400, {"error": "invalid json"}, {}
+                ids = [int(group) for group in match.groups()]
+                result = getattr(self, f"_{name}")(*ids, query=query, body=payload)
+                if "error" in result:
+                    return 400, result, {}
+                return 200, result, {}
+        return 404, {"error": f"unknown endpoint {method} {endpoint}"}, {}
+
+    def _page(self, key: str, items: List[Dict], query: Dict[str, str]) -> Dict:
+        page_size = int(query.get("page_size") or self.page_size or len(items) or 1)
+        start = int(query.get("page_token") or 0)
+        result = {key: items[start:start + page_size]}
+        if start + page_size < len(items):
+            result["next_page_token"] = str(start + page_size)
+        return result
+
+    def _campaigns(self, query: Dict, body: Dict) -> Dict:
+        items = [{"id": cid, "name": f"Campaign {cid}", "state": "active"} for cid in range(1, self.campaigns + 1)]
+        return self._page("campaigns", items, query)
+
+    def _next_id(self) -> int:
+        with self._lock:
+            new_id = self._next_campaign_id
+            self._next_campaign_id += 1
+        return new_id
+
+    def _create_campaign(self, query: Dict, body: Dict) -> Dict:
+        # 与真实API一样校验必填字段，校验失败返回 400
+        if not body.get("name"):
+            return {"error": "name is required"}
+        return {"id": self._next_id(), **body}
+
+    def _create_ad_group(self, campaign_id: int, query: Dict, body: Dict) -> Dict:
+        if not body.get("name"):
+            return {"error": "name is required"}
+        return {"id": self._next_id(), "campaign_id": campaign_id, **body}
+
+    def _create_ad(self, campaign_id: int, ad_group_id: int, query: Dict, body: Dict) -> Dict:
+        if not body.get("title"):
+            return {"error": "title is required"}
+        return {"id": self._next_id(), "ad_group_id": ad_group_id, **body}
+
+    def _ad_groups(self, campaign_id: int, query: Dict, body: Dict) -> Dict:
+        items = [
+            {"id": campaign_id * 1000 + n, "name": f"Ad group {n}"}
+            for n in range(1, self.ad_groups_per_campaign + 1)
+        ]
+        return self._page("ad_groups", items, query)
+
+    def _ads(self, campaign_id: int, ad_group_id: int, query: Dict, body: Dict) -> Dict:
+        items = [
+            {"id": ad_group_id * 1000 + n, "title": f"Ad {n}"}
+            for n in range(1, self.ads_per_ad_group + 1)
+        ]
+        return self._page("ads", items, query)
+
+    def _stat_rows(self, entity_id: int, body: Dict, **ids) -> List[Dict]:
+        start = date.fromisoformat(body["date_from"][:10])
+        end = date.fromisoformat(body["date_to"][:10])
+        rows = []
+        for offset in range((end - start).days + 1):
+            day = start + timedelta(days=offset)
+            seed = entity_id * 31 + day.toordinal()
+            row = {"date": day.isoformat(), **ids}
+            for index, metric in enumerate(body.get("metrics", [])):
+                row[metric] = (seed * (index + 7)) % 1000
+            if self.row_padding:
+                row["padding"] = "x" * self.row_padding
+            rows.append(row)
+        return rows
+
+    def _campaign_stats(self, campaign_id: int, query: Dict, body: Dict) -> Dict:
+        return {"stats": self._stat_rows(campaign_id, body)}
+
+    def _ad_stats(self, campaign_id: int, ad_group_id: int, ad_id: int, query: Dict, body: Dict) -> Dict:
+        return {"stats": self._stat_rows(ad_id, body)}
+
+    def _batch_ad_stats(self, query: Dict, body: Dict) -> Dict:
+        rows = []
+        for ad in body.get("ads", []):
+            rows.extend(self._stat_rows(ad["ad_id"], body, ad_id=ad["ad_id"]))
+        return {"stats": rows}
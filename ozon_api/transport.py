@@ -0,0 +1,315 @@
+from datetime import timedelta
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.response import HTTPResponse
+
+from .compression import _brotli, _zstandard, parse_encodings
+
+# 所有请求共用的默认请求头
+DEFAULT_HEADERS = {
+    "Content-Type": "application/json",
+    "Host": "performance.ozon.ru"
+}
+
+
+class Transport:
+    """
+    HTTP 传输层接口
+
+    send 返回的响应对象需要提供 requests.Response 的子集：status_code、headers、
+    content、text、elapsed、iter_content(chunk_size) 和 close()。网络层面的失败抛出
+    network_errors 中的异常，其中请求尚未发出的（建立连接阶段的）失败由 is_connect_error 识别。
+    """
+
+    network_errors: Tuple[type, ...] = ()
+
+    def is_connect_error(self, error: Exception) -> bool:
+        """network_errors 中的异常是否发生在建立连接阶段，即请求确定没有发出"""
+        return False
+
+    def decodable_encodings(self) -> List[str]:
+        """传输层能够边读取边解压的响应编码"""
+        return ["gzip", "deflate"]
+
+    def accept_encoding_header(self, encodings: Sequence[str]) -> str:
+        """按优先顺序生成 Accept-Encoding，传输层不能解压的编码会被去掉"""
+        decodable = self.decodable_encodings()
+        accepted = [encoding for encoding in parse_encodings(encodings) if encoding in decodable]
+        return ", ".join(accepted) if accepted else "identity"
+
+    def wire_bytes_received(self, response) -> Optional[int]:
+        """响应正文在网络上传输的（压缩后的）字节数，无法获取时返回 None"""
+        return None
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Optional[bytes] = None,
+        stream: bool = False,
+        timeout: Optional[float] = None
+    ):
+        """
+        发送一个请求
+
+        Args:
+            timeout: 本次调用剩余的时间（秒），连接和读取超时都不超过它；None 时使用传输层的配置
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """关闭连接池"""
+        raise NotImplementedError
+
+
+class RequestsTransport(Transport):
+    """
+    基于 requests/urllib3 的传输层
+
+    每个连接只能同时处理一个请求，pool_maxsize 应不小于并发请求的线程数，否则多出的
+    连接用完即关闭，无法复用。
+    """
+
+    network_errors = (requests.exceptions.RequestException,)
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        connect_timeout: Optional[float] = 10.0,
+        read_timeout: Optional[float] = 30.0,
+        keepalive: bool = True,
+        accept_encoding: Optional[Sequence[str]] = None
+    ):
+        """
+        Args:
+            session: 已有的 requests.Session；为 None 时新建并按连接池参数配置
+            pool_connections: 缓存连接池的主机数
+            pool_maxsize: 每个主机保留的最大连接数
+            pool_block: 连接用完时是否等待空闲连接，而不是临时新建连接
+            connect_timeout: 建立连接的超时时间（秒），None 表示不限制
+            read_timeout: 两次收到数据之间的最长间隔（秒），None 表示不限制
+            keepalive: 是否复用连接；为 False 时每个请求都发送 Connection: close
+            accept_encoding: 按优先顺序接受的响应压缩编码，例如 ["zstd", "br", "gzip"]；
+                None 时使用 requests 的默认值
+        """
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        session.headers.update(DEFAULT_HEADERS)
+        if not keepalive:
+            session.headers["Connection"] = "close"
+        if accept_encoding is not None:
+            session.headers["Accept-Encoding"] = self.accept_encoding_header(accept_encoding)
+        self.session = session
+        self.timeout = (connect_timeout, read_timeout)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Optional[bytes] = None,
+        stream: bool = False,
+        timeout: Optional[float] = None
+    ) -> requests.Response:
+        if timeout is None:
+            timeout = self.timeout
+        else:
+            timeout = tuple(timeout if limit is None else min(limit, timeout) for limit in self.timeout)
+        if method == "GET":
+            return self.session.get(url, headers=headers, stream=stream, timeout=timeout)
+        if method == "POST":
+            return self.session.post(url, headers=headers, data=data, stream=stream, timeout=timeout)
+        if method == "PUT":
+            return self.session.put(url, headers=headers, data=data, stream=stream, timeout=timeout)
+        return self.session.delete(url, headers=headers, data=data, stream=stream, timeout=timeout)
+
+    def is_connect_error(self, error: Exception) -> bool:
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        if not isinstance(error, requests.exceptions.ConnectionError) or not error.args:
+            return False
+        # 连接失败时 requests 抛出的 ConnectionError 包装了 urllib3 的 MaxRetryError；
+        # 连接被拒绝、DNS 解析失败都是 ConnectTimeoutError 的子类。连接中断（ProtocolError）不算
+        reason = getattr(error.args[0], "reason", error.args[0])
+        return isinstance(reason, ConnectTimeoutError)
+
+    def decodable_encodings(self) -> List[str]:
+        # urllib3 按已安装的库（brotli、zstandard）决定支持的编码
+        return [encoding for encoding in HTTPResponse.CONTENT_DECODERS if encoding != "x-gzip"]
+
+    def wire_bytes_received(self, response) -> Optional[int]:
+        tell = getattr(response.raw, "tell", None)
+        wire_bytes = tell() if tell is not None else None
+        return wire_bytes if isinstance(wire_bytes, int) else None
+
+    def close(self):
+        self.session.close()
+
+
+class _HTTPXResponse:
+    """把 httpx.Response 包装成客户端使用的 requests.Response 子集"""
+
+    def __init__(self, response, stream: bool):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.raw = response
+        if not stream:
+            response.read()
+
+    @property
+    def content(self) -> bytes:
+        return self._response.read()
+
+    @property
+    def text(self) -> str:
+        self._response.read()
+        return self._response.text
+
+    @property
+    def elapsed(self) -> timedelta:
+        # httpx 在正文读取完之后才设置 elapsed；流式读取时还拿不到
+        try:
+            return self._response.elapsed
+        except RuntimeError:
+            return timedelta(0)
+
+    def iter_content(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        return self._response.iter_bytes(chunk_size)
+
+    def close(self):
+        self._response.close()
+
+
+class HTTPXTransport(Transport):
+    """
+    基于 httpx 的传输层，可以启用 HTTP/2（需要 pip install ozon_api_client[http2]）
+
+    HTTP/2 在一个连接上复用多个并发请求，几十个线程共用少量连接即可，不再需要
+    与线程数相当的连接池。
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        max_connections: int = 10,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = 30.0,
+        connect_timeout: Optional[float] = 10.0,
+        read_timeout: Optional[float] = 30.0,
+        keepalive: bool = True,
+        accept_encoding: Optional[Sequence[str]] = None
+    ):
+        """
+        Args:
+            http2: 是否启用 HTTP/2（服务端不支持时自动使用 HTTP/1.1）
+            max_connections: 最大连接数
+            max_keepalive_connections: 保留的空闲连接数，默认与 max_connections 相同
+            keepalive_expiry: 空闲连接的保留时间（秒）
+            connect_timeout: 建立连接的超时时间（秒）
+            read_timeout: 读取数据的超时时间（秒）
+            keepalive: 是否复用连接
+            accept_encoding: 按优先顺序接受的响应压缩编码，None 时使用 httpx 的默认值
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("HTTPXTransport 需要 httpx，请执行 pip install ozon_api_client[http2]")
+        self._httpx = httpx
+        self.network_errors = (httpx.TransportError,)
+
+        if not keepalive:
+            max_keepalive_connections = 0
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections if max_keepalive_connections is not None else max_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        timeout = httpx.Timeout(connect=connect_timeout, read=read_timeout, write=read_timeout, pool=read_timeout)
+        headers = dict(DEFAULT_HEADERS)
+        if accept_encoding is not None:
+            headers["Accept-Encoding"] = self.accept_encoding_header(accept_encoding)
+        self.client = httpx.Client(http2=http2, limits=limits, timeout=timeout, headers=headers)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Optional[bytes] = None,
+        stream: bool = False,
+        timeout: Optional[float] = None
+    ) -> _HTTPXResponse:
+        options = {}
+        if timeout is not None:
+            limits = self.client.timeout
+            options["timeout"] = self._httpx.Timeout(**{
+                phase: timeout if limit is None else min(limit, timeout)
+                for phase, limit in (
+                    ("connect", limits.connect), ("read", limits.read), ("write", limits.write), ("pool", limits.pool)
+                )
+            })
+        request = self.client.build_request(method, url, headers=headers, content=data, **options)
+        return _HTTPXResponse(self.client.send(request, stream=True), stream)
+
+    def is_connect_error(self, error: Exception) -> bool:
+        # 等待连接池超时同样说明请求还没有发出
+        httpx = self._httpx
+        return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+    def decodable_encodings(self) -> List[str]:
+        encodings = ["gzip", "deflate"]
+        if _brotli() is not None:
+            encodings.append("br")
+        if _zstandard() is not None:
+            encodings.append("zstd")
+        return encodings
+
+    def wire_bytes_received(self, response) -> Optional[int]:
+        return response.raw.num_bytes_downloaded
+
+    def close(self):
+        self.client.close()
+
+
+def transport_from_config(config, session: Optional[requests.Session] = None) -> Transport:
+    """
+    按 Config 中的传输层配置创建传输层
+
+    使用的配置项：timeout（connect_timeout/read_timeout 的默认值）、connect_timeout、read_timeout、
+    pool_connections、pool_maxsize、pool_block、keepalive、keepalive_expiry、http2、accept_encoding。
+    http2 为真时使用 HTTPXTransport，pool_maxsize 作为最大连接数。
+    """
+    timeout = config.get("timeout")
+    connect_timeout = config.get("connect_timeout", timeout)
+    read_timeout = config.get("read_timeout", timeout)
+    if config.get("http2", False):
+        return HTTPXTransport(
+            http2=True,
+            max_connections=config.get("pool_maxsize", 10),
+            keepalive_expiry=config.get("keepalive_expiry", 30.0),
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            keepalive=config.get("keepalive", True),
+            accept_encoding=config.get("accept_encoding")
+        )
+    return RequestsTransport(
+        session=session,
+        pool_connections=config.get("pool_connections", 10),
+        pool_maxsize=config.get("pool_maxsize", 10),
+        pool_block=config.get("pool_block", False),
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        keepalive=config.get("keepalive", True),
+        accept_encoding=config.get("accept_encoding")
+    )
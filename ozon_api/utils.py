@@ -1,15 +1,22 @@
+import re
 import time
 import random
+import asyncio
+from urllib.parse import urlencode
 from functools import wraps
-from typing import Callable, Optional, Any, Dict
+from typing import Callable, Optional, Any, Dict, List, Tuple
 
-from .exceptions import RateLimitError, ServerError
+from .exceptions import ConnectError, RateLimitError, ServerError
 
 
 def retry_on_failure(
     max_retries: int = 3, 
     backoff_factor: float = 1.0,
-    exceptions: tuple = (RateLimitError, ServerError)
+    exceptions: tuple = (RateLimitError, ServerError),
+    max_elapsed: Optional[float] = None,
+    on_retry: Optional[Callable[[int, Exception, float], None]] = None,
+    deadline: Optional[Callable[[], Optional[float]]] = None,
+    retry_if: Optional[Callable[[Exception], bool]] = None
 ) -> Callable:
     """
     重试装饰器，用于处理临时错误
@@ -18,25 +25,159 @@ def retry_on_failure(
         max_retries: 最大重试次数
         backoff_factor: 退避因子，每次重试的等待时间会增加
         exceptions: 需要重试的异常类型
+        max_elapsed: 单次调用（含所有重试和等待）的总时间预算，超出预算时不再重试
+        on_retry: 每次重试等待之前调用 on_retry(第几次重试, 异常, 等待秒数)
+        deadline: 返回本次调用截止时刻（time.monotonic()）的函数，返回 None 表示不限制；
+            等待之后会超过截止时刻时不再重试
+        retry_if: 对 exceptions 中的异常进一步判断是否重试，返回 False 时直接抛出，
+            例如写请求只在 is_safe_to_resend 时重试
     """
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
+            start = time.monotonic()
             for attempt in range(max_retries + 1):
                 try:
                     return func(*args, **kwargs)
                 except exceptions as e:
-                    if attempt >= max_retries:
+                    if attempt >= max_retries or (retry_if is not None and not retry_if(e)):
                         raise
-                    
-                    # 计算退避时间: backoff_factor * (2 ** (attempt - 1)) + 随机延迟
-                    wait_time = backoff_factor * (2 ** attempt) + random.uniform(0, 1)
+
+                    wait_time = _retry_wait_time(e, attempt, backoff_factor)
+                    if max_elapsed is not None and time.monotonic() - start + wait_time > max_elapsed:
+                        raise
+                    until = deadline() if deadline is not None else None
+                    if until is not None and time.monotonic() + wait_time >= until:
+                        raise
+                    if on_retry is not None:
+                        on_retry(attempt + 1, e, wait_time)
                     time.sleep(wait_time)
         
         return wrapper
     return decorator
 
 
+def _retry_wait_time(error: Exception, attempt: int, backoff_factor: float) -> float:
+    """计算重试前的等待时间：优先遵循服务端的 Retry-After，否则指数退避"""
+    retry_after = getattr(error, 'retry_after', None)
+    if retry_after is not None:
+        return retry_after + random.uniform(0, 0.1)
+    # 计算退避时间: backoff_factor * (2 ** attempt) + 随机延迟
+    return backoff_factor * (2 ** attempt) + random.uniform(0, 1)
+
+
+def async_retry_on_failure(
+    max_retries: int = 3,
+    backoff_factor: float = 1.0,
+    exceptions: tuple = (RateLimitError, ServerError),
+    max_elapsed: Optional[float] = None,
+    retry_if: Optional[Callable[[Exception], bool]] = None
+) -> Callable:
+    """
+    retry_on_failure 的协程版本，等待期间不阻塞事件循环
+
+    Args:
+        max_retries: 最大重试次数
+        backoff_factor: 退避因子，每次重试的等待时间会增加
+        exceptions: 需要重试的异常类型
+        max_elapsed: 单次调用（含所有重试和等待）的总时间预算
+        retry_if: 对 exceptions 中的异常进一步判断是否重试，返回 False 时直接抛出
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs) -> Any:
+            start = time.monotonic()
+            for attempt in range(max_retries + 1):
+                try:
+                    return await func(*args, **kwargs)
+                except exceptions as e:
+                    if attempt >= max_retries or (retry_if is not None and not retry_if(e)):
+                        raise
+
+                    wait_time = _retry_wait_time(e, attempt, backoff_factor)
+                    if max_elapsed is not None and time.monotonic() - start + wait_time > max_elapsed:
+                        raise
+                    await asyncio.sleep(wait_time)
+
+        return wrapper
+    return decorator
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    把具体的接口路径归一化为模板，用于按接口统计和熔断
+
+    例如 /campaigns/12/ad_groups/34/ads 归一化为 /campaigns/{id}/ad_groups/{id}/ads
+    """
+    path = endpoint.split('?', 1)[0]
+    return re.sub(r'/\d+(?=/|$)', '/{id}', path)
+
+
+def with_query(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    把查询参数拼接到接口路径上，值为 None 的参数会被忽略
+
+    查询字符串属于请求路径的一部分，会一起参与签名和缓存键的计算。
+    """
+    query = {key: value for key, value in (params or {}).items() if value is not None}
+    if not query:
+        return endpoint
+    separator = '&' if '?' in endpoint else '?'
+    return f"{endpoint}{separator}{urlencode(query, doseq=True)}"
+
+
+def is_idempotent_request(method: str, endpoint: str) -> bool:
+    """判断请求是否只读：GET 请求以及统计查询的 POST 请求"""
+    method = method.upper()
+    return method == "GET" or (method == "POST" and endpoint.split('?', 1)[0].endswith("/stats"))
+
+
+def is_safe_to_resend(error: Exception) -> bool:
+    """
+    判断失败的请求能否重新发送而不会被服务端重复执行
+
+    只有确定请求没有被执行时才返回 True：连接阶段的网络错误（请求尚未发出）、429 限流，
+    以及带 Retry-After 的响应。读取超时、连接中断和没有 Retry-After 的 5xx 无法确定写请求
+    是否已经生效，重新发送可能重复创建。
+    """
+    return isinstance(error, (ConnectError, RateLimitError)) or getattr(error, "retry_after", None) is not None
+
+
+def split_date_range(date_from: str, date_to: str, window_days: int) -> List[Tuple[str, str]]:
+    """
+    把日期区间按 window_days 天切分为连续的子区间
+
+    例如 2025-01-01 ~ 2025-01-10 按 7 天切分为
+    [("2025-01-01", "2025-01-07"), ("2025-01-08", "2025-01-10")]
+    """
+    from datetime import date, timedelta
+
+    if window_days < 1:
+        raise ValueError(f"window_days 必须大于等于 1: {window_days}")
+
+    start = date.fromisoformat(date_from[:10])
+    end = date.fromisoformat(date_to[:10])
+    windows = []
+    while start <= end:
+        window_end = min(end, start + timedelta(days=window_days - 1))
+        windows.append((start.isoformat(), window_end.isoformat()))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+def merge_stats_responses(responses: List[Dict]) -> Dict:
+    """
+    按顺序合并多个子区间的统计响应
+
+    各响应的 stats 行依次拼接，其余字段取第一个响应中的值。
+    """
+    if not responses:
+        return {"stats": []}
+    merged = {key: value for key, value in responses[0].items() if key != "stats"}
+    merged["stats"] = [row for response in responses for row in response.get("stats", [])]
+    return merged
+
+
 def parse_iso_datetime(datetime_str: str) -> Optional[Dict]:
     """解析ISO格式的日期时间字符串"""
     if not datetime_str:
@@ -57,3 +198,33 @@ def parse_iso_datetime(datetime_str: str) -> Optional[Dict]:
         }
     except (ValueError, TypeError):
         return None
+
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """
+    解析 Retry-After 响应头
+
+    Args:
+        value: 秒数或 HTTP 日期格式的字符串
+
+    Returns:
+        需要等待的秒数，无法解析时返回 None
+    """
+    if isinstance(value, (int, float)):
+        return max(0.0, float(value))
+    if not isinstance(value, str) or not value.strip():
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        from email.utils import parsedate_to_datetime
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
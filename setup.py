@@ -23,6 +23,25 @@ setup(
         "requests>=2.25.1",
     ],
     extras_require={
+        "async": [
+            "aiohttp>=3.7",
+        ],
+        "parquet": [
+            "pyarrow>=7.0",
+        ],
+        "fast": [
+            "orjson>=3.6",
+        ],
+        "compression": [
+            "brotli>=1.0",
+            "zstandard>=0.18",
+        ],
+        "http2": [
+            "httpx[http2]>=0.23",
+        ],
+        "analytics": [
+            "numpy>=1.20",
+        ],
         "dev": [
             "pytest>=6.2.5",
             "pytest-mock>=3.6.1",
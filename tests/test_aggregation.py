@@ -0,0 +1,130 @@
+import unittest
+
+from ozon_api.models import Statistic, StatisticBatch
+
+try:
+    import numpy as np
+    from ozon_api.aggregation import Rollup, derived_metrics, rollup
+except ImportError:
+    np = None
+
+
+def make_rows(campaign_id, dates, clicks=10, impressions=100, spent=5.0, orders=1, revenue=20.0):
+    return [
+        {"date": day, "campaign_id": campaign_id, "ad_group_id": campaign_id * 10 + n % 2,
+         "clicks": clicks, "impressions": impressions, "spent": spent, "orders": orders, "revenue": revenue}
+        for n, day in enumerate(dates)
+    ]
+
+
+@unittest.skipIf(np is None, "需要 numpy")
+class TestDerivedMetrics(unittest.TestCase):
+
+    def test_ratios_and_zero_denominators(self):
+        result = derived_metrics({
+            "clicks": np.array([10, 0]),
+            "impressions": np.array([200, 0]),
+            "spent": np.array([5.0, 0.0]),
+            "orders": np.array([2, 0]),
+            "revenue": np.array([20.0, 0.0]),
+        })
+        self.assertEqual(result["ctr"][0], 0.05)
+        self.assertEqual(result["cpc"][0], 0.5)
+        self.assertEqual(result["cr"][0], 0.2)
+        self.assertEqual(result["roas"][0], 4.0)
+        self.assertTrue(all(np.isnan(result[name][1]) for name in result))
+
+    def test_missing_inputs_are_skipped(self):
+        self.assertEqual(set(derived_metrics({"clicks": np.array([1]), "impressions": np.array([2])})), {"ctr"})
+
+
+@unittest.skipIf(np is None, "需要 numpy")
+class TestRollup(unittest.TestCase):
+
+    def setUp(self):
+        self.batch = StatisticBatch.from_rows(
+            make_rows(1, ["2025-06-01", "2025-06-02", "2025-06-02"])
+            + make_rows(2, ["2025-06-02"], clicks=4, impressions=40, spent=2.0, orders=0, revenue=0.0)
+        )
+
+    def test_group_by_campaign_and_day(self):
+        data = rollup(self.batch, by=["campaign_id"], period="day").to_dict()
+        self.assertEqual(data["campaign_id"], [1, 1, 2])
+        self.assertEqual(data["day"], ["2025-06-01", "2025-06-02", "2025-06-02"])
+        self.assertEqual(data["clicks"], [10, 20, 4])
+        self.assertEqual(data["spent"], [5.0, 10.0, 2.0])
+        self.assertEqual(data["ctr"], [0.1, 0.1, 0.1])
+        self.assertEqual(data["roas"], [4.0, 4.0, 0.0])
+
+    def test_week_and_total_periods(self):
+        # 2025-06-01 是周日，2025-06-02 是周一，属于不同的周
+        weekly = rollup(self.batch, by=[], period="week").to_dict()
+        self.assertEqual(weekly["week"], ["2025-05-26", "2025-06-02"])
+        self.assertEqual(weekly["clicks"], [10, 24])
+
+        total = rollup(self.batch, by=["campaign_id", "ad_group_id"], period=None).to_dict()
+        self.assertEqual(total["ad_group_id"], [10, 11, 20])
+        self.assertEqual(total["orders"], [2, 1, 0])
+
+    def test_incremental_update_touches_only_new_groups(self):
+        result = Rollup(by=["campaign_id"], period="day")
+        result.add(self.batch)
+        before = result.to_numpy()
+
+        updated = result.add(StatisticBatch.from_rows(make_rows(2, ["2025-06-03"])))
+        after = result.to_numpy()
+        self.assertEqual(updated, 1)
+        self.assertEqual(len(result), 4)
+        for name in ("clicks", "spent", "revenue"):
+            np.testing.assert_array_equal(after[name][:2], before[name][:2])
+
+        # 重新拉取某一天时，先扣除旧数据再合并新数据
+        result.subtract(StatisticBatch.from_rows(make_rows(2, ["2025-06-03"])))
+        result.add(StatisticBatch.from_rows(make_rows(2, ["2025-06-03"], clicks=7)))
+        self.assertEqual(result.to_dict()["clicks"][-1], 7)
+
+    def test_matches_full_recompute(self):
+        rng = np.random.default_rng(0)
+        rows = [
+            {"date": f"2025-06-{day:02d}", "campaign_id": int(rng.integers(1, 5)),
+             "clicks": int(rng.integers(0, 50)), "impressions": int(rng.integers(50, 500)),
+             "spent": float(rng.random() * 10), "orders": int(rng.integers(0, 3)), "revenue": float(rng.random() * 50)}
+            for day in range(1, 29) for _ in range(5)
+        ]
+        incremental = Rollup(by=["campaign_id"], period="week")
+        for start in range(0, len(rows), 5):
+            incremental.add(StatisticBatch.from_rows(rows[start:start + 5]))
+        full = rollup(StatisticBatch.from_rows(rows), by=["campaign_id"], period="week").to_numpy()
+        for name, column in incremental.to_numpy().items():
+            np.testing.assert_allclose(column, full[name])
+
+    def test_statistic_objects_and_missing_values(self):
+        statistics = [
+            Statistic("2025-06-01", clicks=3, impressions=30, campaign_id=7),
+            Statistic("2025-06-01", clicks=2, impressions=20, campaign_id=7),
+        ]
+        data = rollup(statistics, period=None).to_dict()
+        self.assertEqual(data["clicks"], [5])
+        self.assertEqual(data["ctr"], [0.1])
+
+        batch = StatisticBatch.from_rows([{"date": "2025-06-01", "campaign_id": 1, "clicks": 1, "spent": None}])
+        self.assertEqual(rollup(batch).to_dict()["spent"], [0.0])
+
+        # 缺失的计数按 0 汇总
+        batch = StatisticBatch.from_rows([
+            {"date": "2025-06-01", "campaign_id": 1, "clicks": 1},
+            {"date": "2025-06-01", "campaign_id": 1, "clicks": None},
+        ])
+        self.assertEqual(rollup(batch).to_dict()["clicks"], [1])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            Rollup(by=["date"])
+        with self.assertRaises(ValueError):
+            Rollup(period="month")
+        with self.assertRaises(ValueError):
+            rollup(StatisticBatch.from_rows([{"date": "2025-06-01", "clicks": 1}]), by=["ad_id"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+import asyncio
+import configparser
+import os
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+except ImportError:
+    web = None
+
+from ozon_api.exceptions import OzonAPIError
+
+
+@unittest.skipIf(web is None, "需要安装 aiohttp")
+class TestAsyncOzonAPIClient(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        from ozon_api.async_client import AsyncOzonAPIClient
+
+        config = configparser.ConfigParser()
+        config['ozon_api'] = {
+            'client_id': 'test_client_id',
+            'api_key': 'test_api_key',
+            'max_retries': '1',
+            'backoff_factor': '0'
+        }
+        with open('test_async_config.ini', 'w') as configfile:
+            config.write(configfile)
+
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.received_headers = []
+
+        async def campaigns(request):
+            self.received_headers.append(request.headers)
+            return web.json_response({"campaigns": [{"id": 1, "name": "Test Campaign"}]})
+
+        async def ad_stats(request):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            body = await request.json()
+            return web.json_response({"ad_id": int(request.match_info['ad_id']), "metrics": body["metrics"]})
+
+        self.ads_queries = []
+
+        async def ads(request):
+            # 广告活动 2 总是返回 503；其余每页 2 个广告，共 5 个
+            self.ads_queries.append(dict(request.query))
+            if request.match_info['cid'] == '2':
+                return web.Response(status=503, text="Unavailable")
+            offset = int(request.query.get('page_token', 0))
+            items = [{"id": n, "status": request.query.get('status')} for n in range(offset, min(offset + 2, 5))]
+            page = {"ads": items}
+            if offset + 2 < 5:
+                page["next_page_token"] = str(offset + 2)
+            return web.json_response(page)
+
+        async def bad_request(request):
+            return web.Response(status=400, text="Bad Request")
+
+        app = web.Application()
+        app.router.add_get('/api/v1/campaigns', campaigns)
+        app.router.add_post('/api/v1/campaigns/{cid}/ad_groups/{gid}/ads/{ad_id}/stats', ad_stats)
+        app.router.add_get('/api/v1/campaigns/{cid}/ad_groups', bad_request)
+        app.router.add_get('/api/v1/campaigns/{cid}/ad_groups/{gid}/ads', ads)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        self.client = AsyncOzonAPIClient(
+            'test_async_config.ini',
+            base_url=str(self.server.make_url('/api/v1')),
+            max_concurrency=5
+        )
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+        if os.path.exists('test_async_config.ini'):
+            os.remove('test_async_config.ini')
+
+    async def test_get_campaigns(self):
+        campaigns = await self.client.get_campaigns()
+
+        self.assertEqual(len(campaigns), 1)
+        self.assertEqual(campaigns[0]["name"], "Test Campaign")
+        headers = self.received_headers[0]
+        self.assertEqual(headers["Client-Id"], 'test_client_id')
+        self.assertEqual(headers["Api-Key"], 'test_api_key')
+        self.assertIn("X-Signature", headers)
+
+    async def test_concurrency_is_bounded(self):
+        results = await asyncio.gather(*[
+            self.client.get_ad_stats(1, 2, ad_id, "2025-06-01", "2025-06-02", ["clicks"])
+            for ad_id in range(30)
+        ])
+
+        self.assertEqual([r["ad_id"] for r in results], list(range(30)))
+        self.assertLessEqual(self.max_in_flight, 5)
+        self.assertGreater(self.max_in_flight, 1)
+
+    async def test_ads_follow_page_tokens_with_filters(self):
+        ads = await self.client.get_ads(1, 3, {"status": "active"})
+
+        self.assertEqual([ad["id"] for ad in ads], list(range(5)))
+        self.assertTrue(all(ad["status"] == "active" for ad in ads))
+        self.assertEqual([query.get("page_token") for query in self.ads_queries], [None, "2", "4"])
+
+        first = []
+        async for ad in self.client.iter_ads(1, 3, page_size=2):
+            first.append(ad)
+            break
+        self.assertEqual(first[0]["id"], 0)
+        self.assertEqual(self.ads_queries[3]["page_size"], "2")
+
+    async def test_retries_follow_config(self):
+        self.assertEqual((self.client.max_retries, self.client.backoff_factor), (1, 0.0))
+        with self.assertRaises(OzonAPIError) as ctx:
+            await self.client.get_ads(2, 1)
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertEqual(len(self.ads_queries), 2)
+
+    async def test_api_error(self):
+        with self.assertRaises(OzonAPIError) as ctx:
+            await self.client.get_ad_groups(1)
+        self.assertEqual(ctx.exception.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
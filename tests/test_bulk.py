@@ -0,0 +1,113 @@
+import unittest
+import os
+import random
+import tempfile
+import threading
+import time
+
+from ozon_api.bulk import run_bulk
+from ozon_api.client import OzonAPIClient
+from ozon_api.exceptions import ConnectError, InvalidRequestError, NetworkError, ServerError
+from ozon_api.testing import MockOzonServer
+
+CONFIG = """
+[ozon_api]
+client_id = test_client_id
+api_key = test_api_key
+"""
+
+
+class TestRunBulk(unittest.TestCase):
+
+    def test_results_keep_input_order(self):
+        def operation(n):
+            time.sleep(random.uniform(0, 0.005))
+            return n * 2
+
+        report = run_bulk(operation, iter(range(50)), concurrency=8)
+        self.assertEqual(report.values, [n * 2 for n in range(50)])
+        self.assertEqual(len(report.failed), 0)
+
+    def test_failures_are_isolated_and_retried(self):
+        calls = []
+        lock = threading.Lock()
+        flaky = {3, 7}
+
+        def operation(n):
+            with lock:
+                calls.append(n)
+                if n in flaky:
+                    flaky.discard(n)
+                    raise ServerError("temporary")
+            return n
+
+        report = run_bulk(operation, range(10), concurrency=4)
+        self.assertEqual([result.index for result in report.failed], [3, 7])
+        self.assertIsNone(report[3].value)
+        with self.assertRaises(ServerError):
+            report.raise_for_errors()
+
+        calls.clear()
+        report.retry_failed()
+        self.assertEqual(sorted(calls), [3, 7])
+        self.assertEqual(report.values, list(range(10)))
+
+    def test_uncertain_writes_are_not_retried(self):
+        calls = []
+        errors = {1: NetworkError("read timeout"), 2: ConnectError("refused"), 3: InvalidRequestError("bad")}
+
+        def operation(n):
+            calls.append(n)
+            error = errors.pop(n, None)
+            if error is not None:
+                raise error
+            return n
+
+        report = run_bulk(operation, range(5), concurrency=1, idempotent=False)
+        self.assertEqual([result.uncertain for result in report.failed], [True, False, False])
+
+        calls.clear()
+        report.retry_failed()
+        # 读取超时的条目可能已经创建，默认不重新发送
+        self.assertEqual(sorted(calls), [2, 3])
+        self.assertEqual([result.index for result in report.failed], [1])
+
+        report.retry_failed(include_uncertain=True)
+        self.assertEqual(report.values, list(range(5)))
+
+    def test_other_exceptions_propagate(self):
+        def operation(n):
+            raise KeyError(n)
+
+        with self.assertRaises(KeyError):
+            run_bulk(operation, range(3))
+
+
+class TestClientBulk(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.config_file = tempfile.mkstemp(suffix=".ini")
+        with os.fdopen(fd, 'w') as f:
+            f.write(CONFIG)
+
+    def tearDown(self):
+        os.remove(self.config_file)
+
+    def test_bulk_create_against_mock_server(self):
+        with MockOzonServer(latency=0.005) as server:
+            client = OzonAPIClient(self.config_file, base_url=server.base_url)
+            campaigns = client.create_campaigns_bulk(({"name": f"C{n}"} for n in range(20)), concurrency=5)
+            ad_groups = client.create_ad_groups_bulk(1, [{"name": "G1"}, {}, {"name": "G3"}], concurrency=2)
+            ads = client.create_ads_bulk(1, 1001, [{"title": "A1"}, {"title": "A2"}])
+
+        self.assertEqual([c["name"] for c in campaigns.values], [f"C{n}" for n in range(20)])
+        self.assertEqual(len({c["id"] for c in campaigns.values}), 20)
+        self.assertEqual([result.ok for result in ad_groups], [True, False, True])
+        self.assertIsInstance(ad_groups[1].error, InvalidRequestError)
+        self.assertEqual(ad_groups[2].value["campaign_id"], 1)
+        self.assertEqual([ad["ad_group_id"] for ad in ads.values], [1001, 1001])
+        self.assertEqual(server.requests["POST /campaigns"], 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
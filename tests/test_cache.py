@@ -0,0 +1,73 @@
+import unittest
+import os
+import tempfile
+import time
+
+from ozon_api.cache import MemoryCache, DiskCache
+
+
+class TestMemoryCache(unittest.TestCase):
+
+    def test_hit_miss_and_lru_eviction(self):
+        cache = MemoryCache(maxsize=2, ttl=60)
+        key_a = cache.make_key("GET", "/campaigns")
+        key_b = cache.make_key("GET", "/campaigns/1/ad_groups")
+        key_c = cache.make_key("GET", "/campaigns/2/ad_groups")
+
+        self.assertIsNone(cache.lookup(key_a))
+        cache.store(key_a, {"campaigns": []})
+        cache.store(key_b, {"ad_groups": []})
+        self.assertEqual(cache.lookup(key_a).value, {"campaigns": []})
+
+        # key_b 最久未使用，被淘汰
+        cache.store(key_c, {"ad_groups": [1]})
+        self.assertIsNone(cache.lookup(key_b))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats.to_dict()["evictions"], 1)
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(cache.stats.misses, 2)
+
+    def test_expiry_keeps_validators(self):
+        cache = MemoryCache(ttl=0.01)
+        key = cache.make_key("GET", "/campaigns")
+        cache.store(key, {"campaigns": []}, {"ETag": '"v1"'})
+        time.sleep(0.02)
+
+        entry = cache.lookup(key)
+        self.assertFalse(cache.is_fresh(entry))
+        self.assertEqual(entry.validators(), {"If-None-Match": '"v1"'})
+
+        cache.revalidated(key, entry)
+        self.assertTrue(cache.is_fresh(cache.lookup(key)))
+        self.assertEqual(cache.stats.revalidations, 1)
+
+    def test_invalidate_prefix(self):
+        cache = MemoryCache()
+        cache.store(cache.make_key("GET", "/campaigns"), {})
+        cache.store(cache.make_key("GET", "/campaigns/1/ad_groups"), {})
+        cache.store(cache.make_key("GET", "/ads"), {})
+
+        cache.invalidate("/campaigns")
+        self.assertEqual(len(cache), 1)
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def test_persistence_and_eviction(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite")
+            cache = DiskCache(path, maxsize=2, ttl=60)
+            for i in range(3):
+                cache.store(cache.make_key("GET", f"/campaigns/{i}/ad_groups"), {"ad_groups": [i]})
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(cache.stats.evictions, 1)
+            cache.close()
+
+            reopened = DiskCache(path, ttl=60)
+            entry = reopened.lookup(reopened.make_key("GET", "/campaigns/2/ad_groups"))
+            self.assertEqual(entry.value, {"ad_groups": [2]})
+            reopened.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
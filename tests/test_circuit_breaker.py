@@ -0,0 +1,54 @@
+import unittest
+import time
+
+from ozon_api.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from ozon_api.exceptions import CircuitOpenError
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+        for _ in range(3):
+            breaker.before_call("/campaigns")
+            breaker.record_failure("/campaigns")
+
+        self.assertEqual(breaker.state("/campaigns"), OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call("/campaigns")
+        self.assertEqual(breaker.state("/campaigns/{id}/stats"), CLOSED)
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure("/campaigns")
+        breaker.record_success("/campaigns")
+        breaker.record_failure("/campaigns")
+
+        self.assertEqual(breaker.state("/campaigns"), CLOSED)
+
+    def test_half_open_allows_single_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+        breaker.record_failure("/campaigns")
+        time.sleep(0.06)
+
+        breaker.before_call("/campaigns")
+        self.assertEqual(breaker.state("/campaigns"), HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call("/campaigns")
+
+        breaker.record_success("/campaigns")
+        self.assertEqual(breaker.state("/campaigns"), CLOSED)
+        breaker.before_call("/campaigns")
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+        breaker.record_failure("/campaigns")
+        time.sleep(0.06)
+
+        breaker.before_call("/campaigns")
+        breaker.record_failure("/campaigns")
+        self.assertEqual(breaker.state("/campaigns"), OPEN)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,26 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, PropertyMock
 import json
 import configparser
 import os
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
 
 from ozon_api.client import OzonAPIClient
-from ozon_api.exceptions import OzonAPIError
+from ozon_api.config import Config
+from ozon_api.exceptions import (
+    OzonAPIError, AuthenticationError, RateLimitError, ServerError, NetworkError, ConnectError, CircuitOpenError
+)
+from ozon_api.circuit_breaker import CircuitBreaker
+from ozon_api.models import Statistic, StatisticBatch
+from ozon_api.cache import MemoryCache
+from ozon_api.hedging import HedgePolicy
+from ozon_api.testing import MockOzonServer
+from ozon_api.utils import split_date_range
 
 
 class TestOzonAPIClient(unittest.TestCase):
@@ -32,7 +47,7 @@ class TestOzonAPIClient(unittest.TestCase):
         # 模拟API响应
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"campaigns": [{"id": 1, "name": "Test Campaign"}]}
+        mock_response.content = json.dumps({"campaigns": [{"id": 1, "name": "Test Campaign"}]}).encode()
         mock_get.return_value = mock_response
 
         # 调用方法
@@ -56,7 +71,7 @@ class TestOzonAPIClient(unittest.TestCase):
         # 模拟API响应
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": 1, "name": "Test Campaign"}
+        mock_response.content = json.dumps({"id": 1, "name": "Test Campaign"}).encode()
         mock_post.return_value = mock_response
 
         # 测试数据
@@ -73,8 +88,15 @@ class TestOzonAPIClient(unittest.TestCase):
         args, kwargs = mock_post.call_args
         self.assertEqual(args[0], "https://performance.ozon.ru/api/v1/campaigns")
         self.assertIn("headers", kwargs)
-        self.assertIn("json", kwargs)
-        self.assertEqual(kwargs["json"], campaign_data)
+        self.assertIn("data", kwargs)
+        self.assertEqual(json.loads(kwargs["data"]), campaign_data)
+
+        # 签名基于实际发送的字节串
+        headers = kwargs["headers"]
+        expected = self.client._generate_signature(
+            "POST", args[0], kwargs["data"], headers["X-Timestamp"]
+        )
+        self.assertEqual(headers["X-Signature"], expected)
 
     @patch('requests.Session.get')
     def test_api_error(self, mock_get):
@@ -89,6 +111,309 @@ class TestOzonAPIClient(unittest.TestCase):
         with self.assertRaises(OzonAPIError):
             self.client.get_campaigns()
 
+    @patch('requests.Session.get')
+    def test_rate_limiter(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {"Retry-After": "2"}
+        mock_response.content = b'{"campaigns": []}'
+        mock_get.return_value = mock_response
+
+        limiter = MagicMock()
+        self.client.rate_limiter = limiter
+        self.client.get_campaigns()
+
+        limiter.acquire.assert_called_once_with('test_client_id')
+        limiter.on_retry_after.assert_called_once_with('test_client_id', 2.0)
+
+    def _response(self, status_code, payload=None, headers=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.headers = headers or {}
+        response.text = "error" if status_code >= 400 else ""
+        response.content = json.dumps(payload).encode() if payload is not None else b""
+        return response
+
+    @patch('time.sleep')
+    @patch('requests.Session.get')
+    def test_rate_limit_is_retried_after_retry_after(self, mock_get, mock_sleep):
+        mock_get.side_effect = [
+            self._response(429, headers={"Retry-After": "2"}),
+            self._response(200, {"campaigns": [{"id": 1}]})
+        ]
+
+        campaigns = self.client.get_campaigns()
+
+        self.assertEqual(campaigns, [{"id": 1}])
+        self.assertEqual(mock_get.call_count, 2)
+        wait_time = mock_sleep.call_args[0][0]
+        self.assertGreaterEqual(wait_time, 2.0)
+        self.assertLess(wait_time, 2.2)
+
+    @patch('requests.Session.get')
+    def test_authentication_error_is_not_retried(self, mock_get):
+        mock_get.return_value = self._response(401)
+
+        with self.assertRaises(AuthenticationError) as ctx:
+            self.client.get_campaigns()
+        self.assertEqual(ctx.exception.status_code, 401)
+        mock_get.assert_called_once()
+
+    @patch('requests.Session.get')
+    def test_retry_budget(self, mock_get):
+        mock_get.return_value = self._response(503, headers={"Retry-After": "0.2"})
+        self.client.retry_budget = 0.3
+
+        with self.assertRaises(ServerError):
+            self.client.get_campaigns()
+        # 第二次等待会超出 0.3 秒的预算，因此只重试一次
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch('time.sleep')
+    @patch('requests.Session.post')
+    def test_timed_out_write_is_not_resent(self, mock_post, mock_sleep):
+        # 读取超时时服务端可能已经创建了广告活动，重新发送会产生重复的对象
+        mock_post.side_effect = requests.exceptions.ReadTimeout("Read timed out")
+        with self.assertRaises(NetworkError) as ctx:
+            self.client.create_campaign({"name": "C1"})
+        self.assertNotIsInstance(ctx.exception, ConnectError)
+        mock_post.assert_called_once()
+
+        # 没有 Retry-After 的 5xx 同样无法确定是否已经生效
+        mock_post.reset_mock()
+        mock_post.side_effect = None
+        mock_post.return_value = self._response(502)
+        with self.assertRaises(ServerError):
+            self.client.create_campaign({"name": "C1"})
+        mock_post.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch('time.sleep')
+    @patch('requests.Session.post')
+    def test_write_is_retried_when_not_sent(self, mock_post, mock_sleep):
+        refused = NewConnectionError(None, "Connection refused")
+        mock_post.side_effect = [
+            requests.exceptions.ConnectionError(MaxRetryError(None, "/campaigns", refused)),
+            self._response(429),
+            self._response(200, {"id": 1, "name": "C1"})
+        ]
+        self.assertEqual(self.client.create_campaign({"name": "C1"}), {"id": 1, "name": "C1"})
+        self.assertEqual(mock_post.call_count, 3)
+
+    @patch('time.sleep')
+    @patch('requests.Session.get')
+    def test_circuit_breaker_fails_fast(self, mock_get, mock_sleep):
+        mock_get.return_value = self._response(500)
+        self.client.circuit_breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+
+        with self.assertRaises(CircuitOpenError):
+            self.client.get_campaigns()
+        self.assertEqual(mock_get.call_count, 2)
+
+        # 同一接口直接失败，不再发出请求
+        with self.assertRaises(CircuitOpenError):
+            self.client.get_campaigns()
+        self.assertEqual(mock_get.call_count, 2)
+
+        # 其他接口不受影响
+        mock_get.return_value = self._response(200, {"ad_groups": []})
+        self.assertEqual(self.client.get_ad_groups(1), [])
+
+    @patch('requests.Session.get')
+    def test_half_open_trial_is_released_when_call_ends_without_outcome(self, mock_get):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01)
+        self.client.circuit_breaker = breaker
+        breaker.record_failure("/campaigns")
+        time.sleep(0.02)
+
+        # 试探请求在读取错误响应的正文时中断，没有得到结果
+        broken = self._response(500)
+        type(broken).text = PropertyMock(side_effect=RuntimeError("connection reset"))
+        mock_get.return_value = broken
+        with self.assertRaises(RuntimeError):
+            self.client.get_campaigns()
+        self.assertEqual(breaker.state("/campaigns"), "half_open")
+
+        # 试探名额已经归还，下一个请求可以继续试探并恢复
+        mock_get.return_value = self._response(200, {"campaigns": []})
+        self.assertEqual(self.client.get_campaigns(), [])
+        self.assertEqual(breaker.state("/campaigns"), "closed")
+
+    @patch('ozon_api.client.compress', side_effect=ValueError("unsupported encoding"))
+    @patch('requests.Session.post')
+    def test_failed_request_preparation_does_not_take_trial(self, mock_post, mock_compress):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01)
+        self.client.circuit_breaker = breaker
+        self.client.request_compression = "gzip"
+        self.client.request_compression_min_size = 0
+        breaker.record_failure("/campaigns")
+        time.sleep(0.02)
+
+        with self.assertRaises(ValueError):
+            self.client.create_campaign({"name": "C1"})
+        mock_post.assert_not_called()
+
+        self.client.request_compression = None
+        mock_post.return_value = self._response(200, {"id": 1})
+        self.assertEqual(self.client.create_campaign({"name": "C1"}), {"id": 1})
+        self.assertEqual(breaker.state("/campaigns"), "closed")
+
+    @patch('requests.Session.post')
+    def test_get_ad_stats_with_coalescing(self, mock_post):
+        mock_post.return_value = self._response(200, {"stats": [
+            {"ad_id": 3, "date": "2025-06-01", "clicks": 5},
+            {"ad_id": 4, "date": "2025-06-01", "clicks": 7}
+        ]})
+        self.client.enable_stats_coalescing(window=0.01)
+        try:
+            stats = self.client.get_ad_stats(1, 2, 3, "2025-06-01", "2025-06-01", ["clicks"])
+        finally:
+            self.client.stats_coalescer.close()
+
+        self.assertEqual(stats, {"stats": [{"ad_id": 3, "date": "2025-06-01", "clicks": 5}]})
+        args, kwargs = mock_post.call_args
+        self.assertEqual(args[0], "https://performance.ozon.ru/api/v1/ads/stats")
+
+    @patch('requests.Session.post')
+    @patch('requests.Session.get')
+    def test_cached_listing(self, mock_get, mock_post):
+        mock_get.return_value = self._response(200, {"campaigns": [{"id": 1}]}, {"ETag": '"v1"'})
+        mock_post.return_value = self._response(200, {"id": 2})
+        self.client.cache = MemoryCache(ttl=60)
+
+        self.assertEqual(self.client.get_campaigns(), [{"id": 1}])
+        self.assertEqual(self.client.get_campaigns(), [{"id": 1}])
+        mock_get.assert_called_once()
+
+        # 写操作使缓存失效
+        self.client.create_campaign({"name": "New"})
+        self.client.get_campaigns()
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch('requests.Session.get')
+    def test_cache_revalidation(self, mock_get):
+        mock_get.side_effect = [
+            self._response(200, {"campaigns": [{"id": 1}]}, {"ETag": '"v1"'}),
+            self._response(304)
+        ]
+        self.client.cache = MemoryCache(ttl=0)
+
+        self.client.get_campaigns()
+        self.assertEqual(self.client.get_campaigns(), [{"id": 1}])
+
+        headers = mock_get.call_args[1]["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(self.client.cache.stats.revalidations, 1)
+
+    @patch('requests.Session.post')
+    def test_stats_are_split_into_windows(self, mock_post):
+        def respond(url, headers=None, data=None, **kwargs):
+            body = json.loads(data)
+            if body["date_from"] == "2025-06-08":
+                time.sleep(0.05)
+            return self._response(200, {"stats": [{"date": body["date_from"]}, {"date": body["date_to"]}]})
+        mock_post.side_effect = respond
+        self.client.stats_window_days = 7
+
+        stats = self.client.get_campaign_stats(1, "2025-06-01", "2025-06-20", ["clicks"])
+
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual([row["date"] for row in stats["stats"]], [
+            "2025-06-01", "2025-06-07", "2025-06-08", "2025-06-14", "2025-06-15", "2025-06-20"
+        ])
+
+    @patch('requests.Session.post')
+    def test_iter_campaign_stats_streams_rows(self, mock_post):
+        data = json.dumps({"stats": [{"date": f"2025-06-{day:02d}", "clicks": day} for day in range(1, 6)]}).encode()
+        response = self._response(200, {})
+        response.iter_content.side_effect = lambda chunk_size: iter([data[i:i + 4] for i in range(0, len(data), 4)])
+        mock_post.return_value = response
+
+        rows = list(self.client.iter_campaign_stats(1, "2025-06-01", "2025-06-05", ["clicks"]))
+
+        self.assertTrue(mock_post.call_args[1]["stream"])
+        self.assertIsInstance(rows[0], Statistic)
+        self.assertEqual([row.clicks for row in rows], [1, 2, 3, 4, 5])
+        self.assertEqual(rows[0].campaign_id, 1)
+        response.close.assert_called_once()
+
+        batches = list(self.client.iter_campaign_stats(1, "2025-06-01", "2025-06-05", ["clicks"], batch_size=2))
+        self.assertTrue(all(isinstance(batch, StatisticBatch) for batch in batches))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+
+    @patch('requests.Session.get')
+    def test_iter_campaigns_follows_page_tokens(self, mock_get):
+        pages = {
+            None: {"campaigns": [{"id": 1}, {"id": 2}], "next_page_token": "p2"},
+            "p2": {"campaigns": [{"id": 3}], "next_page_token": "p3"},
+            "p3": {"campaigns": [{"id": 4}]},
+        }
+
+        def respond(url, headers=None, **kwargs):
+            query = parse_qs(urlparse(url).query)
+            self.assertEqual(query["state"], ["active"])
+            self.assertEqual(query["page_size"], ["2"])
+            return self._response(200, pages[query.get("page_token", [None])[0]])
+        mock_get.side_effect = respond
+
+        campaigns = self.client.iter_campaigns({"state": "active"}, page_size=2)
+        self.assertEqual(next(campaigns), {"id": 1})
+        # 消费第一页时第二页已经在后台请求
+        deadline = time.time() + 1
+        while mock_get.call_count < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(mock_get.call_count, 2)
+
+        self.assertEqual([c["id"] for c in campaigns], [2, 3, 4])
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch('requests.Session.get')
+    def test_get_campaigns_passes_filters(self, mock_get):
+        mock_get.return_value = self._response(200, {"campaigns": [{"id": 1}]})
+
+        self.assertEqual(self.client.get_campaigns({"state": "active"}), [{"id": 1}])
+        self.assertTrue(mock_get.call_args[0][0].endswith("/campaigns?state=active"))
+
+    def test_accepts_loaded_config(self):
+        config = Config('test_config.ini')
+        config["max_retries"] = 7
+        with patch('ozon_api.config._parse_file') as parse:
+            client = OzonAPIClient(config)
+        parse.assert_not_called()
+        self.assertEqual((client.client_id, client.api_key), ('test_client_id', 'test_api_key'))
+        self.assertEqual(client.max_retries, 7)
+
+        with self.assertRaises(ValueError):
+            OzonAPIClient(Config(None))
+
+    def test_close_stops_background_threads(self):
+        def ozon_threads():
+            return [thread for thread in threading.enumerate() if thread.name.startswith("ozon-")]
+
+        before = set(ozon_threads())
+        with MockOzonServer(campaigns=2, page_size=1) as server:
+            with OzonAPIClient('test_config.ini', base_url=server.base_url, stats_window_days=1,
+                               hedging=HedgePolicy()) as client:
+                client.enable_stats_coalescing(window=0.01)
+                client.get_ad_stats(1, 1001, 1001001, "2025-06-01", "2025-06-02", ["clicks"])
+                client.get_campaign_stats(1, "2025-06-01", "2025-06-03", ["clicks"])
+                self.assertEqual(len(list(client.iter_campaigns())), 2)
+                client._get_hedge_executor().submit(lambda: None).result()
+                self.assertGreater(len(set(ozon_threads()) - before), 0)
+
+        self.assertEqual([thread for thread in ozon_threads() if thread not in before], [])
+
+    def test_split_date_range(self):
+        self.assertEqual(split_date_range("2025-06-01", "2025-06-03", 7), [("2025-06-01", "2025-06-03")])
+        self.assertEqual(split_date_range("2025-06-01", "2025-06-10", 5), [
+            ("2025-06-01", "2025-06-05"), ("2025-06-06", "2025-06-10")
+        ])
+        for window_days in (0, -1):
+            with self.assertRaises(ValueError):
+                split_date_range("2025-06-01", "2025-06-10", window_days)
+            with self.assertRaises(ValueError):
+                OzonAPIClient('test_config.ini', stats_window_days=window_days)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,80 @@
+import unittest
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ozon_api.coalescer import StatsCoalescer
+from ozon_api.exceptions import ServerError
+
+
+class FakeClient:
+    """记录合并后的请求，按请求中的广告返回统计行"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.lock = threading.Lock()
+        self.requests = []
+
+    def _make_request(self, method, endpoint, body=None):
+        with self.lock:
+            self.requests.append((method, endpoint, body))
+        if self.error:
+            raise self.error
+        return {"stats": [{"ad_id": ad["ad_id"], "clicks": ad["ad_id"] * 2} for ad in body["ads"]]}
+
+
+class TestStatsCoalescer(unittest.TestCase):
+
+    def test_requests_are_batched_and_split(self):
+        client = FakeClient()
+        coalescer = StatsCoalescer(client, window=0.05, max_batch=100)
+
+        futures = [coalescer.submit(1, 2, ad_id, "2025-06-01", "2025-06-02", ["clicks"]) for ad_id in range(20)]
+        results = [f.result(timeout=1) for f in futures]
+        coalescer.close()
+
+        self.assertEqual(len(client.requests), 1)
+        method, endpoint, body = client.requests[0]
+        self.assertEqual((method, endpoint), ("POST", "/ads/stats"))
+        self.assertEqual(len(body["ads"]), 20)
+        for ad_id, result in enumerate(results):
+            self.assertEqual(result, {"stats": [{"ad_id": ad_id, "clicks": ad_id * 2}]})
+
+    def test_groups_by_date_range_and_size_cap(self):
+        client = FakeClient()
+        coalescer = StatsCoalescer(client, window=0.05, max_batch=5)
+
+        futures = [coalescer.submit(1, 2, ad_id, "2025-06-01", "2025-06-02", ["clicks"]) for ad_id in range(10)]
+        futures.append(coalescer.submit(1, 2, 99, "2025-06-03", "2025-06-03", ["clicks"]))
+        for f in futures:
+            f.result(timeout=1)
+        coalescer.close()
+
+        sizes = sorted(len(body["ads"]) for _, _, body in client.requests)
+        self.assertEqual(sizes, [1, 5, 5])
+
+    def test_error_is_propagated_to_every_future(self):
+        coalescer = StatsCoalescer(FakeClient(error=ServerError("down")), window=0.01)
+
+        futures = [coalescer.submit(1, 2, ad_id, "2025-06-01", "2025-06-02", ["clicks"]) for ad_id in range(3)]
+        for f in futures:
+            with self.assertRaises(ServerError):
+                f.result(timeout=1)
+        coalescer.close()
+
+    def test_concurrent_callers(self):
+        client = FakeClient()
+        coalescer = StatsCoalescer(client, window=0.05)
+
+        def call(ad_id):
+            return coalescer.submit(1, 2, ad_id, "2025-06-01", "2025-06-02", ["clicks"]).result(timeout=1)
+
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            results = list(pool.map(call, range(10)))
+        coalescer.close()
+
+        self.assertEqual([r["stats"][0]["ad_id"] for r in results], list(range(10)))
+        self.assertLessEqual(len(client.requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
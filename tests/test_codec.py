@@ -0,0 +1,53 @@
+import unittest
+import hashlib
+import hmac
+
+from ozon_api.codec import StdlibJSONCodec, get_codec
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class TestCodecs(unittest.TestCase):
+
+    def _check(self, codec):
+        data = {"name": "Кампания", "metrics": ["clicks", "spent"], "bid": 1.5}
+        encoded = codec.dumps(data)
+
+        self.assertIsInstance(encoded, bytes)
+        self.assertNotIn(b" ", encoded.replace("Кампания".encode(), b""))
+        self.assertIn("Кампания".encode(), encoded)
+        self.assertEqual(codec.loads(encoded), data)
+        self.assertEqual(codec.loads(encoded.decode()), data)
+
+    def test_stdlib(self):
+        self._check(StdlibJSONCodec())
+
+    @unittest.skipIf(orjson is None, "需要 orjson")
+    def test_orjson(self):
+        codec = get_codec()
+        self.assertEqual(codec.name, "orjson")
+        self._check(codec)
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            get_codec("ujson")
+
+    def test_signature_covers_exact_bytes(self):
+        from ozon_api.client import OzonAPIClient
+
+        client = OzonAPIClient.__new__(OzonAPIClient)
+        client.base_url = "https://performance.ozon.ru/api/v1"
+        client.codec = StdlibJSONCodec()
+        client._hmac_key = hmac.new(b"secret", digestmod=hashlib.sha256)
+
+        body = client.codec.dumps({"a": 1})
+        signature = client._generate_signature("POST", client.base_url + "/campaigns", body, "1700000000")
+        expected = hmac.new(b"secret", b'1700000000POST/campaigns{"a":1}', hashlib.sha256).hexdigest()
+        self.assertEqual(signature, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
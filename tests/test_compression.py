@@ -0,0 +1,102 @@
+import unittest
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+
+from ozon_api.client import OzonAPIClient
+from ozon_api.compression import available_encodings, compress, decompress, parse_encodings
+from ozon_api.instrumentation import MetricsCollector
+from ozon_api.testing import MockOzonServer
+from ozon_api.transport import HTTPXTransport, RequestsTransport
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+CONFIG = """
+[ozon_api]
+client_id = test_client_id
+api_key = test_api_key
+"""
+
+
+class TestCompression(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.config_file = tempfile.mkstemp(suffix=".ini")
+        with os.fdopen(fd, 'w') as f:
+            f.write(CONFIG)
+
+    def tearDown(self):
+        os.remove(self.config_file)
+
+    def test_round_trip(self):
+        data = json.dumps({"stats": [{"date": "2025-06-01", "clicks": n} for n in range(200)]}).encode()
+        for encoding in available_encodings():
+            compressed = compress(data, encoding)
+            self.assertLess(len(compressed), len(data) / 5)
+            self.assertEqual(decompress(compressed, encoding), data)
+        with self.assertRaises(ValueError):
+            compress(data, "lz4")
+
+    def test_accept_encoding_header(self):
+        self.assertEqual(parse_encodings("gzip, br;q=0.8"), ["gzip", "br"])
+        transport = RequestsTransport(accept_encoding=["snappy", "gzip", "deflate"])
+        self.assertEqual(transport.session.headers["Accept-Encoding"], "gzip, deflate")
+        self.assertEqual(RequestsTransport(accept_encoding=[]).session.headers["Accept-Encoding"], "identity")
+
+    def _check_compressed_stats(self, transport):
+        collector = MetricsCollector()
+        with MockOzonServer(compress_responses=True, row_padding=200) as server:
+            client = OzonAPIClient(self.config_file, base_url=server.base_url, transport=transport)
+            client.add_hook(collector)
+            stats = client.get_campaign_stats(1, "2025-06-01", "2025-06-30", ["clicks"])
+            rows = list(client.iter_campaign_stats(1, "2025-06-01", "2025-06-30", ["clicks"]))
+            encoding = server.last_request[2].get("Accept-Encoding")
+            client.close()
+
+        self.assertEqual(len(stats["stats"]), 30)
+        self.assertEqual(len(rows), 30)
+        received = collector.bytes_total("received")
+        self.assertGreater(received, 30 * 200 * 2)
+        self.assertLess(collector.bytes_total("received", wire=True), received / 5)
+        return encoding
+
+    def test_compressed_responses_with_requests(self):
+        encoding = self._check_compressed_stats(RequestsTransport(accept_encoding=["br", "gzip"]))
+        self.assertIn("gzip", encoding)
+
+    @unittest.skipIf(httpx is None or "zstd" not in available_encodings(), "需要 httpx 和 zstandard")
+    def test_compressed_responses_with_httpx(self):
+        encoding = self._check_compressed_stats(HTTPXTransport(http2=False, accept_encoding=["zstd"]))
+        self.assertEqual(encoding, "zstd")
+
+    def test_large_write_bodies_are_compressed(self):
+        campaign = {"name": "Кампания", "keywords": ["keyword %d" % n for n in range(500)]}
+        with MockOzonServer() as server:
+            client = OzonAPIClient(
+                self.config_file, base_url=server.base_url,
+                request_compression="gzip", request_compression_min_size=1024
+            )
+            collector = MetricsCollector()
+            client.add_hook(collector)
+            client.create_campaign(campaign)
+            method, path, headers, body = server.last_request
+            client.get_campaign_stats(1, "2025-06-01", "2025-06-02", ["clicks"])
+            stats_headers = server.last_request[2]
+
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(body), campaign)
+        # 签名针对未压缩的请求体
+        message = f"{headers['X-Timestamp']}POST{path[len(server.base_path):]}".encode() + body
+        expected = hmac.new(b"test_api_key", message, hashlib.sha256).hexdigest()
+        self.assertEqual(headers["X-Signature"], expected)
+        self.assertNotIn("Content-Encoding", stats_headers)
+        self.assertLess(collector.bytes_total("sent", wire=True), collector.bytes_total("sent"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import patch
+import os
+import subprocess
+import sys
+import tempfile
+
+from ozon_api import config as config_module
+from ozon_api.config import Config
+
+
+class TestConfig(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.config_file = tempfile.mkstemp(suffix=".ini")
+        with os.fdopen(fd, 'w') as f:
+            f.write("[ozon_api]\nclient_id = first\napi_key = key\nmax_retries = 5\nhttp2 = yes\n")
+
+    def tearDown(self):
+        os.remove(self.config_file)
+
+    def test_ini_values_are_typed(self):
+        config = Config(self.config_file)
+        self.assertEqual(config["client_id"], "first")
+        self.assertEqual(config["max_retries"], 5)
+        self.assertIs(config["http2"], True)
+        # 文件中没有的配置项保留默认值
+        self.assertEqual(config["date_from"], "2023-01-01")
+
+    def test_other_extensions_are_parsed_as_ini(self):
+        fd, conf_file = tempfile.mkstemp(suffix=".conf")
+        with os.fdopen(fd, 'w') as f:
+            f.write("[ozon_api]\nclient_id = conf_client\napi_key = key\nmax_retries = 7\n")
+        try:
+            config = Config(conf_file)
+        finally:
+            os.remove(conf_file)
+        self.assertEqual(config["client_id"], "conf_client")
+        self.assertEqual(config["max_retries"], 7)
+
+    def test_unchanged_file_is_parsed_once(self):
+        Config(self.config_file)
+        with patch.object(config_module, "_parse_file", wraps=config_module._parse_file) as parse:
+            first = Config(self.config_file)
+            first["max_retries"] = 9
+            second = Config(self.config_file)
+        parse.assert_not_called()
+        self.assertEqual(second["max_retries"], 5)
+
+    def test_modified_file_is_reloaded(self):
+        Config(self.config_file)
+        with open(self.config_file, 'w') as f:
+            f.write("[ozon_api]\nclient_id = second_client\napi_key = key\n")
+        stat = os.stat(self.config_file)
+        os.utime(self.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(Config(self.config_file)["client_id"], "second_client")
+
+    def test_package_import_is_lazy(self):
+        code = "import sys, ozon_api; print('requests' in sys.modules, ozon_api.Statistic.__name__)"
+        output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+        self.assertEqual(output.split(), ["False", "Statistic"])
+
+
+if __name__ == '__main__':
+    unittest.main()
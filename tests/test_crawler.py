@@ -0,0 +1,82 @@
+import unittest
+import threading
+import time
+
+from ozon_api import crawler
+
+
+class FakeClient:
+    """按固定结构返回数据的假客户端，同时记录并发请求数"""
+
+    def __init__(self, campaigns=3, ad_groups=2, ads=4):
+        self.n_campaigns = campaigns
+        self.n_ad_groups = ad_groups
+        self.n_ads = ads
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _call(self, result):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.005)
+        with self.lock:
+            self.in_flight -= 1
+        return result
+
+    def get_campaigns(self):
+        return self._call([{"id": c, "name": f"C{c}"} for c in range(self.n_campaigns)])
+
+    def get_ad_groups(self, campaign_id):
+        return self._call([{"id": campaign_id * 10 + g, "name": f"G{g}"} for g in range(self.n_ad_groups)])
+
+    def get_ads(self, campaign_id, ad_group_id):
+        return self._call([{"id": ad_group_id * 10 + a} for a in range(self.n_ads)])
+
+    def get_campaign_stats(self, campaign_id, date_from, date_to, metrics):
+        return self._call({"clicks": campaign_id})
+
+    def get_ad_stats(self, campaign_id, ad_group_id, ad_id, date_from, date_to, metrics):
+        return self._call({"clicks": ad_id})
+
+
+class TestCrawlAccount(unittest.TestCase):
+
+    def test_crawl_yields_flattened_rows(self):
+        client = FakeClient()
+        rows = list(crawler.crawl_account(client, "2025-06-01", "2025-06-02", ["clicks"], workers=4))
+
+        kinds = [kind for kind, _ in rows]
+        self.assertEqual(kinds.count(crawler.CAMPAIGN), 3)
+        self.assertEqual(kinds.count(crawler.CAMPAIGN_STATS), 3)
+        self.assertEqual(kinds.count(crawler.AD_GROUP), 6)
+        self.assertEqual(kinds.count(crawler.AD), 24)
+        self.assertEqual(kinds.count(crawler.AD_STATS), 24)
+
+        ad_stats = [row for kind, row in rows if kind == crawler.AD_STATS]
+        for row in ad_stats:
+            self.assertEqual(row["clicks"], row["ad_id"])
+            self.assertEqual(row["ad_id"] // 10, row["ad_group_id"])
+            self.assertEqual(row["ad_group_id"] // 10, row["campaign_id"])
+
+    def test_in_flight_is_bounded(self):
+        client = FakeClient(campaigns=5, ad_groups=3, ads=5)
+        list(crawler.crawl_account(client, "2025-06-01", "2025-06-02", ["clicks"], workers=8, max_in_flight=3))
+
+        self.assertLessEqual(client.max_in_flight, 3)
+        self.assertGreater(client.max_in_flight, 1)
+
+    def test_error_propagates(self):
+        client = FakeClient()
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("boom")
+        client.get_ad_stats = broken
+
+        with self.assertRaises(RuntimeError):
+            list(crawler.crawl_account(client, "2025-06-01", "2025-06-02", ["clicks"], workers=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
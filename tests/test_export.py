@@ -0,0 +1,169 @@
+import unittest
+import csv
+import json
+import os
+import tempfile
+
+from ozon_api import crawler
+from ozon_api.export import CSVWriter, JSONLWriter, ParquetWriter, CrawlExporter
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+def _rows(n):
+    for i in range(n):
+        yield {"id": i, "name": f"row{i}", "tags": [i]}
+
+
+class TestWriters(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_csv(self):
+        path = os.path.join(self.tmp.name, "rows.csv")
+        with CSVWriter(path) as writer:
+            self.assertEqual(writer.write_rows(_rows(3)), 3)
+
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(rows[2], {"id": "2", "name": "row2", "tags": "[2]"})
+
+    def test_csv_widens_header_for_new_fields(self):
+        path = os.path.join(self.tmp.name, "rows.csv")
+        with CSVWriter(path) as writer:
+            writer.write({"id": 1, "clicks": 3})
+            writer.write({"id": 2, "clicks": 4, "spent": 1.5})
+
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(rows, [
+            {"id": "1", "clicks": "3", "spent": ""},
+            {"id": "2", "clicks": "4", "spent": "1.5"}
+        ])
+
+    def test_csv_fixed_fieldnames_reject_unknown_fields(self):
+        path = os.path.join(self.tmp.name, "rows.csv")
+        with CSVWriter(path, fieldnames=["id"]) as writer:
+            with self.assertRaises(ValueError):
+                writer.write({"id": 1, "clicks": 3})
+
+    def test_csv_append_keeps_existing_rows(self):
+        path = os.path.join(self.tmp.name, "rows.csv")
+        with CSVWriter(path) as writer:
+            writer.write({"id": 1, "clicks": 3})
+        with CSVWriter(path, append=True) as writer:
+            writer.write({"clicks": 4, "id": 2})
+
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(rows, [{"id": "1", "clicks": "3"}, {"id": "2", "clicks": "4"}])
+
+    def test_jsonl(self):
+        path = os.path.join(self.tmp.name, "rows.jsonl")
+        with JSONLWriter(path) as writer:
+            writer.write_rows(_rows(3))
+
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(rows[1], {"id": 1, "name": "row1", "tags": [1]})
+
+    @unittest.skipIf(pq is None, "需要 pyarrow")
+    def test_parquet_row_groups(self):
+        path = os.path.join(self.tmp.name, "rows.parquet")
+        with ParquetWriter(path, row_group_size=4) as writer:
+            writer.write_rows(_rows(10))
+
+        parquet_file = pq.ParquetFile(path)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+        self.assertEqual(parquet_file.read().column("id").to_pylist(), list(range(10)))
+
+    def _write_parquet(self, rows, row_group_size=2):
+        path = os.path.join(self.tmp.name, "rows.parquet")
+        with ParquetWriter(path, row_group_size=row_group_size) as writer:
+            writer.write_rows(iter(rows))
+        self.assertEqual(os.listdir(self.tmp.name), ["rows.parquet"])
+        return pq.read_table(path)
+
+    @unittest.skipIf(pq is None, "需要 pyarrow")
+    def test_parquet_int_column_widens_to_float(self):
+        table = self._write_parquet([{"a": 1}, {"a": 2}, {"a": 3.5}])
+        self.assertEqual(table.column("a").to_pylist(), [1.0, 2.0, 3.5])
+
+    @unittest.skipIf(pq is None, "需要 pyarrow")
+    def test_parquet_null_column_takes_later_type(self):
+        table = self._write_parquet([{"a": None}, {"a": None}, {"a": "x"}])
+        self.assertEqual(table.column("a").to_pylist(), [None, None, "x"])
+
+    @unittest.skipIf(pq is None, "需要 pyarrow")
+    def test_parquet_late_field_is_added(self):
+        table = self._write_parquet([{"id": 1}, {"id": 2}, {"id": 3}, {"id": 4, "extra": "x"}, {"id": 5}])
+        self.assertEqual(table.column("extra").to_pylist(), [None, None, None, "x", None])
+        self.assertEqual(table.column("id").to_pylist(), [1, 2, 3, 4, 5])
+
+    @unittest.skipIf(pq is None, "需要 pyarrow")
+    def test_parquet_declared_metric_types(self):
+        # 第一个 row group 中 spent 全为 0，仍按金额写为 float64
+        table = self._write_parquet([{"spent": 0, "clicks": 1}, {"spent": 0, "clicks": 2}, {"spent": 1.5, "clicks": 3}])
+        self.assertEqual(str(table.schema.field("spent").type), "double")
+        self.assertEqual(str(table.schema.field("clicks").type), "int64")
+        self.assertEqual(table.column("spent").to_pylist(), [0.0, 0.0, 1.5])
+
+    @unittest.skipIf(pq is None, "需要 pyarrow")
+    def test_parquet_incompatible_types_raise(self):
+        with self.assertRaises(ValueError):
+            self._write_parquet([{"a": 1}, {"a": 2}, {"a": "x"}])
+
+
+class TestCrawlExporter(unittest.TestCase):
+
+    def test_routes_by_kind_and_explodes_stats(self):
+        crawl = [
+            (crawler.CAMPAIGN, {"id": 1, "name": "C1"}),
+            (crawler.AD_STATS, {"campaign_id": 1, "ad_group_id": 2, "ad_id": 3, "stats": [
+                {"date": "2025-06-01", "clicks": 1},
+                {"date": "2025-06-02", "clicks": 2}
+            ]})
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            with CrawlExporter(tmp, format="jsonl") as exporter:
+                counts = exporter.write_all(iter(crawl))
+
+            self.assertEqual(counts, {crawler.CAMPAIGN: 1, crawler.AD_STATS: 2})
+            with open(os.path.join(tmp, "ad_stats.jsonl"), encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f]
+            self.assertEqual(rows[1], {"campaign_id": 1, "ad_group_id": 2, "ad_id": 3, "date": "2025-06-02", "clicks": 2})
+
+    def test_append_resumes_previous_export(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for n in range(2):
+                with CrawlExporter(tmp, format="jsonl", append=True) as exporter:
+                    exporter(crawler.CAMPAIGN, {"id": n})
+
+            with open(os.path.join(tmp, "campaign.jsonl"), encoding="utf-8") as f:
+                self.assertEqual([json.loads(line) for line in f], [{"id": 0}, {"id": 1}])
+
+    @unittest.skipIf(pq is None, "需要 pyarrow")
+    def test_parquet_append_writes_parts(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for n in range(3):
+                with CrawlExporter(tmp, format="parquet", append=True) as exporter:
+                    exporter(crawler.CAMPAIGN, {"id": n})
+
+            self.assertEqual(sorted(os.listdir(tmp)), ["campaign.1.parquet", "campaign.2.parquet", "campaign.parquet"])
+            self.assertEqual(pq.read_table(os.path.join(tmp, "campaign.2.parquet")).column("id").to_pylist(), [2])
+
+    def test_unknown_format(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(ValueError):
+                CrawlExporter(tmp, format="xlsx")
+
+
+if __name__ == '__main__':
+    unittest.main()
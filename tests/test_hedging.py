@@ -0,0 +1,197 @@
+import unittest
+from unittest.mock import patch
+import itertools
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from ozon_api.client import OzonAPIClient
+from ozon_api.exceptions import DeadlineExceededError, ServerError
+from ozon_api.hedging import HedgePolicy
+from ozon_api.testing import MockOzonServer
+from ozon_api.transport import Transport
+
+CONFIG = """
+[ozon_api]
+client_id = test_client_id
+api_key = test_api_key
+"""
+
+
+class TestHedgePolicy(unittest.TestCase):
+
+    def test_delay_follows_percentile(self):
+        policy = HedgePolicy(percentile=90, min_samples=10, min_delay=0.0)
+        self.assertIsNone(policy.start("/campaigns"))
+        for n in range(1, 101):
+            policy.record("/campaigns", n / 1000)
+        self.assertAlmostEqual(policy.start("/campaigns"), 0.091)
+        # 其他接口的样本不足，不对冲
+        self.assertIsNone(policy.start("/campaigns/{id}/stats"))
+
+    def test_budget_caps_hedge_ratio(self):
+        policy = HedgePolicy(max_ratio=0.125, burst=2)
+        hedges = 0
+        for _ in range(200):
+            policy.start("/campaigns")
+            hedges += policy.try_acquire()
+        self.assertEqual(hedges, 25)
+        self.assertEqual((policy.requests, policy.hedged), (200, 25))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            HedgePolicy(percentile=100)
+        with self.assertRaises(ValueError):
+            HedgePolicy(max_ratio=-1)
+
+
+class _FakeResponse:
+    status_code = 200
+    headers = {}
+    elapsed = timedelta(0)
+
+    def __init__(self):
+        self.read = False
+        self.closed = False
+
+    @property
+    def content(self):
+        self.read = True
+        return b'{"campaigns": []}'
+
+    def close(self):
+        self.closed = True
+
+
+class _SlowFirstTransport(Transport):
+    """预热之后的第一个请求（原请求）0.3 秒后才返回响应头，其余立即返回"""
+
+    def __init__(self, warmup):
+        self.warmup = warmup
+        self.responses = []
+        self._lock = threading.Lock()
+
+    def send(self, method, url, headers, data=None, stream=False, timeout=None):
+        with self._lock:
+            n = len(self.responses)
+            response = _FakeResponse()
+            self.responses.append(response)
+        if n == self.warmup:
+            time.sleep(0.3)
+        return response
+
+    def close(self):
+        pass
+
+
+class TestClientDeadlinesAndHedging(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.config_file = tempfile.mkstemp(suffix=".ini")
+        with os.fdopen(fd, 'w') as f:
+            f.write(CONFIG)
+
+    def tearDown(self):
+        os.remove(self.config_file)
+
+    def test_slow_request_is_hedged(self):
+        # 预热之后的第一个请求卡住 2 秒，其余 10 毫秒；预热请求本身也可能被对冲，
+        # 因此不按请求序号而是按阶段决定卡住哪个请求
+        stall = threading.Event()
+        counter = itertools.count()
+        latency = lambda: 2.0 if stall.is_set() and next(counter) == 0 else 0.01  # noqa: E731
+        policy = HedgePolicy(min_samples=20, max_ratio=0.2)
+        with MockOzonServer(campaigns=2, latency=latency) as server:
+            client = OzonAPIClient(self.config_file, base_url=server.base_url, hedging=policy)
+            for _ in range(25):
+                client.get_campaigns()
+            stall.set()
+            start = time.monotonic()
+            campaigns = client.get_campaigns()
+            elapsed = time.monotonic() - start
+
+        self.assertEqual(len(campaigns), 2)
+        self.assertLess(elapsed, 1.0)
+        # 预热请求的耗时抖动也可能触发对冲，只要求卡住的那次被对冲并由对冲请求返回
+        self.assertGreaterEqual(policy.wins, 1)
+        self.assertEqual(server.requests["GET /campaigns"], 26 + policy.hedged)
+
+    def test_primary_requests_do_not_queue_for_hedge_workers(self):
+        # 对冲线程池只有一个线程，但原请求不经过线程池，8 个并发调用仍然同时发出
+        policy = HedgePolicy(min_samples=1, max_ratio=0.0, workers=1)
+        with MockOzonServer(campaigns=2, latency=0.1) as server:
+            client = OzonAPIClient(self.config_file, base_url=server.base_url, hedging=policy, single_flight=False)
+            client.get_campaigns()
+            threads = [threading.Thread(target=client.get_campaigns) for _ in range(8)]
+            start = time.monotonic()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=5)
+            elapsed = time.monotonic() - start
+
+        self.assertEqual(server.requests["GET /campaigns"], 9)
+        self.assertLess(elapsed, 0.5)
+
+    def test_losing_request_is_closed_without_reading_body(self):
+        transport = _SlowFirstTransport(warmup=20)
+        policy = HedgePolicy(min_samples=20, max_ratio=1.0, min_delay=0.01)
+        with OzonAPIClient(self.config_file, transport=transport, hedging=policy, single_flight=False) as client:
+            for _ in range(20):
+                client.get_campaigns()
+            self.assertEqual(client.get_campaigns(), [])
+            self.assertEqual(policy.wins, 1)
+            primary = transport.responses[20]
+            deadline = time.monotonic() + 2
+            while not primary.closed and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.assertTrue(primary.closed)
+        self.assertFalse(primary.read)
+        self.assertTrue(transport.responses[21].read)
+
+    def test_writes_are_not_hedged(self):
+        policy = HedgePolicy(min_samples=1)
+        with MockOzonServer(latency=0.01) as server:
+            client = OzonAPIClient(self.config_file, base_url=server.base_url, hedging=policy)
+            for n in range(3):
+                client.create_campaign({"name": f"C{n}"})
+        self.assertEqual(policy.requests, 0)
+
+    def test_deadline_interrupts_stuck_request(self):
+        with MockOzonServer(latency=1.0) as server:
+            client = OzonAPIClient(self.config_file, base_url=server.base_url)
+            start = time.monotonic()
+            with self.assertRaises(DeadlineExceededError):
+                with client.deadline(0.2):
+                    client.get_campaigns()
+            self.assertLess(time.monotonic() - start, 0.8)
+            # 超过截止时间的请求不再重试
+            self.assertEqual(server.request_count, 1)
+
+    def test_endpoint_deadline(self):
+        with MockOzonServer(latency=0.5) as server:
+            client = OzonAPIClient(
+                self.config_file, base_url=server.base_url,
+                deadline=5.0, endpoint_deadlines={"/campaigns/{id}/stats": 0.1}
+            )
+            with self.assertRaises(DeadlineExceededError):
+                client.get_campaign_stats(1, "2025-06-01", "2025-06-02", ["clicks"])
+            self.assertEqual(len(client.get_campaigns()), 3)
+
+    @patch('time.sleep')
+    def test_retry_wait_respects_deadline(self, mock_sleep):
+        with MockOzonServer(server_error_ratio=1.0) as server:
+            client = OzonAPIClient(self.config_file, base_url=server.base_url, backoff_factor=1.0)
+            with self.assertRaises(ServerError):
+                with client.deadline(0.5):
+                    client.get_campaigns()
+        # 第一次退避至少等待 1 秒，超过了剩余时间，因此直接放弃
+        mock_sleep.assert_not_called()
+        self.assertEqual(server.request_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
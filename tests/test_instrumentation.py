@@ -0,0 +1,93 @@
+import unittest
+import configparser
+import os
+import tempfile
+from unittest.mock import patch
+
+from ozon_api.client import OzonAPIClient
+from ozon_api.exceptions import ServerError
+from ozon_api.instrumentation import MetricsCollector, RequestEvent
+from ozon_api.testing import MockOzonServer
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        config = configparser.ConfigParser()
+        config['ozon_api'] = {'client_id': 'test_client_id', 'api_key': 'test_api_key'}
+        fd, self.config_file = tempfile.mkstemp(suffix=".ini")
+        with os.fdopen(fd, 'w') as configfile:
+            config.write(configfile)
+        self.events = []
+        self.collector = MetricsCollector()
+
+    def tearDown(self):
+        os.remove(self.config_file)
+
+    def _client(self, server, **kwargs):
+        client = OzonAPIClient(self.config_file, base_url=server.base_url, backoff_factor=0, **kwargs)
+        client.add_hook(self.events.append)
+        client.add_hook(self.collector)
+        return client
+
+    def test_phases_are_recorded(self):
+        with MockOzonServer(latency=0.02) as server:
+            client = self._client(server)
+            client.get_campaigns()
+            client.get_campaign_stats(1, "2025-06-01", "2025-06-07", ["clicks"])
+
+        first, stats = self.events
+        self.assertEqual((first.method, first.endpoint, first.status), ("GET", "/campaigns", 200))
+        self.assertGreater(first.connect, 0)
+        self.assertGreaterEqual(first.ttfb, 0.02)
+        self.assertGreater(first.decode, 0)
+        self.assertGreater(first.bytes_received, 0)
+        # 第二个请求复用连接
+        self.assertEqual(stats.connect, 0)
+        self.assertEqual(stats.endpoint, "/campaigns/{id}/stats")
+        self.assertGreater(stats.bytes_sent, 0)
+        self.assertEqual(self.collector.request_count(), 2)
+
+    @patch('time.sleep')
+    def test_retries_are_reported(self, mock_sleep):
+        with MockOzonServer(server_error_ratio=1.0) as server:
+            client = self._client(server, max_retries=2)
+            with self.assertRaises(ServerError):
+                client.get_campaigns()
+
+        self.assertEqual([event.attempt for event in self.events], [0, 1, 2])
+        self.assertEqual([event.status for event in self.events], [503, 503, 503])
+        self.assertEqual(self.events[0].retry_wait, 0)
+        self.assertGreater(self.events[1].retry_wait, 0)
+
+        text = self.collector.to_prometheus()
+        self.assertIn('ozon_api_requests_total{method="GET",endpoint="/campaigns",status="503"} 3', text)
+        self.assertIn('ozon_api_retries_total{method="GET",endpoint="/campaigns"} 2', text)
+
+    def test_streaming_request_is_reported_after_body(self):
+        with MockOzonServer() as server:
+            client = self._client(server)
+            rows = list(client.iter_campaign_stats(1, "2025-06-01", "2025-06-30", ["clicks"]))
+
+        self.assertEqual(len(rows), 30)
+        self.assertEqual(len(self.events), 1)
+        self.assertGreater(self.events[0].bytes_received, 0)
+
+    def test_prometheus_histogram(self):
+        collector = MetricsCollector(buckets=(0.1, 1.0))
+        event = RequestEvent("POST", "/campaigns/{id}/stats")
+        event.status = 200
+        event.ttfb = 0.5
+        collector(event)
+
+        text = collector.to_prometheus()
+        prefix = 'ozon_api_request_phase_seconds_bucket{method="POST",endpoint="/campaigns/{id}/stats",phase="ttfb"'
+        self.assertIn(prefix + ',le="0.1"} 0', text)
+        self.assertIn(prefix + ',le="1.0"} 1', text)
+        self.assertIn(prefix + ',le="+Inf"} 1', text)
+        self.assertIn('# TYPE ozon_api_request_phase_seconds histogram', text)
+        self.assertAlmostEqual(collector.phase_seconds("ttfb"), 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import configparser
+import os
+import tempfile
+from unittest.mock import patch
+
+from ozon_api import crawler
+from ozon_api.client import OzonAPIClient
+from ozon_api.exceptions import ServerError
+from ozon_api.testing import MockOzonServer
+
+
+class TestMockOzonServer(unittest.TestCase):
+
+    def setUp(self):
+        config = configparser.ConfigParser()
+        config['ozon_api'] = {'client_id': 'test_client_id', 'api_key': 'test_api_key'}
+        fd, self.config_file = tempfile.mkstemp(suffix=".ini")
+        with os.fdopen(fd, 'w') as configfile:
+            config.write(configfile)
+
+    def tearDown(self):
+        os.remove(self.config_file)
+
+    def _client(self, server, **kwargs):
+        return OzonAPIClient(self.config_file, base_url=server.base_url, backoff_factor=0, **kwargs)
+
+    def test_crawl_against_mock_server(self):
+        with MockOzonServer(campaigns=2, ad_groups_per_campaign=2, ads_per_ad_group=3, page_size=2) as server:
+            client = self._client(server)
+            rows = list(crawler.crawl_account(client, "2025-06-01", "2025-06-03", ["clicks"], workers=4))
+
+        kinds = [kind for kind, _ in rows]
+        self.assertEqual(kinds.count(crawler.CAMPAIGN), 2)
+        self.assertEqual(kinds.count(crawler.AD), 12)
+        ad_stats = [row for kind, row in rows if kind == crawler.AD_STATS]
+        self.assertEqual(len(ad_stats), 12)
+        self.assertEqual(len(ad_stats[0]["stats"]), 3)
+        # 每个广告组的广告列表分两页返回
+        self.assertEqual(server.requests["GET /campaigns/{id}/ad_groups/{id}/ads"], 8)
+
+    @patch('time.sleep')
+    def test_injected_errors_are_retried(self, mock_sleep):
+        with MockOzonServer(rate_limit_ratio=0.3, server_error_ratio=0.2, seed=1) as server:
+            client = self._client(server, max_retries=20)
+            for _ in range(10):
+                self.assertEqual(len(client.get_campaigns()), 3)
+            self.assertGreater(server.request_count, 10)
+
+    @patch('time.sleep')
+    def test_errors_are_raised_when_retries_exhausted(self, mock_sleep):
+        with MockOzonServer(server_error_ratio=1.0) as server:
+            client = self._client(server, max_retries=1)
+            with self.assertRaises(ServerError):
+                client.get_campaigns()
+            self.assertEqual(server.request_count, 2)
+
+    def test_batched_ad_stats(self):
+        with MockOzonServer() as server:
+            client = self._client(server)
+            client.enable_stats_coalescing(window=0.01)
+            stats = client.get_ad_stats(1, 1001, 1001001, "2025-06-01", "2025-06-02", ["clicks", "views"])
+            client.stats_coalescer.close()
+
+        self.assertEqual([row["date"] for row in stats["stats"]], ["2025-06-01", "2025-06-02"])
+        self.assertEqual(set(stats["stats"][0]), {"date", "ad_id", "clicks", "views"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+
+from ozon_api.models import MISSING_INT, Campaign, Statistic, StatisticBatch
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+ROWS = [
+    {"date": "2025-06-01", "clicks": 10, "impressions": 100, "spent": 5.5, "ctr_custom": 0.1},
+    {"date": "2025-06-02", "clicks": "12", "impressions": 120, "spent": None, "ctr_custom": 0.2},
+]
+
+# 第二行缺少 clicks；currency 是文本字段
+SPARSE_ROWS = [
+    {"date": "2025-06-01", "clicks": 10, "spent": 5.5, "currency": "RUB"},
+    {"date": "2025-06-02", "clicks": None, "spent": 1.0, "currency": "RUB"},
+]
+
+
+class TestStatistic(unittest.TestCase):
+
+    def test_to_dict_returns_copy(self):
+        campaign = Campaign(1, "C", "search", "active", 100.0, 10.0, "", "")
+        data = campaign.to_dict()
+        data["name"] = "changed"
+        self.assertEqual(campaign.name, "C")
+
+    def test_slots_and_extra_metrics(self):
+        stat = Statistic("2025-06-01", clicks=3, add_to_cart=2)
+        self.assertIn("clicks", Statistic.__slots__)
+        self.assertEqual(stat.to_dict()["add_to_cart"], 2)
+        self.assertEqual(stat.to_dict()["clicks"], 3)
+
+
+class TestStatisticBatch(unittest.TestCase):
+
+    def test_from_rows(self):
+        batch = StatisticBatch.from_rows(ROWS, campaign_id=7)
+
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(batch.dates.typecode, 'i')
+        self.assertEqual(batch.column("clicks").tolist(), [10, 12])
+        self.assertEqual(batch.column("campaign_id").tolist(), [7, 7])
+        self.assertEqual(list(batch.columns), ["clicks", "impressions", "spent", "ctr_custom"])
+
+        first = next(iter(batch))
+        self.assertEqual(first.date, "2025-06-01")
+        self.assertEqual(first.campaign_id, 7)
+
+    def test_ids_from_rows_and_concat(self):
+        first = StatisticBatch.from_response({"stats": [{"ad_id": 1, "date": "2025-06-01", "clicks": 1}]})
+        second = StatisticBatch.from_response({"stats": [{"ad_id": 2, "date": "2025-06-02", "clicks": 2}]})
+
+        batch = StatisticBatch.concat([first, second])
+        self.assertEqual(batch.to_dict(), {
+            "date": ["2025-06-01", "2025-06-02"], "ad_id": [1, 2], "clicks": [1, 2]
+        })
+        self.assertEqual(len(first), 1)
+
+    def test_text_fields_are_skipped_and_missing_counts_kept(self):
+        batch = StatisticBatch.from_rows(SPARSE_ROWS)
+
+        self.assertEqual(list(batch.columns), ["clicks", "spent"])
+        self.assertEqual(batch.column("clicks").tolist(), [10, MISSING_INT])
+        self.assertEqual(batch.to_dict()["clicks"], [10, None])
+        self.assertIsNone(list(batch)[1].clicks)
+
+    def test_non_numeric_metric_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "currency"):
+            StatisticBatch.from_rows(SPARSE_ROWS, metrics=["clicks", "currency"])
+        rows = [{"date": "2025-06-01", "clicks": 1}, {"date": "2025-06-02", "clicks": "n/a"}]
+        with self.assertRaisesRegex(ValueError, "clicks"):
+            StatisticBatch.from_rows(rows)
+
+    @unittest.skipIf(pa is None or pd is None, "需要 pandas 和 pyarrow")
+    def test_missing_counts_become_nulls(self):
+        batch = StatisticBatch.from_rows(SPARSE_ROWS)
+
+        self.assertEqual(batch.to_arrow().column("clicks").to_pylist(), [10, None])
+        df = batch.to_pandas()
+        self.assertEqual(str(df["clicks"].dtype), "Int64")
+        self.assertTrue(pd.isna(df["clicks"].iloc[1]))
+
+    @unittest.skipIf(np is None, "需要 numpy")
+    def test_to_numpy_is_zero_copy(self):
+        batch = StatisticBatch.from_rows(ROWS)
+        arrays = batch.to_numpy()
+
+        batch.column("clicks")[0] = 99
+        self.assertEqual(arrays["clicks"][0], 99)
+        self.assertTrue(np.isnan(arrays["spent"][1]))
+
+    @unittest.skipIf(pd is None, "需要 pandas")
+    def test_to_pandas(self):
+        batch = StatisticBatch.from_rows(ROWS)
+        df = batch.to_pandas()
+
+        self.assertEqual(df["clicks"].tolist(), [10, 12])
+        self.assertEqual(str(df["date"].iloc[1].date()), "2025-06-02")
+        self.assertTrue(np.shares_memory(df["clicks"].to_numpy(), batch.to_numpy()["clicks"]))
+
+    @unittest.skipIf(pa is None, "需要 pyarrow")
+    def test_to_arrow(self):
+        table = StatisticBatch.from_rows(ROWS, ad_id=3).to_arrow()
+
+        self.assertEqual(table.schema.field("date").type, pa.date32())
+        self.assertEqual(table.column("date").to_pylist()[1].isoformat(), "2025-06-02")
+        self.assertEqual(table.column("ad_id").to_pylist(), [3, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import os
+import tempfile
+import threading
+import time
+
+from ozon_api.pool import OzonClientPool, load_accounts
+from ozon_api.testing import MockOzonServer
+
+CONFIG = """
+[ozon_api]
+client_id = default-id
+api_key = default-key
+
+[ozon_api:shop_a]
+client_id = a-id
+api_key = a-key
+rate = 5
+burst = 2
+
+[ozon_api:shop_b]
+client_id = b-id
+api_key = b-key
+
+[export]
+output_dir = data
+"""
+
+
+def campaign_count(client):
+    return client.client_id, len(client.get_campaigns())
+
+
+class TestOzonClientPool(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.config_file = tempfile.mkstemp(suffix=".ini")
+        with os.fdopen(fd, 'w') as f:
+            f.write(CONFIG)
+
+    def tearDown(self):
+        os.remove(self.config_file)
+
+    def test_load_accounts(self):
+        accounts = load_accounts(self.config_file)
+        self.assertEqual(list(accounts), ["default", "shop_a", "shop_b"])
+        self.assertEqual(accounts["shop_a"]["rate"], "5")
+
+        with open(self.config_file, 'a') as f:
+            f.write("\n[ozon_api:broken]\nclient_id = x\n")
+        with self.assertRaises(ValueError):
+            load_accounts(self.config_file)
+
+    def test_clients_share_session_with_own_limits(self):
+        with OzonClientPool(self.config_file) as pool:
+            self.assertEqual(len(pool), 3)
+            self.assertEqual({id(pool[name].session) for name in pool}, {id(pool.session)})
+            self.assertEqual(pool["shop_b"].client_id, "b-id")
+            # 只有配置了 rate 的账户限流
+            self.assertIs(pool["shop_a"].rate_limiter, pool.rate_limiter)
+            self.assertIsNone(pool["shop_b"].rate_limiter)
+            self.assertEqual(pool.rate_limiter.limits["a-id"], (5.0, 2))
+
+        with OzonClientPool(self.config_file, rate=10) as pool:
+            self.assertIs(pool["shop_b"].rate_limiter, pool.rate_limiter)
+
+    def test_tasks_are_scheduled_round_robin(self):
+        order = []
+        lock = threading.Lock()
+
+        def task(client, n):
+            with lock:
+                order.append((client.client_id, n))
+            time.sleep(0.001)
+
+        with OzonClientPool(self.config_file, workers=1, per_account_concurrency=1) as pool:
+            futures = [pool.submit("shop_a", task, n) for n in range(10)]
+            futures += [pool.submit("shop_b", task, n) for n in range(2)]
+            for future in futures:
+                future.result()
+
+        # shop_b 的任务不需要等 shop_a 的 10 个任务全部完成
+        positions = [i for i, (client_id, _) in enumerate(order) if client_id == "b-id"]
+        self.assertLess(max(positions), 6)
+        self.assertEqual([n for client_id, n in order if client_id == "a-id"], list(range(10)))
+
+    def test_map_against_mock_server(self):
+        with MockOzonServer(campaigns=4) as server:
+            with OzonClientPool(self.config_file, base_url=server.base_url) as pool:
+                results = pool.map(campaign_count)
+                self.assertEqual(results["shop_a"], ("a-id", 4))
+
+                processed = pool.map_processes(campaign_count, processes=2)
+                self.assertEqual(processed, results)
+            self.assertEqual(server.request_count, 6)
+
+    def test_map_raises_first_error(self):
+        def fail(client):
+            if client.client_id == "a-id":
+                raise RuntimeError("boom")
+            return client.client_id
+
+        with OzonClientPool(self.config_file) as pool:
+            with self.assertRaises(RuntimeError):
+                pool.map(fail)
+            results = pool.map(fail, return_exceptions=True)
+        self.assertIsInstance(results["shop_a"], RuntimeError)
+        self.assertEqual(results["shop_b"], "b-id")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import os
+import tempfile
+import threading
+import time
+
+from ozon_api.ratelimit import RateLimiter, FileLockBackend, fcntl
+from ozon_api.utils import parse_retry_after
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        limiter = RateLimiter(rate=50, burst=5)
+
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire("client")
+        self.assertLess(time.monotonic() - start, 0.05)
+
+        # 桶已耗尽，后续 5 个令牌需要约 0.1 秒
+        for _ in range(5):
+            limiter.acquire("client")
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+    def test_keys_are_independent(self):
+        limiter = RateLimiter(rate=1, burst=1, limits={"fast": (1000, 10)})
+        limiter.acquire("slow")
+
+        start = time.monotonic()
+        for _ in range(10):
+            limiter.acquire("fast")
+        self.assertLess(time.monotonic() - start, 0.05)
+
+    def test_thread_safe(self):
+        limiter = RateLimiter(rate=200, burst=10)
+        granted = []
+
+        def worker():
+            for _ in range(10):
+                limiter.acquire("client")
+                granted.append(time.monotonic())
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # 40 个令牌中 10 个来自初始桶，其余 30 个按 200/s 发放
+        self.assertEqual(len(granted), 40)
+        self.assertGreaterEqual(time.monotonic() - start, 0.13)
+
+    def test_retry_after_blocks_and_slows_down(self):
+        limiter = RateLimiter(rate=100, burst=10)
+        limiter.on_retry_after("client", 0.1)
+
+        self.assertAlmostEqual(limiter.current_rate("client"), 90.0, places=3)
+        waited = limiter.acquire("client")
+        self.assertGreaterEqual(waited, 0.09)
+
+    def test_acquire_timeout(self):
+        limiter = RateLimiter(rate=2, burst=1)
+        limiter.acquire("a")
+        start = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            limiter.acquire("a", timeout=0.1)
+        # 等不到令牌时立即放弃，不空等到超时
+        self.assertLess(time.monotonic() - start, 0.05)
+        self.assertGreater(limiter.acquire("a", timeout=1.0), 0.3)
+
+    @unittest.skipIf(fcntl is None, "需要 fcntl")
+    def test_file_backend_is_shared(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "limiter.json")
+            # 两个实例模拟两个进程
+            first = RateLimiter(rate=20, burst=2, backend=FileLockBackend(path))
+            second = RateLimiter(rate=20, burst=2, backend=FileLockBackend(path))
+
+            start = time.monotonic()
+            first.acquire("client")
+            second.acquire("client")
+            first.acquire("client")
+            # 共享的桶只有 2 个令牌，第三个需要等待约 0.05 秒
+            self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+
+class TestParseRetryAfter(unittest.TestCase):
+
+    def test_parse(self):
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertEqual(parse_retry_after(2), 2.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+import unittest
+import os
+import tempfile
+import threading
+import time
+
+from ozon_api.client import OzonAPIClient
+from ozon_api.exceptions import DeadlineExceededError, QueueFullError
+from ozon_api.ratelimit import RateLimiter
+from ozon_api.scheduler import RequestScheduler, tenant_from_endpoint
+from ozon_api.testing import MockOzonServer
+
+CONFIG = """
+[ozon_api]
+client_id = test_client_id
+api_key = test_api_key
+"""
+
+
+class TestRequestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        # 只允许一个在途请求，测试线程先占住它，排队顺序完全确定
+        self.scheduler = RequestScheduler(max_in_flight=1)
+        self.scheduler.acquire("interactive")
+        self.order = []
+        self.threads = []
+
+    def enqueue(self, label, priority, tenant=None):
+        expected = self.scheduler.queued() + 1
+
+        def run():
+            with self.scheduler.slot(priority, tenant):
+                self.order.append(label)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        self.threads.append(thread)
+        while self.scheduler.queued() < expected:
+            time.sleep(0.001)
+
+    def drain(self):
+        self.scheduler.release()
+        for thread in self.threads:
+            thread.join(timeout=5)
+        return self.order
+
+    def test_interactive_jumps_ahead_of_queued_backfill(self):
+        for n in range(3):
+            self.enqueue(f"backfill-{n}", "backfill")
+        self.enqueue("default", "default")
+        self.enqueue("interactive", "interactive")
+        self.assertEqual(self.drain(), ["interactive", "default", "backfill-0", "backfill-1", "backfill-2"])
+        self.assertEqual(self.scheduler.dispatched, {"interactive": 2, "default": 1, "backfill": 3})
+
+    def test_fair_queuing_across_tenants(self):
+        for n in range(4):
+            self.enqueue(f"a{n}", "backfill", tenant="a")
+        for n in range(2):
+            self.enqueue(f"b{n}", "backfill", tenant="b")
+        self.assertEqual(self.drain(), ["a0", "b0", "a1", "b1", "a2", "a3"])
+
+    def test_weights(self):
+        self.scheduler.set_weight("b", 2)
+        for n in range(3):
+            self.enqueue(f"a{n}", "backfill", tenant="a")
+        for n in range(4):
+            self.enqueue(f"b{n}", "backfill", tenant="b")
+        self.assertEqual(self.drain(), ["b0", "a0", "b1", "b2", "a1", "b3", "a2"])
+
+    def test_bounded_queue(self):
+        scheduler = RequestScheduler(max_in_flight=1, max_queue=1, block_when_full=False)
+        scheduler.acquire()
+        waiter = threading.Thread(target=lambda: scheduler.slot().__enter__())
+        waiter.start()
+        while scheduler.queued() < 1:
+            time.sleep(0.001)
+        with self.assertRaises(QueueFullError):
+            scheduler.acquire()
+
+        scheduler.block_when_full = True
+        with self.assertRaises(TimeoutError):
+            scheduler.acquire(timeout=0.05)
+        scheduler.release()
+        waiter.join(timeout=5)
+        self.assertEqual(scheduler.queued(), 0)
+        self.drain()
+
+    def test_timed_out_ticket_is_skipped(self):
+        with self.assertRaises(TimeoutError):
+            self.scheduler.acquire("backfill", timeout=0.02)
+        self.enqueue("next", "backfill")
+        self.assertEqual(self.drain(), ["next"])
+
+    def test_unknown_priority(self):
+        with self.assertRaises(ValueError):
+            self.scheduler.acquire("urgent")
+        self.drain()
+
+    def test_tenant_from_endpoint(self):
+        self.assertEqual(tenant_from_endpoint("/campaigns/12/ad_groups/3/ads/4/stats"), 12)
+        self.assertIsNone(tenant_from_endpoint("/campaigns?page_size=10"))
+        self.drain()
+
+
+class TestClientScheduling(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.config_file = tempfile.mkstemp(suffix=".ini")
+        with os.fdopen(fd, 'w') as f:
+            f.write(CONFIG)
+
+    def tearDown(self):
+        os.remove(self.config_file)
+
+    def test_interactive_call_is_not_starved_by_backfill(self):
+        scheduler = RequestScheduler()
+        with MockOzonServer(campaigns=2) as server:
+            client = OzonAPIClient(
+                self.config_file, base_url=server.base_url,
+                rate_limiter=RateLimiter(rate=20, burst=1), scheduler=scheduler, single_flight=False
+            )
+            stop = threading.Event()
+
+            def backfill(n):
+                with client.priority("backfill"):
+                    while not stop.is_set():
+                        client.get_ad_stats(n, 1, 1, "2025-06-01", "2025-06-02", ["clicks"])
+
+            workers = [threading.Thread(target=backfill, args=(n,)) for n in range(1, 9)]
+            for worker in workers:
+                worker.start()
+            while scheduler.queued("backfill") < 6:
+                time.sleep(0.005)
+
+            start = time.monotonic()
+            with client.priority("interactive"):
+                campaigns = client.get_campaigns()
+            elapsed = time.monotonic() - start
+
+            with self.assertRaises(DeadlineExceededError):
+                with client.deadline(0.01):
+                    client.get_campaigns()
+
+            stop.set()
+            for worker in workers:
+                worker.join(timeout=5)
+
+        self.assertEqual(len(campaigns), 2)
+        # 令牌每 50 毫秒发放一个；排在 6 个以上 backfill 请求之后至少要等 300 毫秒
+        self.assertLess(elapsed, 0.2)
+        self.assertEqual(scheduler.in_flight, 0)
+        self.assertGreater(scheduler.dispatched["backfill"], 0)
+
+    def test_streamed_response_holds_slot_until_closed(self):
+        scheduler = RequestScheduler(max_in_flight=1)
+        with MockOzonServer(campaigns=1) as server:
+            client = OzonAPIClient(self.config_file, base_url=server.base_url, scheduler=scheduler)
+            rows = client.iter_campaign_stats(1, "2025-06-01", "2025-06-03", ["clicks"])
+            next(rows)
+            # 正文还没有读完，连接仍被占用
+            self.assertEqual(scheduler.in_flight, 1)
+            with self.assertRaises(DeadlineExceededError):
+                with client.deadline(0.05):
+                    client.get_campaigns()
+            rows.close()
+            self.assertEqual(scheduler.in_flight, 0)
+            self.assertEqual(len(list(client.iter_campaign_stats(1, "2025-06-01", "2025-06-03", ["clicks"]))), 3)
+            self.assertEqual(scheduler.in_flight, 0)
+
+    def test_deadline_covers_rate_limiter_wait(self):
+        limiter = RateLimiter(rate=5, burst=1)
+        with MockOzonServer(campaigns=1) as server:
+            for scheduler in (RequestScheduler(), None):
+                client = OzonAPIClient(
+                    self.config_file, base_url=server.base_url, rate_limiter=limiter, scheduler=scheduler
+                )
+                client.get_campaigns()
+                start = time.monotonic()
+                # 下一个令牌 200 毫秒后才发放，超过了 100 毫秒的截止时间
+                with self.assertRaises(DeadlineExceededError):
+                    with client.deadline(0.1):
+                        client.get_campaigns()
+                self.assertLess(time.monotonic() - start, 0.05)
+                if scheduler is not None:
+                    self.assertEqual(scheduler.in_flight, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
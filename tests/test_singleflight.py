@@ -0,0 +1,207 @@
+import unittest
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ozon_api.client import OzonAPIClient
+from ozon_api.exceptions import DeadlineExceededError, ServerError
+from ozon_api.singleflight import AsyncSingleFlight, SingleFlight
+from ozon_api.testing import MockOzonServer
+
+CONFIG = """
+[ozon_api]
+client_id = test_client_id
+api_key = test_api_key
+"""
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+        barrier = threading.Barrier(8)
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"value": 42}
+
+        def call():
+            barrier.wait()
+            return flight.do("key", slow)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: call(), range(8)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.shared, 7)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_error_is_shared_and_key_released(self):
+        flight = SingleFlight()
+        barrier = threading.Barrier(4)
+
+        def failing():
+            time.sleep(0.1)
+            raise ServerError("boom")
+
+        def call():
+            barrier.wait()
+            try:
+                flight.do("key", failing)
+            except ServerError as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            errors = list(executor.map(lambda _: call(), range(4)))
+
+        self.assertTrue(all(isinstance(error, ServerError) for error in errors))
+        # 调用结束后不缓存结果，下一次调用重新执行
+        self.assertEqual(flight.do("key", lambda: "fresh"), "fresh")
+
+    def test_async_callers_share_one_call(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return [1, 2, 3]
+
+        async def failing():
+            await asyncio.sleep(0.05)
+            raise ServerError("boom")
+
+        async def main():
+            results = await asyncio.gather(*(flight.do("key", slow) for _ in range(5)))
+            errors = await asyncio.gather(*(flight.do("bad", failing) for _ in range(3)), return_exceptions=True)
+            return results, errors
+
+        results, errors = asyncio.run(main())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [[1, 2, 3]] * 5)
+        self.assertTrue(all(isinstance(error, ServerError) for error in errors))
+        self.assertEqual(flight.shared, 6)
+
+    def test_follower_waits_with_own_timeout(self):
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            time.sleep(0.3)
+            return "done"
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(flight.do, "key", slow)
+            started.wait()
+            start = time.monotonic()
+            with self.assertRaises(TimeoutError):
+                flight.do("key", slow, timeout=0.05)
+            self.assertLess(time.monotonic() - start, 0.2)
+            self.assertEqual(leader.result(), "done")
+
+    def test_cancelled_async_leader_does_not_cancel_followers(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def main():
+            leader = asyncio.ensure_future(flight.do("key", slow))
+            await asyncio.sleep(0)
+            followers = [asyncio.ensure_future(flight.do("key", slow)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await asyncio.gather(*followers), leader.cancelled()
+
+        results, leader_cancelled = asyncio.run(main())
+        self.assertTrue(leader_cancelled)
+        self.assertEqual(results, ["done"] * 3)
+        # 其中一个等待方重新执行了调用，其余两个共享它的结果
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(flight.shared, 2)
+
+
+class TestClientSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.config_file = tempfile.mkstemp(suffix=".ini")
+        with os.fdopen(fd, 'w') as f:
+            f.write(CONFIG)
+
+    def tearDown(self):
+        os.remove(self.config_file)
+
+    def _run_concurrently(self, func, count=6):
+        barrier = threading.Barrier(count)
+
+        def call(_):
+            barrier.wait()
+            return func()
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            return list(executor.map(call, range(count)))
+
+    def test_identical_reads_are_collapsed(self):
+        with MockOzonServer(campaigns=3, latency=0.1) as server:
+            client = OzonAPIClient(self.config_file, base_url=server.base_url)
+            results = self._run_concurrently(client.get_campaigns)
+            stats = self._run_concurrently(
+                lambda: client.get_campaign_stats(1, "2024-01-01", "2024-01-02", ["clicks"])
+            )
+
+        self.assertTrue(all(len(result) == 3 for result in results))
+        self.assertEqual(server.requests["GET /campaigns"], 1)
+        self.assertEqual(len({id(result) for result in stats}), 1)
+        self.assertEqual(server.requests["POST /campaigns/{id}/stats"], 1)
+
+    def test_followers_keep_own_deadline_and_priority(self):
+        with MockOzonServer(campaigns=3, latency=0.3) as server:
+            client = OzonAPIClient(self.config_file, base_url=server.base_url)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                backfill = executor.submit(lambda: client.get_campaigns())
+                while server.request_count < 1:
+                    time.sleep(0.005)
+                start = time.monotonic()
+                with self.assertRaises(DeadlineExceededError):
+                    with client.deadline(0.05):
+                        client.get_campaigns()
+                self.assertLess(time.monotonic() - start, 0.2)
+                self.assertEqual(len(backfill.result()), 3)
+
+            # 不同优先级类别的相同请求分别发送
+            def interactive():
+                with client.priority("interactive"):
+                    return client.get_campaigns()
+
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [executor.submit(client.get_campaigns), executor.submit(interactive)]
+                self.assertTrue(all(len(future.result()) == 3 for future in futures))
+
+        self.assertEqual(server.requests["GET /campaigns"], 3)
+
+    def test_writes_are_not_collapsed(self):
+        with MockOzonServer(latency=0.05) as server:
+            client = OzonAPIClient(self.config_file, base_url=server.base_url)
+            self._run_concurrently(lambda: client.create_campaign({"name": "same"}), count=3)
+
+        self.assertEqual(server.requests["POST /campaigns"], 3)
+
+    def test_can_be_disabled(self):
+        with MockOzonServer(latency=0.05) as server:
+            client = OzonAPIClient(self.config_file, base_url=server.base_url, single_flight=False)
+            self._run_concurrently(client.get_campaigns, count=3)
+
+        self.assertEqual(server.requests["GET /campaigns"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
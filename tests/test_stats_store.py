@@ -0,0 +1,104 @@
+import unittest
+import os
+import tempfile
+from datetime import date, timedelta
+
+from ozon_api.stats_store import StatsStore
+
+
+class FakeStatsAPI:
+    """为区间内每天返回一行统计，并记录请求过的区间"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, date_from, date_to):
+        self.calls.append((date_from, date_to))
+        start, end = date.fromisoformat(date_from), date.fromisoformat(date_to)
+        return {"stats": [
+            {"date": (start + timedelta(days=i)).isoformat(), "clicks": len(self.calls)}
+            for i in range((end - start).days + 1)
+        ]}
+
+
+class TestStatsStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = StatsStore(
+            os.path.join(self.tmp.name, "stats.sqlite"),
+            settlement_lag_days=2,
+            today=lambda: date(2025, 6, 30)
+        )
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_settled_days_are_not_refetched(self):
+        api = FakeStatsAPI()
+        entity = (1, 2, 3)
+
+        first = self.store.fetch(entity, "2025-06-01", "2025-06-30", ["clicks"], api)
+        self.assertEqual(len(first["stats"]), 30)
+        self.assertEqual(api.calls, [("2025-06-01", "2025-06-30")])
+
+        # 6 月 27 日及之前已结算，只重新请求结算期内的 3 天
+        second = self.store.fetch(entity, "2025-06-01", "2025-06-30", ["clicks"], api)
+        self.assertEqual(api.calls[1], ("2025-06-28", "2025-06-30"))
+        self.assertEqual([row["date"] for row in second["stats"]], [row["date"] for row in first["stats"]])
+        self.assertEqual(second["stats"][0]["clicks"], 1)
+        self.assertEqual(second["stats"][-1]["clicks"], 2)
+
+    def test_only_missing_runs_are_fetched(self):
+        api = FakeStatsAPI()
+        entity = (1, None, None)
+        self.store.fetch(entity, "2025-06-05", "2025-06-10", ["clicks"], api)
+
+        result = self.store.fetch(entity, "2025-06-01", "2025-06-15", ["clicks"], api)
+        self.assertEqual(api.calls[1:], [("2025-06-01", "2025-06-04"), ("2025-06-11", "2025-06-15")])
+        self.assertEqual(len(result["stats"]), 15)
+
+    def test_entities_and_metrics_are_separate(self):
+        api = FakeStatsAPI()
+        self.store.fetch((1, 2, 3), "2025-06-01", "2025-06-02", ["clicks"], api)
+        self.store.fetch((1, 2, 4), "2025-06-01", "2025-06-02", ["clicks"], api)
+        self.store.fetch((1, 2, 3), "2025-06-01", "2025-06-02", ["clicks", "spent"], api)
+        self.assertEqual(len(api.calls), 3)
+
+    def test_empty_days_are_stored(self):
+        calls = []
+
+        def empty(date_from, date_to):
+            calls.append((date_from, date_to))
+            return {"stats": []}
+
+        self.store.fetch((1, None, None), "2025-06-01", "2025-06-03", ["clicks"], empty)
+        result = self.store.fetch((1, None, None), "2025-06-01", "2025-06-03", ["clicks"], empty)
+        self.assertEqual(result, {"stats": []})
+        self.assertEqual(len(calls), 1)
+
+    def test_other_response_fields_are_kept(self):
+        calls = []
+
+        def api(date_from, date_to):
+            calls.append((date_from, date_to))
+            return {"stats": [{"date": date_from, "clicks": 1}], "currency": "RUB", "totals": {"clicks": len(calls)}}
+
+        entity = (1, None, None)
+        first = self.store.fetch(entity, "2025-06-01", "2025-06-01", ["clicks"], api)
+        self.assertEqual(first, {"stats": [{"date": "2025-06-01", "clicks": 1}], "currency": "RUB", "totals": {"clicks": 1}})
+
+        # 全部来自本地库时使用上一次请求保存的字段
+        cached = self.store.fetch(entity, "2025-06-01", "2025-06-01", ["clicks"], api)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cached, first)
+
+        # 有新请求时取本次第一个请求的响应
+        fetched = self.store.fetch(entity, "2025-06-01", "2025-06-02", ["clicks"], api)
+        self.assertEqual(fetched["totals"], {"clicks": 2})
+        self.assertEqual(fetched["currency"], "RUB")
+
+
+if __name__ == '__main__':
+    unittest.main()
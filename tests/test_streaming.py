@@ -0,0 +1,53 @@
+import unittest
+import json
+
+from ozon_api.streaming import iter_json_array
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestIterJSONArray(unittest.TestCase):
+
+    def test_small_chunks(self):
+        payload = {"stats": [{"date": f"2025-06-{day:02d}", "clicks": day * 10, "ctr": day / 3} for day in range(1, 31)]}
+        data = json.dumps(payload).encode()
+
+        for size in (1, 2, 7, 64, len(data)):
+            rows = list(iter_json_array(_chunks(data, size)))
+            self.assertEqual(rows, payload["stats"])
+
+    def test_multibyte_characters_split_across_chunks(self):
+        payload = {"stats": [{"name": "Кампания 広告", "clicks": 1}]}
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+        self.assertEqual(list(iter_json_array(_chunks(data, 1))), payload["stats"])
+
+    def test_numbers_at_chunk_boundaries(self):
+        data = b'{"stats": [12345, 6.75e2, -8]}'
+        self.assertEqual(list(iter_json_array(_chunks(data, 3))), [12345, 675.0, -8])
+
+    def test_other_top_level_fields(self):
+        data = json.dumps({
+            "meta": {"total": 2, "tags": ["a", "b"]},
+            "stats": [{"clicks": 1}, {"clicks": 2}],
+            "next_page_token": "abc"
+        }).encode()
+
+        self.assertEqual(list(iter_json_array(_chunks(data, 5))), [{"clicks": 1}, {"clicks": 2}])
+
+    def test_missing_key_and_empty_array(self):
+        self.assertEqual(list(iter_json_array([b'{"meta": 1}'])), [])
+        self.assertEqual(list(iter_json_array([b'{}'])), [])
+        self.assertEqual(list(iter_json_array([b'{"stats": []}'])), [])
+
+    def test_malformed_input(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"stats": [1 2]}']))
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"stats": [1, 2']))
+
+
+if __name__ == '__main__':
+    unittest.main()
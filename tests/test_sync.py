@@ -0,0 +1,91 @@
+import unittest
+import os
+import tempfile
+
+from ozon_api import crawler
+from ozon_api.exceptions import ServerError
+from ozon_api.sync import SyncEngine
+
+
+class FakeClient:
+    """2 个广告活动 × 2 个广告组 × 3 个广告，可指定某个广告的统计请求失败"""
+
+    def __init__(self, failing_ad=None):
+        self.failing_ad = failing_ad
+        self.ad_stats_calls = []
+
+    def get_campaigns(self):
+        return [{"id": 1}, {"id": 2}]
+
+    def get_ad_groups(self, campaign_id):
+        return [{"id": campaign_id * 10 + g} for g in range(2)]
+
+    def get_ads(self, campaign_id, ad_group_id):
+        return [{"id": ad_group_id * 10 + a} for a in range(3)]
+
+    def get_campaign_stats(self, campaign_id, date_from, date_to, metrics):
+        return {"stats": []}
+
+    def get_ad_stats(self, campaign_id, ad_group_id, ad_id, date_from, date_to, metrics):
+        self.ad_stats_calls.append(ad_id)
+        if ad_id == self.failing_ad:
+            raise ServerError("boom")
+        return {"stats": [{"ad_id": ad_id}]}
+
+
+class TestSyncEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "checkpoint.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self, client):
+        rows = []
+        engine = SyncEngine(client, self.path, "2025-06-01", "2025-06-02", ["clicks"], workers=2)
+        try:
+            report = engine.run(lambda kind, row: rows.append((kind, row)))
+        finally:
+            engine.close()
+        return report, rows
+
+    def test_full_run(self):
+        report, rows = self._run(FakeClient())
+
+        self.assertTrue(report.finished)
+        kinds = [kind for kind, _ in rows]
+        self.assertEqual(kinds.count(crawler.CAMPAIGN), 2)
+        self.assertEqual(kinds.count(crawler.AD_GROUP), 4)
+        self.assertEqual(kinds.count(crawler.AD_STATS), 12)
+
+        # 再次运行时全部跳过
+        client = FakeClient()
+        report, rows = self._run(client)
+        self.assertEqual(rows, [])
+        self.assertEqual(client.ad_stats_calls, [])
+        self.assertEqual(report.skipped_units, 2)
+
+    def test_resume_after_failure(self):
+        report, rows = self._run(FakeClient(failing_ad=201))
+
+        self.assertFalse(report.finished)
+        self.assertEqual(report.errors[0][0], "ad_group:2:20")
+        first_ads = {row["ad_id"] for kind, row in rows if kind == crawler.AD_STATS}
+        self.assertNotIn(201, first_ads)
+
+        client = FakeClient()
+        report, rows = self._run(client)
+
+        self.assertTrue(report.finished)
+        # 只重新请求失败的广告及其之后的广告
+        self.assertEqual(client.ad_stats_calls, [201, 202])
+        second_ads = {row["ad_id"] for kind, row in rows if kind == crawler.AD_STATS}
+        self.assertEqual(second_ads, {201, 202})
+        self.assertEqual(len(first_ads | second_ads), 12)
+        self.assertNotIn(crawler.AD_GROUP, [kind for kind, _ in rows])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import tempfile
+
+from ozon_api.client import OzonAPIClient
+from ozon_api.config import Config
+from ozon_api.exceptions import NetworkError
+from ozon_api.testing import MockOzonServer
+from ozon_api.transport import HTTPXTransport, RequestsTransport, transport_from_config
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+CONFIG = """
+[ozon_api]
+client_id = test_client_id
+api_key = test_api_key
+connect_timeout = 2
+read_timeout = 0.2
+pool_maxsize = 32
+keepalive = false
+max_retries = 0
+"""
+
+
+class TestTransport(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.config_file = tempfile.mkstemp(suffix=".ini")
+        with os.fdopen(fd, 'w') as f:
+            f.write(CONFIG)
+
+    def tearDown(self):
+        os.remove(self.config_file)
+
+    def test_config_transport_options(self):
+        config = Config(self.config_file)
+        self.assertEqual(config.get("connect_timeout"), 2.0)
+        self.assertEqual(config.get("pool_maxsize"), 32)
+        self.assertIs(config.get("keepalive"), False)
+        self.assertIs(config.get("http2"), False)
+
+        transport = transport_from_config(config)
+        self.assertIsInstance(transport, RequestsTransport)
+        self.assertEqual(transport.timeout, (2.0, 0.2))
+        self.assertEqual(transport.session.get_adapter("https://")._pool_maxsize, 32)
+        self.assertEqual(transport.session.headers["Connection"], "close")
+
+    @patch('requests.Session.get')
+    def test_client_sends_with_timeout(self, mock_get):
+        response = MagicMock(status_code=200, headers={}, content=b'{"campaigns": []}')
+        mock_get.return_value = response
+
+        client = OzonAPIClient(self.config_file)
+        client.get_campaigns()
+
+        self.assertEqual(mock_get.call_args[1]["timeout"], (2.0, 0.2))
+        self.assertEqual(client.max_retries, 0)
+
+    def test_stalled_response_times_out(self):
+        with MockOzonServer(latency=1.0) as server:
+            client = OzonAPIClient(self.config_file, base_url=server.base_url)
+            with self.assertRaises(NetworkError):
+                client.get_campaigns()
+
+    @unittest.skipIf(httpx is None, "httpx 未安装")
+    def test_httpx_transport(self):
+        with MockOzonServer(campaigns=3) as server:
+            transport = HTTPXTransport(max_connections=4)
+            client = OzonAPIClient(self.config_file, base_url=server.base_url, transport=transport)
+
+            self.assertEqual(len(client.get_campaigns()), 3)
+            rows = list(client.iter_campaign_stats(1, "2025-06-01", "2025-06-05", ["clicks"]))
+            self.assertEqual(len(rows), 5)
+            client.close()
+
+    @unittest.skipIf(httpx is None, "httpx 未安装")
+    def test_httpx_network_errors_are_mapped(self):
+        with MockOzonServer(latency=1.0) as server:
+            transport = HTTPXTransport(read_timeout=0.2)
+            client = OzonAPIClient(self.config_file, base_url=server.base_url, transport=transport)
+            with self.assertRaises(NetworkError):
+                client.get_campaigns()
+            client.close()
+
+
+if __name__ == '__main__':
+    unittest.main()